@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS log_watermarks (
+    repo_path TEXT PRIMARY KEY,
+    ingested_through DATE NOT NULL,
+    last_updated TIMESTAMPTZ DEFAULT NOW()
+);
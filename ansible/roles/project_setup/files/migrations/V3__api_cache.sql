@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS api_cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (namespace, key)
+);
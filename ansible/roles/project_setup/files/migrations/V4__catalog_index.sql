@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS catalog_index (
+    digest TEXT PRIMARY KEY,
+    bundles BYTEA NOT NULL,
+    last_used_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
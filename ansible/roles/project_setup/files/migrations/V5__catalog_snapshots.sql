@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS catalog_snapshots (
+    catalog TEXT PRIMARY KEY,
+    bundles BYTEA NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,57 @@
+-- Converts 'pull_counts' into a table partitioned by month of 'pull_date',
+-- so that queries of date ranges scan only partitions of the relevant months
+-- and old months can be detached cheaply, e.g.
+-- ALTER TABLE pull_counts DETACH PARTITION pull_counts_y2025m01;
+-- Partitions of the following months are created ahead by the worker.
+-- Does nothing if 'pull_counts' is already partitioned.
+DO $$
+DECLARE
+    partition_month DATE;
+    last_month DATE;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'pull_counts'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE pull_counts RENAME TO pull_counts_unpartitioned;
+    -- index names have to be unique, the new table takes over the old ones
+    ALTER TABLE pull_counts_unpartitioned
+        RENAME CONSTRAINT pull_counts_pkey TO pull_counts_unpartitioned_pkey;
+    ALTER TABLE pull_counts_unpartitioned
+        RENAME CONSTRAINT pull_counts_bundle_id_pull_date_key
+        TO pull_counts_unpartitioned_bundle_id_pull_date_key;
+
+    -- a primary key of a partitioned table has to include the partition key,
+    -- the surrogate 'id' is not referenced by anything, hence dropped
+    CREATE TABLE pull_counts (
+        bundle_id INTEGER NOT NULL REFERENCES bundles(id) ON DELETE CASCADE,
+        pull_date DATE NOT NULL,
+        pull_count INTEGER NOT NULL,
+        PRIMARY KEY (bundle_id, pull_date)
+    ) PARTITION BY RANGE (pull_date);
+
+    SELECT
+        date_trunc('month', COALESCE(MIN(pull_date), CURRENT_DATE))::date,
+        date_trunc(
+            'month',
+            GREATEST(MAX(pull_date), CURRENT_DATE + INTERVAL '3 months')
+        )::date
+    INTO partition_month, last_month
+    FROM pull_counts_unpartitioned;
+
+    WHILE partition_month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF pull_counts FOR VALUES FROM (%L) TO (%L);',
+            'pull_counts_' || to_char(partition_month, '"y"YYYY"m"MM'),
+            partition_month,
+            (partition_month + INTERVAL '1 month')::date
+        );
+        partition_month := (partition_month + INTERVAL '1 month')::date;
+    END LOOP;
+
+    INSERT INTO pull_counts (bundle_id, pull_date, pull_count)
+    SELECT bundle_id, pull_date, pull_count
+    FROM pull_counts_unpartitioned;
+
+    DROP TABLE pull_counts_unpartitioned;
+END $$;
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark of decoding Quay 'pull_repo' logs, comparing the log decoder
+with parsing full datetime by strptime into a dictionary per log.
+
+Usage: poetry run python benchmarks/log_decoder.py [NUMBER_OF_LOGS]
+"""
+
+import random
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from pullsar.log_decoder import decode_pull_repo_logs
+
+
+def generate_logs(count: int, days: int = 30) -> List[Dict[str, Any]]:
+    """Generates a page of logs similar to Quay logs of a busy repository."""
+    random.seed(0)
+    end = datetime(2025, 7, 20, 23, 59, 59)
+    logs = []
+    for _ in range(count):
+        log_datetime = end - timedelta(seconds=random.randrange(days * 24 * 3600))
+        logs.append(
+            {
+                "kind": random.choice(("pull_repo",) * 9 + ("push_repo",)),
+                "datetime": log_datetime.strftime("%a, %d %b %Y %H:%M:%S -0000"),
+                "metadata": {
+                    "repo": "repo",
+                    "tag": f"v1.{random.randrange(50)}",
+                    "manifest_digest": None,
+                },
+            }
+        )
+    return logs
+
+
+def decode_with_strptime(logs: List[Dict[str, Any]], since: date) -> List[Any]:
+    """Decodes logs the way they were decoded before the log decoder."""
+    pull_logs = []
+    for log in logs:
+        metadata = log.get("metadata")
+        if log.get("kind") == "pull_repo" and metadata and log.get("datetime"):
+            log_date = datetime.strptime(
+                log["datetime"], "%a, %d %b %Y %H:%M:%S %z"
+            ).date()
+            if log_date < since:
+                continue
+            pull_logs.append(
+                {
+                    "datetime": log_date,
+                    "tag": metadata.get("tag"),
+                    "digest": metadata.get("manifest_digest"),
+                }
+            )
+    return pull_logs
+
+
+def decode_with_decoder(logs: List[Dict[str, Any]], since: date) -> List[Any]:
+    """Decodes logs with the log decoder."""
+    return list(decode_pull_repo_logs(logs, since))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    logs = generate_logs(count)
+    since = date(2025, 6, 21)
+    assert len(decode_with_strptime(logs, since)) == len(
+        decode_with_decoder(logs, since)
+    )
+
+    results = {}
+    for name, decode in (
+        ("strptime", decode_with_strptime),
+        ("decoder", decode_with_decoder),
+    ):
+        seconds = min(timeit.repeat(lambda: decode(logs, since), number=1, repeat=5))
+        results[name] = seconds
+        print(f"{name:>10}: {seconds:.3f}s ({count / seconds:,.0f} logs/s)")
+    print(f"   speedup: {results['strptime'] / results['decoder']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory benchmark of operator bundles at catalog scale, comparing OperatorBundle
+with the plain class it replaced (per-instance __dict__ and a dictionary
+of pull counts).
+
+Usage: poetry run python benchmarks/operator_bundle.py [NUMBER_OF_BUNDLES]
+"""
+
+import random
+import sys
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from pullsar.operator_bundle_model import (
+    OperatorBundle,
+    extract_image_attributes,
+    extract_tag,
+)
+
+
+class DictOperatorBundle:
+    """Operator bundle the way it was represented before the compact OperatorBundle."""
+
+    def __init__(self, name: str, package: str, image: str):
+        self._name = name
+        self._package = package
+        self._image = image
+        self._tag = extract_tag(name)
+        (self._registry, self._org, self._repo, self._digest, _) = (
+            extract_image_attributes(image)
+        )
+        self._pull_count: Dict[date, int] = {}
+
+    @property
+    def pull_count(self) -> Dict[date, int]:
+        return self._pull_count
+
+    @property
+    def repo_path(self) -> Optional[str]:
+        if self._org and self._repo:
+            return f"{self._org}/{self._repo}"
+        return None
+
+
+def generate_bundle_index(count: int) -> List[Any]:
+    """
+    Generates bundles similar to those of all the catalogs and OCP versions
+    of a run, with strings parsed from JSON (not shared among bundles).
+    """
+    random.seed(0)
+    bundles = []
+    for index in range(count):
+        package = f"operator-{index % 2000}"
+        name = f"{package}.v1.{index // 2000}.0"
+        digest = f"{random.getrandbits(256):064x}"
+        image = f"registry.redhat.io/org-{index % 300}/{package}-bundle@sha256:{digest}"
+        bundles.append(("".join(name), "".join(package), "".join(image)))
+    return bundles
+
+
+def measure(create: Callable[[str, str, str], Any], bundle_index: List[Any]) -> int:
+    """Measures memory of bundles with pull counts for a 30-day log window."""
+    end = date(2025, 7, 20)
+    tracemalloc.start()
+    bundles = [create(*bundle) for bundle in bundle_index]
+    # roughly a tenth of bundles is pulled, on a few days of the window
+    for bundle in bundles[::10]:
+        for days in range(0, 30, 7):
+            log_date = end - timedelta(days=days)
+            bundle.pull_count[log_date] = bundle.pull_count.get(log_date, 0) + 1
+        bundle.repo_path
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    bundle_index = generate_bundle_index(count)
+
+    results = {}
+    for name, create in (
+        ("dict", DictOperatorBundle),
+        ("compact", OperatorBundle),
+    ):
+        results[name] = measure(create, bundle_index)
+        print(
+            f"{name:>10}: {results[name] / 2**20:.1f} MiB "
+            f"({results[name] / count:.0f} bytes/bundle)"
+        )
+    print(f"   savings: {1 - results['compact'] / results['dict']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
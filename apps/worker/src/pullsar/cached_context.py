@@ -1,16 +1,46 @@
-from typing import Dict, List, Any, NotRequired, TypedDict
+from typing import Counter, Dict, List, Any, Optional, Tuple
 from datetime import date
+from dataclasses import dataclass, field
 
-from pullsar.quay_client import QuayTag
+from pullsar.db.api_cache import ApiCacheEntries
 
 
 PyxisImage = Dict[str, Any]
+# key-value pairs, key being (date, tag or manifest digest) and value being
+# a number of 'pull_repo' logs recorded for that identifier on that date
+PullLogCounter = Counter[Tuple[date, str]]
 
+# namespaces of cached API responses persisted across runs
+IMAGE_TRANSLATIONS = "image_translations"
+TAG_DIGESTS = "tag_digests"
+PYXIS_IMAGES = "pyxis_images"
 
-class PullLog(TypedDict):
-    date: date
-    tag: NotRequired[str]
-    digest: NotRequired[str]
+
+@dataclass
+class PullLogCounts:
+    """
+    Compact aggregate of 'pull_repo' Quay logs of a single repository,
+    counting pulls by tag and pulls by manifest digest separately.
+    """
+
+    tags: PullLogCounter = field(default_factory=Counter)
+    digests: PullLogCounter = field(default_factory=Counter)
+
+    @property
+    def total(self) -> int:
+        """Total number of 'pull_repo' logs aggregated."""
+        return sum(self.tags.values()) + sum(self.digests.values())
+
+    def update(self, other: "PullLogCounts") -> None:
+        """Adds counts of other aggregated logs, e.g. of another window of days."""
+        self.tags.update(other.tags)
+        self.digests.update(other.digests)
+
+    def drop_until(self, day: date) -> None:
+        """Drops counts of the day and all the days before it."""
+        for counter in (self.tags, self.digests):
+            for key in [key for key in counter if key[0] <= day]:
+                del counter[key]
 
 
 class CachedContext:
@@ -18,20 +48,74 @@ class CachedContext:
     Holds the operator data cached during a single catalog processing run.
     When processing multiple versions of the same catalog, the operators are often repeated.
     The idea is to avoid repeating API calls for data we already asked for previously.
+    Image translations, resolved tag digests and Pyxis images can be loaded from
+    and persisted for other runs, as they rarely change for released bundles.
 
     Attributes:
         known_image_translations: A mapping from a non-quay image to its
             corresponding quay image representation.
         repo_path_to_logs: A dictionary caching Quay pull logs. Keys are
-            repository paths and values are lists of filtered Quay logs.
+            repository paths and values are aggregated 'pull_repo' logs.
         repo_path_to_pyxis_images: A dictionary caching Pyxis images. Keys are
             repository paths and values are lists of Pyxis images for that path.
-        repo_path_to_tags: A dictionary caching Quay tags. Keys are repository
-            paths and values are lists of all Quay tags for that path.
+        repo_path_to_tag_digests: A dictionary caching resolved Quay tags. Keys are
+            repository paths and values are dictionaries mapping operator bundle
+            tags to their manifest digests, None if the tag was not found.
     """
 
     def __init__(self) -> None:
         self.known_image_translations: Dict[str, str] = {}
-        self.repo_path_to_logs: Dict[str, List[PullLog]] = {}
+        self.repo_path_to_logs: Dict[str, PullLogCounts] = {}
         self.repo_path_to_pyxis_images: Dict[str, List[PyxisImage]] = {}
-        self.repo_path_to_tags: Dict[str, List[QuayTag]] = {}
+        self.repo_path_to_tag_digests: Dict[str, Dict[str, Optional[str]]] = {}
+        self._stored: ApiCacheEntries = {}
+
+    def load(self, entries: ApiCacheEntries) -> None:
+        """
+        Fills the cache with API responses persisted by previous runs.
+
+        Args:
+            entries (ApiCacheEntries): Persisted API responses by namespace.
+        """
+        self._stored = entries
+        self.known_image_translations.update(entries.get(IMAGE_TRANSLATIONS, {}))
+        for key, digest in entries.get(TAG_DIGESTS, {}).items():
+            repo_path, tag = key.rsplit(":", 1)
+            self.repo_path_to_tag_digests.setdefault(repo_path, {})[tag] = digest
+        self.repo_path_to_pyxis_images.update(entries.get(PYXIS_IMAGES, {}))
+
+    def is_stored(self, namespace: str, key: str, value: Any) -> bool:
+        """Checks if the cached value was loaded from a previous run."""
+        return self._stored.get(namespace, {}).get(key) is value
+
+    def get_new_entries(self) -> ApiCacheEntries:
+        """
+        Collects the API responses worth persisting for other runs, which
+        were not loaded from previous runs. Negative results (tags not found,
+        no Pyxis images) are not persisted, as they may change any time.
+
+        Returns:
+            ApiCacheEntries: API responses to persist by namespace.
+        """
+        entries: ApiCacheEntries = {
+            IMAGE_TRANSLATIONS: dict(self.known_image_translations),
+            TAG_DIGESTS: {
+                f"{repo_path}:{tag}": digest
+                for repo_path, tag_digests in self.repo_path_to_tag_digests.items()
+                for tag, digest in tag_digests.items()
+                if digest
+            },
+            PYXIS_IMAGES: {
+                repo_path: images
+                for repo_path, images in self.repo_path_to_pyxis_images.items()
+                if images
+            },
+        }
+        return {
+            namespace: {
+                key: value
+                for key, value in namespace_entries.items()
+                if self._stored.get(namespace, {}).get(key) != value
+            }
+            for namespace, namespace_entries in entries.items()
+        }
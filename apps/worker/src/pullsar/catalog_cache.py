@@ -0,0 +1,203 @@
+import base64
+import json
+import os
+import re
+import requests
+from typing import Callable, Dict, Optional, Protocol, Tuple
+
+from pullsar.config import logger
+from pullsar.parse_operators_catalog import BundleIndex
+
+# resolves catalog image pullspec to its manifest digest, None if it can not
+DigestResolver = Callable[[str], Optional[str]]
+
+# manifest list / index first, so that digest of a multi-arch image is resolved
+MANIFEST_MEDIA_TYPES = ", ".join(
+    (
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+        "application/vnd.oci.image.manifest.v1+json",
+        "application/vnd.docker.distribution.manifest.v2+json",
+    )
+)
+
+
+def parse_image_reference(image: str) -> Tuple[str, str, str]:
+    """
+    Splits image pullspec into registry, repository and reference (tag or digest).
+
+    Args:
+        image (str): Image pullspec, e.g. registry.redhat.io/redhat/index:v4.18
+
+    Returns:
+        Tuple[str, str, str]: Registry, repository and tag or digest,
+        e.g. ('registry.redhat.io', 'redhat/index', 'v4.18').
+        Tag 'latest' is used if the pullspec has neither tag nor digest.
+    """
+    registry, _, path = image.partition("/")
+    if "@" in path:
+        repository, _, reference = path.partition("@")
+    elif ":" in path.rsplit("/", 1)[-1]:
+        repository, _, reference = path.rpartition(":")
+    else:
+        repository, reference = path, "latest"
+    return registry, repository, reference
+
+
+class RegistryDigestResolver:
+    """
+    Resolves digests of images using registry HTTP API V2, authenticated by
+    credentials of the containers auth file used by opm (REGISTRY_AUTH_FILE).
+    """
+
+    def __init__(
+        self, auth_file: Optional[str] = None, timeout: Tuple[float, float] = (10, 30)
+    ):
+        """
+        Initializes the RegistryDigestResolver.
+
+        Args:
+            auth_file (Optional[str]): Containers auth file, e.g. auth.json with
+            base64 encoded 'user:password' credentials of registries.
+            Defaults to REGISTRY_AUTH_FILE environment variable.
+            timeout (Tuple[float, float]): Connect and read timeouts of requests.
+        """
+        self.auth_file = auth_file or os.getenv("REGISTRY_AUTH_FILE")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._credentials: Optional[Dict[str, str]] = None
+
+    def _get_credentials(self, registry: str) -> Optional[Tuple[str, str]]:
+        """Finds username and password for the registry in the auth file."""
+        if self._credentials is None:
+            self._credentials = {}
+            if self.auth_file:
+                try:
+                    with open(self.auth_file) as file:
+                        auths = json.load(file).get("auths", {})
+                    self._credentials = {
+                        key: value["auth"]
+                        for key, value in auths.items()
+                        if isinstance(value, dict) and value.get("auth")
+                    }
+                except (OSError, ValueError, AttributeError) as e:
+                    logger.warning(f"Could not read auth file {self.auth_file}: {e}")
+
+        auth = self._credentials.get(registry)
+        if not auth:
+            return None
+        username, _, password = base64.b64decode(auth).decode().partition(":")
+        return username, password
+
+    def _get_token(self, challenge: str, registry: str) -> Optional[str]:
+        """Requests bearer token as per the 'WWW-Authenticate' challenge of the registry."""
+        if not challenge.lower().startswith("bearer "):
+            return None
+        params = dict(re.findall(r'(\w+)="([^"]*)"', challenge))
+        realm = params.pop("realm", None)
+        if not realm:
+            return None
+
+        response = self.session.get(
+            realm,
+            params=params,
+            auth=self._get_credentials(registry),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        token_response = response.json()
+        return token_response.get("token") or token_response.get("access_token")
+
+    def __call__(self, image: str) -> Optional[str]:
+        """
+        Resolves the manifest digest of an image.
+
+        Args:
+            image (str): Image pullspec.
+
+        Returns:
+            Optional[str]: Manifest digest, e.g. 'sha256:abc...',
+            or None if it could not be resolved.
+        """
+        registry, repository, reference = parse_image_reference(image)
+        if reference.startswith("sha256:"):
+            return reference
+
+        url = f"https://{registry}/v2/{repository}/manifests/{reference}"
+        headers = {"Accept": MANIFEST_MEDIA_TYPES}
+        try:
+            response = self.session.head(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 401:
+                token = self._get_token(
+                    response.headers.get("WWW-Authenticate", ""), registry
+                )
+                if token:
+                    headers["Authorization"] = f"Bearer {token}"
+                    response = self.session.head(
+                        url, headers=headers, timeout=self.timeout
+                    )
+            response.raise_for_status()
+            return response.headers.get("Docker-Content-Digest")
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Could not resolve digest of catalog image {image}: {e}")
+            return None
+
+
+class CatalogIndexStore(Protocol):
+    """Persistent storage of catalog bundle indexes, e.g. DatabaseManager."""
+
+    def get_catalog_index(self, digest: str) -> Optional[BundleIndex]: ...
+
+    def save_catalog_index(self, digest: str, bundle_index: BundleIndex) -> None: ...
+
+
+class CatalogCache:
+    """
+    Content-addressed cache of catalog bundle indexes, keyed by the manifest
+    digest of the catalog image, so that catalogs unchanged since
+    the previous run are not rendered and parsed again.
+    """
+
+    def __init__(
+        self,
+        store: CatalogIndexStore,
+        digest_resolver: Optional[DigestResolver] = None,
+    ):
+        """
+        Initializes the CatalogCache.
+
+        Args:
+            store (CatalogIndexStore): Storage of the bundle indexes.
+            digest_resolver (Optional[DigestResolver]): Resolves catalog images
+            to their digests. Defaults to RegistryDigestResolver.
+        """
+        self._store = store
+        self._resolve_digest = digest_resolver or RegistryDigestResolver()
+
+    def resolve_digest(self, catalog_image: str) -> Optional[str]:
+        """Resolves the digest of the catalog image, None if it can not be resolved."""
+        return self._resolve_digest(catalog_image)
+
+    def get(self, catalog_image: str, digest: str) -> Optional[BundleIndex]:
+        """
+        Looks up the bundle index of the catalog image with the given digest.
+
+        Args:
+            catalog_image (str): Catalog image pullspec.
+            digest (str): Manifest digest of the catalog image.
+
+        Returns:
+            Optional[BundleIndex]: Cached operator bundles of the catalog, if any.
+        """
+        bundle_index = self._store.get_catalog_index(digest)
+        if bundle_index is not None:
+            logger.info(
+                f"Catalog {catalog_image} is unchanged ({digest}), "
+                f"reusing its {len(bundle_index)} cached operator bundles."
+            )
+        return bundle_index
+
+    def put(self, digest: str, bundle_index: BundleIndex) -> None:
+        """Saves the bundle index of a catalog image with the given digest."""
+        self._store.save_catalog_index(digest, bundle_index)
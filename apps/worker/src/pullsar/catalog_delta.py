@@ -0,0 +1,107 @@
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+
+from pullsar.config import logger
+from pullsar.parse_operators_catalog import BundleIndex, RepositoryMap
+
+# operator bundles of a catalog as processed by a previous run: name, package
+# and image of each bundle with its resolved Quay image with digest (None
+# if it was not resolved), see 'take_catalog_snapshot'
+CatalogSnapshot = Dict[Tuple[str, str, str], Optional[str]]
+
+
+class CatalogDelta(NamedTuple):
+    """A NamedTuple with changes of catalog bundles since its previous snapshot."""
+
+    added: BundleIndex
+    removed: BundleIndex
+    unchanged: BundleIndex
+    # images of the unchanged bundles mapped to their resolved Quay images
+    resolved_images: Dict[str, str]
+
+    @property
+    def unchanged_images(self) -> Set[str]:
+        """Resolved Quay images of the unchanged bundles, already saved in database."""
+        return set(self.resolved_images.values())
+
+    def apply(self, bundle_index: BundleIndex) -> BundleIndex:
+        """
+        Replaces images of the unchanged bundles with their resolved Quay images,
+        so that these are neither translated nor have their digests looked up again.
+
+        Args:
+            bundle_index (BundleIndex): Operator bundles of the catalog.
+
+        Returns:
+            BundleIndex: Operator bundles with the resolved images.
+        """
+        return [
+            (name, package, self.resolved_images.get(image, image))
+            for name, package, image in bundle_index
+        ]
+
+
+def diff_catalog(
+    bundle_index: BundleIndex, snapshot: Optional[CatalogSnapshot]
+) -> CatalogDelta:
+    """
+    Compares operator bundles of a catalog with its previous snapshot.
+
+    Args:
+        bundle_index (BundleIndex): Current operator bundles of the catalog.
+        snapshot (Optional[CatalogSnapshot]): Previous snapshot of the catalog,
+        None if the catalog was not processed before.
+
+    Returns:
+        CatalogDelta: Added, removed and unchanged bundles of the catalog.
+    """
+    if not snapshot:
+        return CatalogDelta(list(bundle_index), [], [], {})
+
+    added: BundleIndex = []
+    unchanged: BundleIndex = []
+    resolved_images: Dict[str, str] = {}
+    for bundle in bundle_index:
+        if bundle in snapshot:
+            unchanged.append(bundle)
+            resolved_image = snapshot[bundle]
+            if resolved_image:
+                resolved_images[bundle[2]] = resolved_image
+        else:
+            added.append(bundle)
+
+    current = set(bundle_index)
+    removed = [bundle for bundle in snapshot if bundle not in current]
+
+    logger.info(
+        f"Catalog changes since the previous run: {len(added)} added, "
+        f"{len(removed)} removed and {len(unchanged)} unchanged bundles "
+        f"({len(resolved_images)} of them with already resolved images)."
+    )
+    return CatalogDelta(added, removed, unchanged, resolved_images)
+
+
+def take_catalog_snapshot(
+    bundle_index: BundleIndex, repository_paths: RepositoryMap
+) -> CatalogSnapshot:
+    """
+    Records the resolved Quay images of operator bundles of a processed catalog.
+
+    Args:
+        bundle_index (BundleIndex): Operator bundles of the catalog, as rendered.
+        repository_paths (RepositoryMap): Quay repositories with the bundles
+        of the catalog, after resolving their images.
+
+    Returns:
+        CatalogSnapshot: Bundles of the catalog with their resolved images.
+    """
+    # bundle names are unique within a package
+    resolved_images = {
+        (bundle.name, bundle.package): bundle.image
+        for bundles in repository_paths.values()
+        for bundle in bundles
+        if bundle.digest
+    }
+    return {
+        (name, package, image): resolved_images.get((name, package))
+        for name, package, image in bundle_index
+    }
@@ -0,0 +1,209 @@
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Callable, Deque, Iterator, Optional, Sequence, Tuple
+
+from pullsar.catalog_cache import CatalogCache, parse_image_reference
+from pullsar.config import BaseConfig, logger
+from pullsar.parse_operators_catalog import (
+    BundleIndex,
+    catalog_artifact_path,
+    load_catalog_bundle_index,
+    render_operator_catalog,
+)
+
+# catalog image and optional pre-rendered JSON catalog file
+CatalogSource = Tuple[str, Optional[str]]
+
+_MEMINFO_FILE = "/proc/meminfo"
+_CGROUP_MEMORY_MAX_FILE = "/sys/fs/cgroup/memory.max"
+_CGROUP_MEMORY_CURRENT_FILE = "/sys/fs/cgroup/memory.current"
+
+
+def load_catalog(
+    catalog_image: str,
+    catalog_json_file: Optional[str],
+    digest: Optional[str] = None,
+) -> Optional[BundleIndex]:
+    """
+    Creates index of operator bundles of a catalog, either from a pre-rendered
+    catalog file, or by rendering the catalog image with opm. Rendered catalogs
+    are also saved into BaseConfig.CATALOG_ARTIFACTS_DIR, if set.
+
+    Args:
+        catalog_image (str): Operators catalog image.
+        catalog_json_file (Optional[str]): Pre-rendered operators catalog JSON file.
+        digest (Optional[str]): If set, the catalog image is rendered by this
+        digest instead of its tag, so that the index matches the digest.
+
+    Returns:
+        Optional[BundleIndex]: Operator bundles of the catalog,
+        or None if the catalog could not be loaded.
+    """
+    if catalog_json_file:
+        return load_catalog_bundle_index(catalog_json_file)
+
+    artifact_file = None
+    if BaseConfig.CATALOG_ARTIFACTS_DIR:
+        os.makedirs(BaseConfig.CATALOG_ARTIFACTS_DIR, exist_ok=True)
+        artifact_file = catalog_artifact_path(
+            catalog_image, BaseConfig.CATALOG_ARTIFACTS_DIR
+        )
+
+    render_image = catalog_image
+    if digest:
+        registry, repository, _ = parse_image_reference(catalog_image)
+        render_image = f"{registry}/{repository}@{digest}"
+    return render_operator_catalog(render_image, artifact_file)
+
+
+def _read_int(path: str) -> Optional[int]:
+    """Reads a file containing a single integer, None if it is missing or not a number."""
+    try:
+        with open(path) as file:
+            return int(file.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def available_memory() -> Optional[int]:
+    """
+    Estimates memory available for new processes, taking into account
+    the cgroup (container) memory limit, if there is any.
+
+    Returns:
+        Optional[int]: Available memory in bytes, or None if unknown.
+    """
+    available = None
+    try:
+        with open(_MEMINFO_FILE) as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError):
+        pass
+
+    # 'memory.max' is 'max' (not a number) if the cgroup is not limited
+    cgroup_max = _read_int(_CGROUP_MEMORY_MAX_FILE)
+    cgroup_current = _read_int(_CGROUP_MEMORY_CURRENT_FILE)
+    if cgroup_max is not None and cgroup_current is not None:
+        cgroup_available = max(0, cgroup_max - cgroup_current)
+        available = (
+            cgroup_available if available is None else min(available, cgroup_available)
+        )
+    return available
+
+
+def catalog_render_workers(max_workers: int, memory_per_render_mb: int) -> int:
+    """
+    Limits the number of concurrent catalog renders, so that each of them
+    has 'memory_per_render_mb' of the currently available memory.
+
+    Args:
+        max_workers (int): Configured maximum of concurrent renders.
+        memory_per_render_mb (int): Memory needed by a single render
+        (opm and the catalog parser), in MiB, 0 disables the memory limit.
+
+    Returns:
+        int: Number of concurrent renders, at least 1.
+    """
+    workers = max(1, max_workers)
+    memory = available_memory() if memory_per_render_mb > 0 else None
+    if memory is None:
+        return workers
+
+    memory_workers = max(1, memory // (memory_per_render_mb * 1024 * 1024))
+    if memory_workers < workers:
+        logger.info(
+            f"Rendering up to {memory_workers} catalogs at once instead of "
+            f"{workers} due to {memory // (1024 * 1024)} MiB of available memory."
+        )
+    return min(workers, memory_workers)
+
+
+def _init_render_worker(log_level: int) -> None:
+    """Initializes catalog render process, propagating log level of the main process."""
+    logging.getLogger(logger.name).setLevel(log_level)
+
+
+def _loaded_catalog(bundle_index: BundleIndex) -> Optional[BundleIndex]:
+    """Returns the index of an already loaded catalog."""
+    return bundle_index
+
+
+def iter_loaded_catalogs(
+    catalogs: Sequence[CatalogSource],
+    max_workers: int,
+    catalog_cache: Optional[CatalogCache] = None,
+) -> Iterator[Tuple[CatalogSource, Optional[BundleIndex]]]:
+    """
+    Loads catalogs (see 'load_catalog') in a pool of up to 'max_workers'
+    processes, so that the following catalogs are rendered and parsed while
+    the current one is being processed by the caller. At most 'max_workers'
+    catalogs are loaded ahead of the one being processed, bounding memory use.
+    Catalog images found in 'catalog_cache' by their digest are not rendered,
+    the rendered ones are added to it.
+
+    Args:
+        catalogs (Sequence[CatalogSource]): Catalog images with optional
+        pre-rendered JSON catalog files.
+        max_workers (int): Maximum number of catalogs loaded at once,
+        1 loads them one by one in the current process.
+        catalog_cache (Optional[CatalogCache]): Cache of catalog bundle indexes.
+
+    Yields:
+        Tuple[CatalogSource, Optional[BundleIndex]]: Catalog with its operator
+        bundles (None if it could not be loaded), in the input order.
+    """
+    executor = None
+    if max_workers > 1 and len(catalogs) > 1:
+        # spawned (not forked) processes, as the main process runs thread pools
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_render_worker,
+            initargs=(logger.getEffectiveLevel(),),
+        )
+    # catalog, digest to cache its index by (unless cached already) and its index
+    in_flight: Deque[
+        Tuple[CatalogSource, Optional[str], Callable[[], Optional[BundleIndex]]]
+    ] = deque()
+    remaining = iter(catalogs)
+
+    def submit(count: int) -> None:
+        for image, json_file in islice(remaining, count):
+            digest = None
+            if catalog_cache and not json_file:
+                digest = catalog_cache.resolve_digest(image)
+
+            cached_index = (
+                catalog_cache.get(image, digest) if catalog_cache and digest else None
+            )
+            load: Callable[[], Optional[BundleIndex]]
+            if cached_index is not None:
+                # nothing to be added to the cache
+                load, digest = partial(_loaded_catalog, cached_index), None
+            elif executor:
+                load = executor.submit(load_catalog, image, json_file, digest).result
+            else:
+                load = partial(load_catalog, image, json_file, digest)
+            in_flight.append(((image, json_file), digest, load))
+
+    try:
+        submit(max_workers)
+        while in_flight:
+            catalog, digest, load = in_flight.popleft()
+            bundle_index = load()
+            if catalog_cache and digest and bundle_index is not None:
+                catalog_cache.put(digest, bundle_index)
+            # start the next load before handing over the current catalog
+            submit(1)
+            yield catalog, bundle_index
+    finally:
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
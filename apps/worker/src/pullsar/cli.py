@@ -21,6 +21,8 @@ class ParsedArgs(NamedTuple):
     debug: bool
     log_days: int
     catalogs: List[ParsedCatalogArg]
+    refresh_cache: bool = False
+    refresh_watermarks: bool = False
 
 
 def discover_catalog_versions(
@@ -74,11 +76,26 @@ def parse_arguments(argv: Optional[List[str]] = None) -> ParsedArgs:
         help="run the script without saving any data to the database",
     )
     parser.add_argument("--debug", action="store_true", help="makes logs more verbose")
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="invalidate API responses (tag digests, Pyxis images) cached "
+        "in the database by previous runs and fetch them again",
+    )
     parser.add_argument(
         "--log-days",
         type=int,
         default=BaseConfig.LOG_DAYS_DEFAULT,
-        help="number of completed past days to include logs from (default: 7)",
+        help="number of completed past days to include logs from (default: 7), "
+        "repositories with logs already saved to the database are fetched "
+        "only for the days after the last saved day instead",
+    )
+    parser.add_argument(
+        "--refresh-watermarks",
+        action="store_true",
+        help="ignore the last days logs were saved through by previous runs "
+        "and fetch logs of all repositories for the last --log-days days again, "
+        "e.g. to backfill pulls of newly added bundles or late Quay logs",
     )
 
     catalog_group = parser.add_mutually_exclusive_group(required=True)
@@ -92,7 +109,8 @@ def parse_arguments(argv: Optional[List[str]] = None) -> ParsedArgs:
         help="operators catalog, e.g. '<CATALOG_IMAGE_PULLSPEC>:<OCP_VERSION>' "
         "to be rendered with 'opm' and used in database entry (keeping track of "
         "each operator's source catalogs). To skip render, provide optional second "
-        "argument, a path to a pre-rendered catalog JSON file. Option is repeatable.",
+        "argument, a path to a pre-rendered catalog JSON file (or its .gz "
+        "artifact). Option is repeatable.",
     )
     catalog_group.add_argument(
         "--catalog-base-image",
@@ -149,4 +167,6 @@ def parse_arguments(argv: Optional[List[str]] = None) -> ParsedArgs:
         debug=args.debug,
         log_days=args.log_days,
         catalogs=catalog_args,
+        refresh_cache=args.refresh_cache,
+        refresh_watermarks=args.refresh_watermarks,
     )
@@ -0,0 +1,85 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Hashable, Iterable, List, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+# (task key, concurrency group, callable producing the task result)
+FetchTask = Tuple[K, str, Callable[[], R]]
+
+
+class ConcurrentFetcher:
+    """
+    Runs independent, I/O bound fetch tasks (API requests) on a thread pool.
+
+    Concurrency is bounded globally by 'max_workers' and within each group
+    (e.g. a Quay organization) by 'max_workers_per_group', so that requests
+    authorized by a single organization's API token stay within its rate limit.
+    Tasks of a group over its limit wait in a queue without occupying a worker.
+    """
+
+    def __init__(self, max_workers: int, max_workers_per_group: int):
+        """
+        Initializes the ConcurrentFetcher.
+
+        Args:
+            max_workers (int): Maximum number of tasks running at once.
+            max_workers_per_group (int): Maximum number of tasks of a single
+            group running at once.
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_workers_per_group = max(1, max_workers_per_group)
+
+    def run(self, tasks: Iterable[FetchTask[K, R]]) -> Dict[K, R]:
+        """
+        Runs all the given tasks and waits for their completion.
+
+        Args:
+            tasks (Iterable[FetchTask]): Tuples of task key, concurrency group
+            and a callable with no arguments returning the task result.
+
+        Returns:
+            Dict[K, R]: Task results keyed by task keys, in the order
+            in which the tasks were given (independent of completion order).
+        """
+        order: List[K] = []
+        pending: Dict[str, Deque[Tuple[K, Callable[[], R]]]] = {}
+        for key, group, func in tasks:
+            order.append(key)
+            pending.setdefault(group, deque()).append((key, func))
+
+        if not order:
+            return {}
+
+        results: Dict[K, R] = {}
+        running: Dict[str, int] = {group: 0 for group in pending}
+        in_flight: Dict[Future[R], Tuple[K, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or in_flight:
+                # round-robin over groups, so one large group does not starve others
+                submitted = True
+                while submitted and len(in_flight) < self.max_workers:
+                    submitted = False
+                    for group in list(pending):
+                        if len(in_flight) >= self.max_workers:
+                            break
+                        if running[group] >= self.max_workers_per_group:
+                            continue
+
+                        key, func = pending[group].popleft()
+                        if not pending[group]:
+                            del pending[group]
+
+                        in_flight[executor.submit(func)] = (key, group)
+                        running[group] += 1
+                        submitted = True
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, group = in_flight.pop(future)
+                    running[group] -= 1
+                    results[key] = future.result()
+
+        return {key: results[key] for key in order}
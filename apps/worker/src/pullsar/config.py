@@ -40,6 +40,20 @@ def load_quay_api_tokens() -> Dict[str, str]:
         raise
 
 
+@dataclass
+class HttpRetryConfig:
+    """A dataclass to hold timeouts and retry policy of API requests."""
+
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    max_retries: int = 5
+    # exponential backoff: up to 'backoff_factor * 2^attempt' seconds, with jitter
+    backoff_factor: float = 1.0
+    max_backoff: float = 60.0
+    # 'Retry-After' header of rate limited responses is honored up to this many seconds
+    max_retry_after: float = 300.0
+
+
 @dataclass
 class DBConfig:
     """A dataclass to hold database connection details."""
@@ -65,14 +79,68 @@ class BaseConfig(object):
     PYXIS_API_BASE_URL = "https://pyxis.engineering.redhat.com/v1"
     PYXIS_PUBLIC_API_BASE_URL = "https://catalog.redhat.com/api/containers/v1/"
 
-    # destination for output rendered JSON operators catalog files
-    CATALOG_JSON_FILE = "operators_catalog.json"
+    # if set, rendered JSON operators catalogs are also saved into this directory,
+    # gzip compressed and named after the catalog and its OCP version
+    CATALOG_ARTIFACTS_DIR = os.getenv("CATALOG_ARTIFACTS_DIR")
+    # catalogs rendered and parsed at once (in separate processes) while another
+    # catalog's usage stats are being resolved, each render is expected to need
+    # CATALOG_RENDER_MEMORY_MB of memory (0 disables the available memory limit)
+    CATALOG_RENDER_WORKERS = int(os.getenv("CATALOG_RENDER_WORKERS", 2))
+    CATALOG_RENDER_MEMORY_MB = int(os.getenv("CATALOG_RENDER_MEMORY_MB", 1536))
+    # operator bundles of rendered catalogs are cached in the database by catalog
+    # image digest, catalogs unchanged since the previous runs are not rendered
+    # again, cached catalogs not used for CATALOG_CACHE_TTL_DAYS days are dropped
+    CATALOG_CACHE = os.getenv("CATALOG_CACHE", "true").lower() == "true"
+    CATALOG_CACHE_TTL_DAYS = int(os.getenv("CATALOG_CACHE_TTL_DAYS", 30))
+    # 'pull_counts' is partitioned by month, partitions are created for pull
+    # dates being saved and PULL_COUNTS_PARTITIONS_AHEAD months ahead of today
+    PULL_COUNTS_PARTITIONS_AHEAD = int(os.getenv("PULL_COUNTS_PARTITIONS_AHEAD", 3))
     # floor for dynamically resolved OCP versions via public Pyxis
     MIN_OCP_VERSION = "4.8"
     LOG_DAYS_DEFAULT = 7
     LOG_DAYS_MIN = 1
     LOG_DAYS_MAX = 30  # Quay limit
 
+    # concurrent Quay API requests, overall and per organization (API token)
+    QUAY_MAX_WORKERS = int(os.getenv("QUAY_MAX_WORKERS", 16))
+    QUAY_MAX_WORKERS_PER_ORG = int(os.getenv("QUAY_MAX_WORKERS_PER_ORG", 4))
+    # logs are fetched in windows of at most QUAY_LOG_WINDOW_DAYS days, a window
+    # spanning more than QUAY_LOG_WINDOW_MAX_PAGES pages is split in halves
+    QUAY_LOG_WINDOW_DAYS = int(os.getenv("QUAY_LOG_WINDOW_DAYS", LOG_DAYS_MAX))
+    QUAY_LOG_WINDOW_MAX_PAGES = int(os.getenv("QUAY_LOG_WINDOW_MAX_PAGES", 10))
+    # logs of organizations with at least QUAY_ORG_LOGS_MIN_REPOS repositories
+    # referenced by a catalog are fetched through organization logs (0 disables)
+    QUAY_ORG_LOGS_MIN_REPOS = int(os.getenv("QUAY_ORG_LOGS_MIN_REPOS", 20))
+    # aggregated log counts of organizations are checked first, so that logs
+    # are scanned only for days with any 'pull_repo' activity
+    QUAY_LOG_PRECHECK = os.getenv("QUAY_LOG_PRECHECK", "true").lower() == "true"
+    # up to QUAY_TAG_LOOKUP_MAX_TAGS unresolved tags of a repository are looked up
+    # one by one, more of them are resolved by listing the repository's tags
+    QUAY_TAG_LOOKUP_MAX_TAGS = int(os.getenv("QUAY_TAG_LOOKUP_MAX_TAGS", 5))
+    QUAY_RETRY_CONFIG = HttpRetryConfig(
+        connect_timeout=float(os.getenv("QUAY_CONNECT_TIMEOUT", 10)),
+        read_timeout=float(os.getenv("QUAY_READ_TIMEOUT", 60)),
+        max_retries=int(os.getenv("QUAY_MAX_RETRIES", 5)),
+        max_retry_after=float(os.getenv("QUAY_MAX_RETRY_AFTER", 300)),
+    )
+
+    # days API responses cached in the database (tag digests, Pyxis images
+    # and image translations) are reused for before being fetched again
+    API_CACHE_TTL_DAYS = int(os.getenv("API_CACHE_TTL_DAYS", 30))
+
+    # concurrent Pyxis API requests, each of them resolving images
+    # of up to PYXIS_BATCH_SIZE repositories
+    PYXIS_MAX_WORKERS = int(os.getenv("PYXIS_MAX_WORKERS", 4))
+    PYXIS_BATCH_SIZE = int(os.getenv("PYXIS_BATCH_SIZE", 50))
+    # items per page of Pyxis API responses, pages of a query fetched concurrently
+    PYXIS_PAGE_SIZE = int(os.getenv("PYXIS_PAGE_SIZE", 100))
+    PYXIS_PAGE_WORKERS = int(os.getenv("PYXIS_PAGE_WORKERS", 4))
+    # connect and read timeouts (seconds) of Pyxis API requests
+    PYXIS_TIMEOUT = (
+        float(os.getenv("PYXIS_CONNECT_TIMEOUT", 10)),
+        float(os.getenv("PYXIS_READ_TIMEOUT", 60)),
+    )
+
     # PostgreSQL configuration
     DB_CONFIG = DBConfig(
         dbname=os.getenv("DB_NAME"),
@@ -0,0 +1,64 @@
+from typing import Any, Dict, Optional
+
+from psycopg2.extensions import cursor
+from psycopg2.extras import Json, execute_values
+
+# key-value pairs, key being a namespace and value being a dictionary
+# of cached API responses (JSON serializable) by their keys
+ApiCacheEntries = Dict[str, Dict[str, Any]]
+
+
+def select_api_cache(cur: cursor, ttl_days: int) -> ApiCacheEntries:
+    """Selects the cached API responses updated in the last 'ttl_days' days."""
+    cur.execute(
+        """
+        SELECT namespace, key, value FROM api_cache
+        WHERE updated_at > NOW() - make_interval(days => %s);
+        """,
+        (ttl_days,),
+    )
+    entries: ApiCacheEntries = {}
+    for namespace, key, value in cur:
+        entries.setdefault(namespace, {})[key] = value
+    return entries
+
+
+def upsert_api_cache(cur: cursor, entries: ApiCacheEntries) -> None:
+    """Inserts or replaces the given cached API responses."""
+    rows = [
+        (namespace, key, Json(value))
+        for namespace, namespace_entries in entries.items()
+        for key, value in namespace_entries.items()
+    ]
+    if not rows:
+        return
+
+    execute_values(
+        cur,
+        """
+        INSERT INTO api_cache (namespace, key, value)
+        VALUES %s
+        ON CONFLICT (namespace, key) DO UPDATE
+        SET value = EXCLUDED.value,
+        updated_at = NOW();
+        """,
+        rows,
+    )
+
+
+def delete_api_cache(cur: cursor, ttl_days: Optional[int] = None) -> int:
+    """
+    Deletes the cached API responses older than 'ttl_days' days,
+    or all of them if 'ttl_days' is None. Returns the number of deleted rows.
+    """
+    if ttl_days is None:
+        cur.execute("DELETE FROM api_cache;")
+    else:
+        cur.execute(
+            """
+            DELETE FROM api_cache
+            WHERE updated_at <= NOW() - make_interval(days => %s);
+            """,
+            (ttl_days,),
+        )
+    return cur.rowcount
@@ -0,0 +1,40 @@
+from typing import Dict, Iterable, List
+
+from psycopg2.extensions import cursor
+from psycopg2.extras import execute_values
+
+from pullsar.operator_bundle_model import OperatorBundle
+
+# number of bundles inserted by a single statement
+BUNDLES_PAGE_SIZE = 1000
+
+
+def select_bundle_ids(cur: cursor, images: List[str]) -> Dict[str, int]:
+    """Selects ids of the bundles with the given images, by their images."""
+    if not images:
+        return {}
+
+    cur.execute("SELECT image, id FROM bundles WHERE image = ANY(%s);", (images,))
+    return {image: bundle_id for image, bundle_id in cur}
+
+
+def insert_bundles(cur: cursor, bundles: Iterable[OperatorBundle]) -> Dict[str, int]:
+    """Inserts the bundles in bulk, returns their ids by their images."""
+    rows = [(bundle.name, bundle.package, bundle.image) for bundle in bundles]
+    if not rows:
+        return {}
+
+    inserted = execute_values(
+        cur,
+        """
+        INSERT INTO bundles (name, package, image)
+        VALUES %s
+        ON CONFLICT (image) DO UPDATE
+        SET package = EXCLUDED.package, name = EXCLUDED.name
+        RETURNING image, id;
+        """,
+        rows,
+        page_size=BUNDLES_PAGE_SIZE,
+        fetch=True,
+    )
+    return {image: bundle_id for image, bundle_id in inserted}
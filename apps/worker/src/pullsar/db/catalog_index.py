@@ -0,0 +1,64 @@
+import json
+import zlib
+from typing import Optional
+
+from psycopg2 import Binary
+from psycopg2.extensions import cursor
+
+from pullsar.parse_operators_catalog import BundleIndex
+
+
+def serialize_bundle_index(bundle_index: BundleIndex) -> bytes:
+    """Serializes bundle index into compressed compact JSON."""
+    return zlib.compress(json.dumps(bundle_index, separators=(",", ":")).encode())
+
+
+def deserialize_bundle_index(data: bytes) -> BundleIndex:
+    """Deserializes bundle index serialized by 'serialize_bundle_index'."""
+    return [
+        (name, package, image)
+        for name, package, image in json.loads(zlib.decompress(data))
+    ]
+
+
+def select_catalog_index(cur: cursor, digest: str) -> Optional[BundleIndex]:
+    """Selects bundle index of the catalog image digest, marking it as used."""
+    cur.execute(
+        """
+        UPDATE catalog_index SET last_used_at = NOW()
+        WHERE digest = %s
+        RETURNING bundles;
+        """,
+        (digest,),
+    )
+    row = cur.fetchone()
+    return deserialize_bundle_index(bytes(row[0])) if row else None
+
+
+def upsert_catalog_index(cur: cursor, digest: str, bundle_index: BundleIndex) -> None:
+    """Inserts or replaces bundle index of the catalog image digest."""
+    cur.execute(
+        """
+        INSERT INTO catalog_index (digest, bundles)
+        VALUES (%s, %s)
+        ON CONFLICT (digest) DO UPDATE
+        SET bundles = EXCLUDED.bundles,
+        last_used_at = NOW();
+        """,
+        (digest, Binary(serialize_bundle_index(bundle_index))),
+    )
+
+
+def delete_catalog_index(cur: cursor, ttl_days: int) -> int:
+    """
+    Deletes bundle indexes not used in the last 'ttl_days' days.
+    Returns the number of deleted rows.
+    """
+    cur.execute(
+        """
+        DELETE FROM catalog_index
+        WHERE last_used_at <= NOW() - make_interval(days => %s);
+        """,
+        (ttl_days,),
+    )
+    return cur.rowcount
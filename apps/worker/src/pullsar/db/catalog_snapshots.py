@@ -0,0 +1,48 @@
+import json
+import zlib
+from typing import Optional
+
+from psycopg2 import Binary
+from psycopg2.extensions import cursor
+
+from pullsar.catalog_delta import CatalogSnapshot
+
+
+def serialize_catalog_snapshot(snapshot: CatalogSnapshot) -> bytes:
+    """Serializes catalog snapshot into compressed compact JSON."""
+    rows = [[*bundle, resolved_image] for bundle, resolved_image in snapshot.items()]
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode())
+
+
+def deserialize_catalog_snapshot(data: bytes) -> CatalogSnapshot:
+    """Deserializes catalog snapshot serialized by 'serialize_catalog_snapshot'."""
+    return {
+        (name, package, image): resolved_image
+        for name, package, image, resolved_image in json.loads(zlib.decompress(data))
+    }
+
+
+def select_catalog_snapshot(cur: cursor, catalog: str) -> Optional[CatalogSnapshot]:
+    """Selects the snapshot of operator bundles of the catalog, if there is any."""
+    cur.execute(
+        "SELECT bundles FROM catalog_snapshots WHERE catalog = %s;",
+        (catalog,),
+    )
+    row = cur.fetchone()
+    return deserialize_catalog_snapshot(bytes(row[0])) if row else None
+
+
+def upsert_catalog_snapshot(
+    cur: cursor, catalog: str, snapshot: CatalogSnapshot
+) -> None:
+    """Inserts or replaces the snapshot of operator bundles of the catalog."""
+    cur.execute(
+        """
+        INSERT INTO catalog_snapshots (catalog, bundles)
+        VALUES (%s, %s)
+        ON CONFLICT (catalog) DO UPDATE
+        SET bundles = EXCLUDED.bundles,
+        updated_at = NOW();
+        """,
+        (catalog, Binary(serialize_catalog_snapshot(snapshot))),
+    )
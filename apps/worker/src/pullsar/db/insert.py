@@ -1,49 +1,121 @@
-from pullsar.parse_operators_catalog import RepositoryMap
+import io
+from typing import AbstractSet, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+from pullsar.global_index import GlobalBundleIndex
 from psycopg2.extensions import cursor
 
+# special characters of the COPY text format and their escape sequences
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+# staging tables are dropped at the end of the transaction of the insert
+_CREATE_STAGING_TABLES = """
+CREATE TEMP TABLE staging_appearances (
+    bundle_id INTEGER NOT NULL,
+    catalog_name TEXT NOT NULL,
+    ocp_version TEXT NOT NULL
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE staging_pull_counts (
+    bundle_id INTEGER NOT NULL,
+    pull_date DATE NOT NULL,
+    pull_count INTEGER NOT NULL
+) ON COMMIT DROP;
+"""
+
+_MERGE_STAGING_APPEARANCES = """
+INSERT INTO bundle_appearances (bundle_id, catalog_name, ocp_version)
+SELECT bundle_id, catalog_name, ocp_version
+FROM staging_appearances
+ON CONFLICT (bundle_id, catalog_name, ocp_version) DO NOTHING;
+"""
+
+# staged pull counts already stored, counted before the merge, so that
+# the rows it writes can be told apart into inserted and updated ones
+_COUNT_STORED_PULL_COUNTS = """
+SELECT COUNT(*)
+FROM staging_pull_counts
+JOIN pull_counts USING (bundle_id, pull_date);
+"""
+
+# rows with the same pull count are not rewritten, nor counted as affected
+_MERGE_STAGING_PULL_COUNTS = """
+INSERT INTO pull_counts (bundle_id, pull_date, pull_count)
+SELECT bundle_id, pull_date, pull_count
+FROM staging_pull_counts
+ON CONFLICT (bundle_id, pull_date)
+DO UPDATE SET pull_count = EXCLUDED.pull_count
+WHERE pull_counts.pull_count IS DISTINCT FROM EXCLUDED.pull_count;
+"""
+
+
+class PullCountsSummary(NamedTuple):
+    """A NamedTuple with numbers of pull counts rows by the way they were saved."""
+
+    inserted: int
+    updated: int
+    unchanged: int
+
 
 def insert_data(
-    cur: cursor, repository_paths: RepositoryMap, catalog_name: str, ocp_version: str
-) -> None:
-    """Inserts data into the set up 3-table schema."""
-    for operator_bundles in repository_paths.values():
-        for bundle in operator_bundles:
-            # add bundle
-            cur.execute(
-                """
-            INSERT INTO bundles (name, package, image)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (image) DO UPDATE
-            SET package = EXCLUDED.package, name = EXCLUDED.name
-            RETURNING id;
-            """,
-                (bundle.name, bundle.package, bundle.image),
+    cur: cursor,
+    bundle_index: GlobalBundleIndex,
+    bundle_ids: Mapping[str, int],
+    inserted_images: AbstractSet[str] = frozenset(),
+) -> PullCountsSummary:
+    """
+    Inserts appearances in catalogs and pull counts of bundles of the index,
+    already saved in 'bundles' table with the given ids, into the set up 3-table
+    schema. They are copied into temporary staging tables and merged into
+    the schema by a few set-based statements. Bundles with all their appearances
+    saved by a previous run (unless just inserted, see 'inserted_images') only
+    have their pull counts updated. Bundles without an id are skipped.
+    Stored pull counts equal to the new ones are left as they are.
+
+    Returns:
+        PullCountsSummary: Numbers of inserted, updated and unchanged
+        pull counts rows.
+    """
+    appearances: List[Tuple[str, ...]] = []
+    pull_counts: List[Tuple[str, ...]] = []
+    for bundle in bundle_index:
+        image = bundle.image
+        if image not in bundle_ids:
+            continue
+
+        bundle_id = str(bundle_ids[image])
+        if image in inserted_images or not bundle_index.is_unchanged(bundle):
+            appearances.extend(
+                (bundle_id, catalog_name, ocp_version)
+                for catalog_name, ocp_version in sorted(
+                    bundle_index.appearances(bundle)
+                )
             )
+        pull_counts.extend(
+            (bundle_id, pull_date.isoformat(), str(count))
+            for pull_date, count in bundle.pull_count.items()
+        )
 
-            result = cur.fetchone()
-            if not result:
-                continue
+    if not appearances and not pull_counts:
+        return PullCountsSummary(0, 0, 0)
 
-            bundle_id = result[0]
+    cur.execute(_CREATE_STAGING_TABLES)
+    _copy_rows(cur, "staging_appearances", appearances)
+    _copy_rows(cur, "staging_pull_counts", pull_counts)
+    cur.execute(_MERGE_STAGING_APPEARANCES)
+    cur.execute(_COUNT_STORED_PULL_COUNTS)
+    result = cur.fetchone()
+    stored = result[0] if result else 0
+    cur.execute(_MERGE_STAGING_PULL_COUNTS)
+    # staged rows not stored yet are all inserted, the other written rows updated
+    inserted = len(pull_counts) - stored
+    updated = max(cur.rowcount, 0) - inserted
+    return PullCountsSummary(inserted, updated, stored - updated)
 
-            # enter bundle's appearance in catalog
-            cur.execute(
-                """
-            INSERT INTO bundle_appearances (bundle_id, catalog_name, ocp_version)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (bundle_id, catalog_name, ocp_version) DO NOTHING;
-            """,
-                (bundle_id, catalog_name, ocp_version),
-            )
 
-            # update bundle's pull counts
-            for pull_date, pull_count in bundle.pull_count.items():
-                cur.execute(
-                    """
-                INSERT INTO pull_counts (bundle_id, pull_date, pull_count)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (bundle_id, pull_date)
-                DO UPDATE SET pull_count = EXCLUDED.pull_count;
-                """,
-                    (bundle_id, pull_date, pull_count),
-                )
+def _copy_rows(cur: cursor, table: str, rows: Iterable[Sequence[str]]) -> None:
+    """Copies rows of text values into the table using COPY text format."""
+    data = io.StringIO()
+    for row in rows:
+        data.write("\t".join(value.translate(_COPY_ESCAPES) for value in row))
+        data.write("\n")
+    data.seek(0)
+    cur.copy_expert(f"COPY {table} FROM STDIN", data)
@@ -1,10 +1,35 @@
 import psycopg2
+from datetime import date
+from typing import Dict, Optional
 
 from pullsar.config import BaseConfig, logger
-from pullsar.operator_bundle_model import extract_catalog_attributes
-from pullsar.parse_operators_catalog import RepositoryMap
+from pullsar.parse_operators_catalog import BundleIndex
+from pullsar.global_index import GlobalBundleIndex
+from pullsar.catalog_delta import CatalogSnapshot
 from pullsar.db.schema import create_tables
 from pullsar.db.insert import insert_data
+from pullsar.db.pull_count_partitions import (
+    add_months,
+    create_pull_counts_partitions,
+    is_pull_counts_partitioned,
+)
+from pullsar.db.bundles import insert_bundles, select_bundle_ids
+from pullsar.db.watermarks import select_log_watermarks, upsert_log_watermarks
+from pullsar.db.api_cache import (
+    ApiCacheEntries,
+    select_api_cache,
+    upsert_api_cache,
+    delete_api_cache,
+)
+from pullsar.db.catalog_snapshots import (
+    select_catalog_snapshot,
+    upsert_catalog_snapshot,
+)
+from pullsar.db.catalog_index import (
+    select_catalog_index,
+    upsert_catalog_index,
+    delete_catalog_index,
+)
 
 
 class DatabaseManager:
@@ -31,36 +56,219 @@ class DatabaseManager:
         self.cur = self.conn.cursor()
         logger.info("Database connection established.")
         create_tables(self.cur)
+        today = date.today()
+        self._create_pull_counts_partitions(today, today)
         self.conn.commit()
 
-    def save_operator_usage_stats(
-        self, repository_paths: RepositoryMap, catalog_image: str
+    def _create_pull_counts_partitions(self, first_day: date, last_day: date) -> None:
+        """Creates missing monthly partitions of pull counts for the dates
+        from 'first_day' through 'last_day' and BaseConfig.PULL_COUNTS_PARTITIONS_AHEAD
+        months ahead of today, to be committed by the caller.
+
+        Args:
+            first_day (date): First pull date to be saved.
+            last_day (date): Last pull date to be saved.
+        """
+        if not self.cur:
+            return
+        if not is_pull_counts_partitioned(self.cur):
+            logger.warning(
+                "Table 'pull_counts' is not partitioned, migration V6 is pending."
+            )
+            return
+
+        last_day = add_months(
+            max(last_day, date.today()), BaseConfig.PULL_COUNTS_PARTITIONS_AHEAD
+        )
+        created = create_pull_counts_partitions(self.cur, first_day, last_day)
+        if created:
+            logger.info(f"Created partitions of pull counts: {', '.join(created)}.")
+
+    def save_operator_usage_stats(self, bundle_index: GlobalBundleIndex) -> None:
+        """Saves operator usage stats of all the processed catalogs to the configured database.
+
+        Args:
+            bundle_index (GlobalBundleIndex): Run-wide index of operator bundles
+            with their pull counts and appearances in the processed catalogs.
+        """
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot save results.")
+            return
+
+        logger.info(
+            f"Saving data of {len(bundle_index)} operator bundles from "
+            f"{bundle_index.catalog_count} catalogs to the database..."
+        )
+        bundles = [
+            bundle for bundle in bundle_index if bundle_index.appearances(bundle)
+        ]
+        # existing bundles are only looked up, only the unknown ones are inserted
+        bundle_ids = select_bundle_ids(self.cur, [bundle.image for bundle in bundles])
+        inserted_ids = insert_bundles(
+            self.cur, (bundle for bundle in bundles if bundle.image not in bundle_ids)
+        )
+        bundle_ids.update(inserted_ids)
+        pull_dates = {
+            pull_date for bundle in bundles for pull_date in bundle.pull_count
+        }
+        if pull_dates:
+            self._create_pull_counts_partitions(min(pull_dates), max(pull_dates))
+        summary = insert_data(self.cur, bundle_index, bundle_ids, inserted_ids.keys())
+        self.conn.commit()
+        logger.info(
+            f"Data were successfully saved to the database "
+            f"({len(inserted_ids)} new operator bundles, pull counts: "
+            f"{summary.inserted} inserted, {summary.updated} updated, "
+            f"{summary.unchanged} unchanged)."
+        )
+
+    def get_log_watermarks(self) -> Dict[str, date]:
+        """Loads the dates through which logs of each repository were ingested.
+
+        Returns:
+            Dict[str, date]: Dictionary of key-value pairs, key being a Quay
+            repository path and value being the last ingested date.
+        """
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot load log watermarks.")
+            return {}
+
+        return select_log_watermarks(self.cur)
+
+    def save_log_watermarks(self, watermarks: Dict[str, date]) -> None:
+        """Saves the dates through which logs of each repository were ingested.
+
+        Args:
+            watermarks (Dict[str, date]): Dictionary of key-value pairs, key being
+            a Quay repository path and value being the last ingested date.
+        """
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot save log watermarks.")
+            return
+
+        upsert_log_watermarks(self.cur, watermarks)
+        self.conn.commit()
+        logger.info(f"Log watermarks of {len(watermarks)} repositories were saved.")
+
+    def get_api_cache(self) -> ApiCacheEntries:
+        """Loads the API responses cached by previous runs, dropping expired ones
+        (older than BaseConfig.API_CACHE_TTL_DAYS days).
+
+        Returns:
+            ApiCacheEntries: Dictionary of key-value pairs, key being a namespace
+            and value being a dictionary of cached API responses by their keys.
+        """
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot load API cache.")
+            return {}
+
+        ttl_days = BaseConfig.API_CACHE_TTL_DAYS
+        expired = delete_api_cache(self.cur, ttl_days)
+        self.conn.commit()
+        entries = select_api_cache(self.cur, ttl_days)
+        logger.info(
+            f"Loaded {sum(len(e) for e in entries.values())} cached API responses "
+            f"({expired} expired were dropped)."
+        )
+        return entries
+
+    def save_api_cache(self, entries: ApiCacheEntries) -> None:
+        """Saves API responses to be reused by the next runs.
+
+        Args:
+            entries (ApiCacheEntries): Dictionary of key-value pairs, key being
+            a namespace and value being a dictionary of API responses by their keys.
+        """
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot save API cache.")
+            return
+
+        upsert_api_cache(self.cur, entries)
+        self.conn.commit()
+        logger.info(
+            f"{sum(len(e) for e in entries.values())} API responses were cached."
+        )
+
+    def clear_api_cache(self) -> None:
+        """Invalidates all the API responses cached by previous runs."""
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot clear API cache.")
+            return
+
+        deleted = delete_api_cache(self.cur)
+        self.conn.commit()
+        logger.info(f"{deleted} cached API responses were invalidated.")
+
+    def get_catalog_index(self, digest: str) -> Optional[BundleIndex]:
+        """Loads operator bundles of a catalog image rendered by previous runs.
+
+        Args:
+            digest (str): Manifest digest of the catalog image.
+
+        Returns:
+            Optional[BundleIndex]: Operator bundles of the catalog,
+            or None if the catalog image digest was not rendered yet.
+        """
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot load catalog index.")
+            return None
+
+        bundle_index = select_catalog_index(self.cur, digest)
+        self.conn.commit()
+        return bundle_index
+
+    def save_catalog_index(self, digest: str, bundle_index: BundleIndex) -> None:
+        """Saves operator bundles of a rendered catalog image, dropping those
+        not used in the last BaseConfig.CATALOG_CACHE_TTL_DAYS days.
+
+        Args:
+            digest (str): Manifest digest of the catalog image.
+            bundle_index (BundleIndex): Operator bundles of the catalog.
+        """
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot save catalog index.")
+            return
+
+        expired = delete_catalog_index(self.cur, BaseConfig.CATALOG_CACHE_TTL_DAYS)
+        upsert_catalog_index(self.cur, digest, bundle_index)
+        self.conn.commit()
+        logger.info(
+            f"{len(bundle_index)} operator bundles of catalog {digest} were cached "
+            f"({expired} unused catalogs were dropped)."
+        )
+
+    def get_catalog_snapshot(self, catalog_image: str) -> Optional[CatalogSnapshot]:
+        """Loads operator bundles of the catalog as processed by the previous run.
+
+        Args:
+            catalog_image (str): Operators catalog image.
+
+        Returns:
+            Optional[CatalogSnapshot]: Bundles of the catalog with their resolved
+            images, or None if the catalog was not processed before.
+        """
+        if not self.conn or not self.cur:
+            logger.error("Database is not connected. Cannot load catalog snapshot.")
+            return None
+
+        return select_catalog_snapshot(self.cur, catalog_image)
+
+    def save_catalog_snapshot(
+        self, catalog_image: str, snapshot: CatalogSnapshot
     ) -> None:
-        """Saves operator usage stats to the configured database.
+        """Saves operator bundles of the processed catalog for the next run.
 
         Args:
-            repository_paths (RepositoryMap): Dictionary of key-value pairs,
-            key being a quay repository and value being a list of OperatorBundle
-            objects, images of which are stored in the repository.
             catalog_image (str): Operators catalog image.
+            snapshot (CatalogSnapshot): Bundles of the catalog with their
+            resolved images.
         """
         if not self.conn or not self.cur:
-            logger.error("Database is not connected. Cannot save results.")
+            logger.error("Database is not connected. Cannot save catalog snapshot.")
             return
 
-        catalog_name, ocp_version = extract_catalog_attributes(catalog_image)
-        if catalog_name and ocp_version:
-            logger.info(f"Saving data for catalog {catalog_image} to the database...")
-            insert_data(self.cur, repository_paths, catalog_name, ocp_version)
-            self.conn.commit()
-            logger.info("Data were successfully saved to the database.")
-        else:
-            logger.error(
-                f"Cannot save data for {catalog_image} to the database. "
-                "Catalog image format is not supported. Expected image format: "
-                "<CATALOG_NAME>:<OCP_VERSION>. Please, re-run script"
-                "to save retrieved pull stats to the database."
-            )
+        upsert_catalog_snapshot(self.cur, catalog_image, snapshot)
+        self.conn.commit()
 
     def close(self):
         """Closes the database connection."""
@@ -0,0 +1,70 @@
+from datetime import date
+from typing import List, Set
+
+from psycopg2.extensions import cursor
+
+
+def month_start(day: date) -> date:
+    """Returns the first day of the month of the day."""
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """Returns the first day of the month 'months' months after the month of the day."""
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    return date(year, month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Returns the name of the pull counts partition of the month, e.g. pull_counts_y2025m07."""
+    return f"pull_counts_y{month.year:04d}m{month.month:02d}"
+
+
+def is_pull_counts_partitioned(cur: cursor) -> bool:
+    """Checks whether 'pull_counts' table is partitioned (by migration V6 or schema)."""
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('pull_counts');")
+    row = cur.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def select_pull_counts_partitions(cur: cursor) -> Set[str]:
+    """Selects names of the partitions attached to 'pull_counts' table."""
+    cur.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass('pull_counts');
+        """
+    )
+    return {name for (name,) in cur}
+
+
+def create_pull_counts_partitions(
+    cur: cursor, first_day: date, last_day: date
+) -> List[str]:
+    """
+    Creates monthly partitions of 'pull_counts' table missing for any month
+    from the month of 'first_day' through the month of 'last_day'.
+    Existing partitions are not touched, so that the table is not locked
+    when all of them exist.
+
+    Returns:
+        List[str]: Names of the created partitions.
+    """
+    existing = select_pull_counts_partitions(cur)
+    created = []
+    month = month_start(first_day)
+    while month <= last_day:
+        name = partition_name(month)
+        if name not in existing:
+            cur.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {name} PARTITION OF pull_counts
+                FOR VALUES FROM (%s) TO (%s);
+                """,
+                (month, add_months(month, 1)),
+            )
+            created.append(name)
+        month = add_months(month, 1)
+    return created
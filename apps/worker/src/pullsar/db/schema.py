@@ -3,11 +3,17 @@ from psycopg2.extensions import cursor
 
 def create_tables(cur: cursor) -> None:
     """
-    For the configured database, create 3 tables:
+    For the configured database, create 7 tables:
     'bundles' to see individual operator bundles (versions),
     'bundle_appearances' to see which bundles appear in which catalogs,
     'pull_counts' to see how many times were bundles pulled
-    from Quay on each date since recording started.
+    from Quay on each date since recording started (partitioned by month,
+    see 'create_pull_counts_partitions'),
+    'log_watermarks' to see through which date Quay logs
+    of each repository were already ingested,
+    'api_cache' to reuse API responses that rarely change across runs,
+    'catalog_index' to reuse operator bundles of unchanged catalog images,
+    'catalog_snapshots' to process only bundles changed since the previous run.
     """
     cur.execute("""
     CREATE TABLE IF NOT EXISTS bundles (
@@ -30,10 +36,43 @@ def create_tables(cur: cursor) -> None:
 
     cur.execute("""
     CREATE TABLE IF NOT EXISTS pull_counts (
-        id SERIAL PRIMARY KEY,
         bundle_id INTEGER NOT NULL REFERENCES bundles(id) ON DELETE CASCADE,
         pull_date DATE NOT NULL,
         pull_count INTEGER NOT NULL,
-        UNIQUE (bundle_id, pull_date)
+        PRIMARY KEY (bundle_id, pull_date)
+    ) PARTITION BY RANGE (pull_date);
+    """)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS log_watermarks (
+        repo_path TEXT PRIMARY KEY,
+        ingested_through DATE NOT NULL,
+        last_updated TIMESTAMPTZ DEFAULT NOW()
+    );
+    """)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS api_cache (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value JSONB NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (namespace, key)
+    );
+    """)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS catalog_index (
+        digest TEXT PRIMARY KEY,
+        bundles BYTEA NOT NULL,
+        last_used_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    );
+    """)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS catalog_snapshots (
+        catalog TEXT PRIMARY KEY,
+        bundles BYTEA NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
     );
     """)
@@ -0,0 +1,31 @@
+from datetime import date
+from typing import Dict
+
+from psycopg2.extensions import cursor
+from psycopg2.extras import execute_values
+
+
+def select_log_watermarks(cur: cursor) -> Dict[str, date]:
+    """Selects the date through which logs of each repository were ingested."""
+    cur.execute("SELECT repo_path, ingested_through FROM log_watermarks;")
+    return {repo_path: ingested_through for repo_path, ingested_through in cur}
+
+
+def upsert_log_watermarks(cur: cursor, watermarks: Dict[str, date]) -> None:
+    """Inserts or moves forward the log watermarks of the given repositories."""
+    if not watermarks:
+        return
+
+    execute_values(
+        cur,
+        """
+        INSERT INTO log_watermarks (repo_path, ingested_through)
+        VALUES %s
+        ON CONFLICT (repo_path) DO UPDATE
+        SET ingested_through = GREATEST(
+            log_watermarks.ingested_through, EXCLUDED.ingested_through
+        ),
+        last_updated = NOW();
+        """,
+        list(watermarks.items()),
+    )
@@ -0,0 +1,90 @@
+from typing import AbstractSet, Dict, Iterator, Set, Tuple
+
+from pullsar.config import logger
+from pullsar.operator_bundle_model import OperatorBundle, extract_catalog_attributes
+from pullsar.parse_operators_catalog import RepositoryMap
+
+# catalog name and OCP version of a catalog an operator bundle appears in
+Appearance = Tuple[str, str]
+
+
+class GlobalBundleIndex:
+    """
+    Run-wide index of operator bundles of all the processed catalogs. Each unique
+    (resolved) bundle image is a single OperatorBundle, carrying the set of catalogs
+    it appears in, so that pull logs of its repository are counted only once
+    and the bundle is saved only once, fanning out to its appearances.
+
+    Attributes:
+        repository_paths: A dictionary of key-value pairs, key being a quay
+            repository and value being a list of the unique OperatorBundle objects,
+            images of which are stored in the repository.
+    """
+
+    def __init__(self) -> None:
+        self.repository_paths: RepositoryMap = {}
+        self._bundles: Dict[str, OperatorBundle] = {}
+        self._appearances: Dict[str, Set[Appearance]] = {}
+        # images with an appearance not saved by a previous run
+        self._changed_images: Set[str] = set()
+        self._catalog_count = 0
+
+    def add_catalog(
+        self,
+        catalog_image: str,
+        repository_paths: RepositoryMap,
+        unchanged_images: AbstractSet[str] = frozenset(),
+    ) -> None:
+        """
+        Adds operator bundles of a catalog with resolved images into the index.
+        Bundles with images already in the index are merged into the indexed ones.
+
+        Args:
+            catalog_image (str): Operators catalog image.
+            repository_paths (RepositoryMap): Quay repositories with the bundles
+            of the catalog, after resolving their images.
+            unchanged_images (AbstractSet[str]): Images of bundles saved
+            in the catalog by a previous run.
+        """
+        catalog_name, ocp_version = extract_catalog_attributes(catalog_image)
+        if not catalog_name or not ocp_version:
+            logger.error(
+                f"Cannot save data for {catalog_image} to the database. "
+                "Catalog image format is not supported. Expected image format: "
+                "<CATALOG_NAME>:<OCP_VERSION>. Please, re-run script"
+                "to save retrieved pull stats to the database."
+            )
+
+        self._catalog_count += 1
+        for repository_path, operator_bundles in repository_paths.items():
+            indexed_bundles = self.repository_paths.setdefault(repository_path, [])
+            for bundle in operator_bundles:
+                image = bundle.image
+                if image not in self._bundles:
+                    self._bundles[image] = bundle
+                    self._appearances[image] = set()
+                    indexed_bundles.append(bundle)
+
+                if catalog_name and ocp_version:
+                    self._appearances[image].add((catalog_name, ocp_version))
+                    if image not in unchanged_images:
+                        self._changed_images.add(image)
+
+    def appearances(self, bundle: OperatorBundle) -> Set[Appearance]:
+        """Catalog names and OCP versions of the catalogs the bundle appears in."""
+        return self._appearances.get(bundle.image, set())
+
+    def is_unchanged(self, bundle: OperatorBundle) -> bool:
+        """Whether all the appearances of the bundle were saved by a previous run."""
+        return bundle.image not in self._changed_images
+
+    @property
+    def catalog_count(self) -> int:
+        """The number of catalogs added to the index."""
+        return self._catalog_count
+
+    def __iter__(self) -> Iterator[OperatorBundle]:
+        return iter(self._bundles.values())
+
+    def __len__(self) -> int:
+        return len(self._bundles)
@@ -0,0 +1,91 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pullsar.quay_client import QuayLog
+
+# 'pull_repo' log decoded into (date, repository, tag, manifest digest),
+# repository is set only for organization logs
+PullRepoLog = Tuple[date, Optional[str], Optional[str], Optional[str]]
+
+_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun")
+        + ("Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+        1,
+    )
+}
+# length of the day prefix of Quay log datetime, e.g. "Mon, 09 Jun 2025"
+_DAY_PREFIX_LENGTH = 16
+
+
+@lru_cache(maxsize=1024)
+def _parse_day_prefix(day_prefix: str) -> date:
+    """
+    Parses the day prefix of Quay log datetime, e.g. "Mon, 09 Jun 2025".
+    Logs of a window share only a few days, so the results are memoized.
+    """
+    return date(int(day_prefix[12:16]), _MONTHS[day_prefix[8:11]], int(day_prefix[5:7]))
+
+
+def parse_log_date(datetime_str: str) -> date:
+    """Extracts date from datetime string used in Quay logs.
+
+    The date is the one stated in the string, as with datetime.strptime using
+    the format "%a, %d %b %Y %H:%M:%S %z", the time and offset do not affect it.
+
+    Args:
+        datetime_str (str): datetime, e.g.: "Mon, 09 Jun 2025 16:23:18 -0000"
+
+    Raises:
+        ValueError: If the string is not a valid datetime.
+
+    Returns:
+        date: Extracted date object.
+    """
+    try:
+        return _parse_day_prefix(datetime_str[:_DAY_PREFIX_LENGTH])
+    except (KeyError, ValueError):
+        # not in the fixed layout, e.g. single digit day
+        dt = datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %z")
+        return dt.date()
+
+
+def decode_pull_repo_logs(
+    logs: Iterable[QuayLog], since: Optional[date] = None
+) -> Iterator[PullRepoLog]:
+    """
+    Decodes 'pull_repo' type logs of a page into compact tuples,
+    skipping logs of other kinds, without metadata or datetime.
+
+    Args:
+        logs (Iterable[QuayLog]): Page of mixed logs from Quay.
+        since (Optional[date]): If set, logs older than this date are skipped.
+
+    Yields:
+        PullRepoLog: Date, repository, tag and manifest digest of a pull.
+    """
+    for log in logs:
+        if log.get("kind") != "pull_repo":
+            continue
+        metadata = log.get("metadata")
+        datetime_str = log.get("datetime")
+        if not metadata or not datetime_str:
+            continue
+
+        log_date = parse_log_date(datetime_str)
+        if since and log_date < since:
+            continue
+        yield (
+            log_date,
+            metadata.get("repo"),
+            metadata.get("tag"),
+            metadata.get("manifest_digest"),
+        )
+
+
+def oldest_log_date(logs: List[QuayLog]) -> Optional[date]:
+    """Extracts date of the last (oldest) log of a page, if there is any."""
+    datetime_str = logs[-1].get("datetime") if logs else None
+    return parse_log_date(datetime_str) if datetime_str else None
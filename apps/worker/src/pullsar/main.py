@@ -1,6 +1,7 @@
 """The main module of the Pullsar application."""
 
 import logging
+from typing import List, Tuple
 
 from pullsar.config import (
     BaseConfig,
@@ -11,6 +12,14 @@ from pullsar.config import (
 from pullsar.stats_resolver import (
     OperatorUsageStatsResolver,
 )
+from pullsar.catalog_cache import CatalogCache
+from pullsar.catalog_delta import (
+    CatalogSnapshot,
+    diff_catalog,
+    take_catalog_snapshot,
+)
+from pullsar.catalog_renderer import catalog_render_workers, iter_loaded_catalogs
+from pullsar.global_index import GlobalBundleIndex
 from pullsar.cli import parse_arguments, ParsedArgs
 from pullsar.quay_client import QuayClient
 from pullsar.db.manager import DatabaseManager
@@ -29,7 +38,10 @@ def main() -> None:
 
     BaseConfig.QUAY_API_TOKENS = load_quay_api_tokens()
     quay_client = QuayClient(
-        base_url=BaseConfig.QUAY_API_BASE_URL, api_tokens=BaseConfig.QUAY_API_TOKENS
+        base_url=BaseConfig.QUAY_API_BASE_URL,
+        api_tokens=BaseConfig.QUAY_API_TOKENS,
+        max_connections=BaseConfig.QUAY_MAX_WORKERS,
+        retry_config=BaseConfig.QUAY_RETRY_CONFIG,
     )
     pyxis_client = PyxisClient(base_url=BaseConfig.PYXIS_API_BASE_URL)
     stats_resolver = OperatorUsageStatsResolver()
@@ -40,18 +52,66 @@ def main() -> None:
         if is_db_allowed:
             db = DatabaseManager()
             db.connect()
+            if not args.refresh_watermarks:
+                stats_resolver.log_watermarks = db.get_log_watermarks()
+            if args.refresh_cache:
+                db.clear_api_cache()
+            else:
+                stats_resolver.load_api_cache(db.get_api_cache())
+
+        render_workers = catalog_render_workers(
+            BaseConfig.CATALOG_RENDER_WORKERS, BaseConfig.CATALOG_RENDER_MEMORY_MB
+        )
+        catalog_cache = CatalogCache(db) if db and BaseConfig.CATALOG_CACHE else None
+        # catalogs are loaded ahead concurrently, but processed and saved in order
+        loaded_catalogs = iter_loaded_catalogs(
+            args.catalogs, render_workers, catalog_cache
+        )
+        # bundles of all catalogs are indexed by their resolved images first,
+        # so that logs of each repository are counted once for the whole run
+        global_index = GlobalBundleIndex()
+        snapshots: List[Tuple[str, CatalogSnapshot]] = []
+        for catalog, bundle_index in loaded_catalogs:
+            catalog_image, catalog_json_file = catalog
+            if bundle_index is None:
+                continue
+
+            # only bundles changed since the previous run need their images resolved
+            # and appearances in the catalog saved, all of them have pulls counted
+            snapshot = db.get_catalog_snapshot(catalog_image) if db else None
+            delta = diff_catalog(bundle_index, snapshot)
 
-        for catalog in args.catalogs:
-            repository_paths = stats_resolver.update_operator_usage_stats(
+            repository_paths = stats_resolver.resolve_operator_bundles(
                 quay_client,
                 pyxis_client,
-                args.log_days,
-                catalog.image,
-                catalog.json_file,
+                catalog_image,
+                catalog_json_file,
+                delta.apply(bundle_index),
             )
+            if not repository_paths:
+                continue
 
-            if repository_paths and db:
-                db.save_operator_usage_stats(repository_paths, catalog.image)
+            global_index.add_catalog(
+                catalog_image, repository_paths, delta.unchanged_images
+            )
+            snapshots.append(
+                (catalog_image, take_catalog_snapshot(bundle_index, repository_paths))
+            )
+
+        stats_resolver.count_operator_usage_stats(
+            quay_client, global_index.repository_paths, args.log_days
+        )
+
+        # snapshots are saved only after the bundles they refer to
+        if db and len(global_index):
+            db.save_operator_usage_stats(global_index)
+            for catalog_image, snapshot in snapshots:
+                db.save_catalog_snapshot(catalog_image, snapshot)
+
+        # watermarks move forward only after pull counts of all catalogs are saved
+        if db:
+            db.save_log_watermarks(stats_resolver.get_updated_log_watermarks())
+            db.save_api_cache(stats_resolver.get_api_cache_updates())
     except Exception as e:
         logger.error(f"A critical error occurred during processing: {e}")
     finally:
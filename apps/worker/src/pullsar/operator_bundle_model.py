@@ -1,4 +1,7 @@
-from typing import Optional, Tuple, Dict
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import Iterator, Optional, Tuple
 from datetime import date
 
 ImageAttributes = Tuple[
@@ -73,20 +76,110 @@ def extract_tag(name: str) -> Optional[str]:
     return name.split(".", 1)[1] if "." in name else None
 
 
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Interns the string, so that bundles of the same repository share it."""
+    return sys.intern(value) if value is not None else None
+
+
+class PullCounts(MutableMapping[date, int]):
+    """
+    Pull counts of an operator bundle for specific dates, stored as an array
+    of counts indexed by day offset from the earliest date with a count.
+    Counts of a run are limited to the days of its log window, which keeps
+    the array small. Dates with count 0 are treated as missing.
+    """
+
+    __slots__ = ("_start", "_counts")
+
+    def __init__(self) -> None:
+        self._start = 0
+        self._counts: Optional[array[int]] = None
+
+    def _offset(self, key: date) -> int:
+        return key.toordinal() - self._start
+
+    def __getitem__(self, key: date) -> int:
+        if self._counts is not None:
+            offset = self._offset(key)
+            if 0 <= offset < len(self._counts) and self._counts[offset]:
+                return self._counts[offset]
+        raise KeyError(key)
+
+    def __setitem__(self, key: date, value: int) -> None:
+        if self._counts is None:
+            self._start = key.toordinal()
+            self._counts = array("I", [0])
+
+        offset = self._offset(key)
+        if offset < 0:
+            self._counts[0:0] = array("I", bytes(-offset * self._counts.itemsize))
+            self._start, offset = key.toordinal(), 0
+        elif offset >= len(self._counts):
+            self._counts.extend([0] * (offset - len(self._counts) + 1))
+        self._counts[offset] = value
+
+    def __delitem__(self, key: date) -> None:
+        if self._counts is None or key not in self:
+            raise KeyError(key)
+        self._counts[self._offset(key)] = 0
+
+    def __iter__(self) -> Iterator[date]:
+        if self._counts is not None:
+            for offset, count in enumerate(self._counts):
+                if count:
+                    yield date.fromordinal(self._start + offset)
+
+    def __len__(self) -> int:
+        if self._counts is None:
+            return 0
+        return len(self._counts) - self._counts.count(0)
+
+    def add(self, key: date, count: int) -> None:
+        """Adds 'count' pulls to the pull count for the date."""
+        if self._counts is not None:
+            offset = self._offset(key)
+            if 0 <= offset < len(self._counts):
+                self._counts[offset] += count
+                return
+        self[key] = count
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
 class OperatorBundle:
     """
     Represents an OLM operator bundle with easy access to important properties.
+    Bundles of all the processed catalogs are held in memory at once,
+    hence slots and strings shared among bundles of the same repository.
     """
 
+    __slots__ = (
+        "_name",
+        "_package",
+        "_image",
+        "_tag",
+        "_registry",
+        "_org",
+        "_repo",
+        "_digest",
+        "_repo_path",
+        "_pull_count",
+    )
+
     def __init__(self, name: str, package: str, image: str):
         self._name = name
-        self._package = package
+        self._package = sys.intern(package)
         self._image = image
         self._tag = extract_tag(name)
-        (self._registry, self._org, self._repo, self._digest, _) = (
-            extract_image_attributes(image)
+        registry, org, repo, self._digest, _ = extract_image_attributes(image)
+        self._registry = _intern(registry)
+        self._org = _intern(org)
+        self._repo = _intern(repo)
+        self._repo_path = (
+            sys.intern(f"{self._org}/{self._repo}") if org and repo else None
         )
-        self._pull_count: Dict[date, int] = {}
+        self._pull_count = PullCounts()
 
     @property
     def name(self) -> str:
@@ -146,18 +239,15 @@ class OperatorBundle:
             Optional[str]: path to repository, e.g. org/repo
             or None if org or repo is None.
         """
-        if self.org and self.repo:
-            return f"{self.org}/{self.repo}"
-
-        return None
+        return self._repo_path
 
     @property
-    def pull_count(self) -> Dict[date, int]:
+    def pull_count(self) -> PullCounts:
         """
         Accesses pull counts of an operator bundle for specific dates.
 
         Returns:
-            Dict[date, int]: Dictionary of key-value pairs, key being a date
+            PullCounts: Mapping of key-value pairs, key being a date
             and value being an integer representing a number of pulls recorded
             for the operator bundle for that date.
         """
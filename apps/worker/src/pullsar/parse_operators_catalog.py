@@ -1,71 +1,297 @@
+import contextlib
+import gzip
+import os
 import subprocess
 import json
-from typing import List, Dict, Tuple
+import tempfile
+from typing import Any, Iterator, List, Dict, Optional, Protocol, TextIO, Tuple, cast
 
-from pullsar.operator_bundle_model import OperatorBundle
+from pullsar.operator_bundle_model import OperatorBundle, extract_catalog_attributes
 from pullsar.config import logger
 
 RepositoryMap = Dict[str, List[OperatorBundle]]
+# name, package and image of each operator bundle of a catalog
+BundleIndex = List[Tuple[str, str, str]]
 
+# attributes of 'olm.bundle' catalog objects needed to create OperatorBundle
+BUNDLE_ATTRIBUTES = ("name", "package", "image")
+# number of characters of the catalog read at once
+CATALOG_CHUNK_SIZE = 1024 * 1024
+# number of characters of a single catalog object buffered at most, larger
+# objects are skipped as malformed
+CATALOG_MAX_OBJECT_SIZE = 64 * 1024 * 1024
 
-def render_operator_catalog(catalog_image: str, output_file: str) -> bool:
+
+class CatalogStream(Protocol):
+    """Readable text stream of a rendered JSON catalog."""
+
+    def read(self, size: int = -1, /) -> str: ...
+
+
+class _TeeReader:
+    """Text stream copying everything read from 'source' into 'copy'."""
+
+    def __init__(self, source: CatalogStream, copy: TextIO) -> None:
+        self._source = source
+        self._copy = copy
+
+    def read(self, size: int = -1, /) -> str:
+        data = self._source.read(size)
+        self._copy.write(data)
+        return data
+
+
+def catalog_artifact_path(catalog_image: str, artifacts_dir: str) -> str:
+    """
+    Creates path of a gzip compressed rendered JSON catalog artifact,
+    named after the catalog and its OCP version.
+
+    Args:
+        catalog_image (str): Operators catalog image pullspec, e.g.
+        registry.redhat.io/redhat/redhat-operator-index:v4.18
+        artifacts_dir (str): Directory to store the artifact in.
+
+    Returns:
+        str: Artifact path, e.g. <artifacts_dir>/redhat-operator-index-v4.18.json.gz
+    """
+    catalog_name, ocp_version = extract_catalog_attributes(catalog_image)
+    if catalog_name and ocp_version:
+        name = f"{catalog_name.rsplit('/', 1)[-1]}-{ocp_version}"
+    else:
+        name = catalog_image.rsplit("/", 1)[-1].replace(":", "-")
+    return os.path.join(artifacts_dir, f"{name}.json.gz")
+
+
+def render_operator_catalog(
+    catalog_image: str, artifact_file: Optional[str] = None
+) -> Optional[BundleIndex]:
     """
-    Renders the OLM catalog image to a local JSON file using opm.
+    Renders the OLM catalog image using opm, streaming its output through
+    a pipe directly into the catalog parser, see 'index_catalog_bundles'.
     Requires 'opm' to be installed and accessible in PATH,
     and appropriate registry authentication (e.g., via podman login).
 
     Args:
         catalog_image (str): Operators catalog image pullspec
-        output_file (str): Name of a file to be generated, containing
-        the rendered JSON catalog.
+        artifact_file (Optional[str]): If set, the rendered JSON catalog
+        is also saved into this gzip compressed file. Defaults to None.
 
     Returns:
-        bool: True if render was successful, else False.
+        Optional[BundleIndex]: Operator bundles of the catalog,
+        or None if render failed.
     """
     command = ["opm", "render", catalog_image, "-o", "json"]
 
-    logger.info(f"Executing: {' '.join(command)} > {output_file}")
+    artifact_info = f" (saving it to {artifact_file})" if artifact_file else ""
+    logger.info(f"Executing: {' '.join(command)}{artifact_info}")
     logger.info("Might take up to a few minutes...")
-    try:
-        process = subprocess.run(command, capture_output=True, text=True, check=True)
+    # stderr goes to a file, so that a full pipe can not block opm
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as stderr:
+        try:
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=True,
+                encoding="utf-8",
+            )
+        except FileNotFoundError:
+            logger.error(
+                f"'{command[0]}' command not found. Please, add it to your PATH. Terminating..."
+            )
+            raise
 
-        with open(output_file, "w") as file:
-            file.write(process.stdout)
+        try:
+            with contextlib.ExitStack() as stack:
+                catalog: CatalogStream = stack.enter_context(
+                    cast(TextIO, process.stdout)
+                )
+                if artifact_file:
+                    artifact = stack.enter_context(
+                        gzip.open(artifact_file, "wt", encoding="utf-8")
+                    )
+                    catalog = _TeeReader(catalog, artifact)
+                bundle_index = index_catalog_bundles(catalog)
+            returncode = process.wait()
 
-        logger.info(f"Successfully rendered catalog to {output_file}")
-        return True
+        except Exception as exception:
+            process.kill()
+            process.wait()
+            _remove_artifact(artifact_file)
+            logger.error(f"An unexpected error occurred during opm render: {exception}")
+            logger.info(f"Skipping catalog {catalog_image}...")
+            return None
 
-    except FileNotFoundError:
-        logger.error(
-            f"'{command[0]}' command not found. Please, add it to your PATH. Terminating..."
-        )
-        raise
-    except subprocess.CalledProcessError as error:
+        if returncode != 0:
+            stderr.seek(0)
+            _remove_artifact(artifact_file)
+            logger.error(
+                f"Rendering of catalog image failed (Exit Code: {returncode}):"
+            )
+            logger.error(f"Command: {' '.join(command)}")
+            logger.error(f"Stderr:\n{stderr.read()}")
+            logger.info(f"Skipping catalog {catalog_image}...")
+            return None
+
+    if artifact_file:
+        logger.info(f"Successfully rendered catalog to {artifact_file}")
+    return bundle_index
+
+
+def _remove_artifact(artifact_file: Optional[str]) -> None:
+    """Removes incomplete catalog artifact of a failed render, if there is any."""
+    if artifact_file:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(artifact_file)
+
+
+def iter_catalog_bundles(
+    stream: CatalogStream,
+    chunk_size: int = CATALOG_CHUNK_SIZE,
+    max_object_size: int = CATALOG_MAX_OBJECT_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parses rendered JSON operators catalog, a stream of concatenated
+    JSON objects as output by 'opm render -o json', reading it in chunks, so only
+    a chunk and the object being parsed are held in memory at a time.
+    Yields only 'olm.bundle' objects, trimmed to their name, package and image.
+    Malformed objects are skipped, resuming with the next object starting
+    on a new line.
+
+    Args:
+        stream (CatalogStream): Rendered JSON catalog of operators.
+        chunk_size (int): Number of characters read at once.
+        max_object_size (int): Number of characters of an object buffered at most.
+
+    Yields:
+        Dict[str, Any]: Operator bundle attributes 'name', 'package' and 'image',
+        those missing in the catalog are left out.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    is_eof = False
+    while True:
+        # skip whitespace between objects
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+
+        if position == len(buffer):
+            if is_eof:
+                return
+            buffer = stream.read(chunk_size)
+            position = 0
+            is_eof = not buffer
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # newlines within JSON strings are escaped, so an object starting
+            # on a new line means the current one is complete, yet malformed
+            next_object = buffer.find("\n{", position + 1)
+            if (
+                next_object == -1
+                and not is_eof
+                and len(buffer) - position <= max_object_size
+            ):
+                # object is incomplete, keep its beginning and read at least
+                # as much again, so that large objects are re-parsed only a few times
+                chunk = stream.read(max(chunk_size, len(buffer) - position))
+                buffer = buffer[position:] + chunk
+                position = 0
+                is_eof = not chunk
+                continue
+
+            logger.warning(f"Could not decode JSON object from catalog: {e}")
+            logger.warning(
+                f"Problematic content: {buffer[position : position + 80].strip()}"
+            )
+            # resume with the next object starting on a new line, dropping
+            # the rest of an oversized object as it is read
+            while next_object == -1 and not is_eof:
+                chunk = stream.read(chunk_size)
+                buffer = buffer[-1:] + chunk
+                is_eof = not chunk
+                next_object = buffer.find("\n{")
+            if next_object == -1:
+                return
+            position = next_object + 1
+            continue
+
+        position = end
+        if isinstance(item, dict) and item.get("schema") == "olm.bundle":
+            yield {key: item[key] for key in BUNDLE_ATTRIBUTES if key in item}
+
+
+def index_catalog_bundles(catalog: CatalogStream) -> BundleIndex:
+    """
+    Parses rendered JSON operators catalog stream into a compact index
+    of its operator bundles, skipping those missing some of the attributes.
+
+    Args:
+        catalog (CatalogStream): Rendered JSON catalog of operators.
+
+    Returns:
+        BundleIndex: Name, package and image of each operator bundle.
+    """
+    bundle_index: BundleIndex = []
+    for item_num, item in enumerate(iter_catalog_bundles(catalog), 1):
+        if "name" in item and "package" in item and "image" in item:
+            bundle_index.append((item["name"], item["package"], item["image"]))
+        else:
+            logger.warning(
+                f"Bundle number {item_num} is missing some of the attributes "
+                "(expected: name, package, image). Skipping item..."
+            )
+    return bundle_index
+
+
+def load_catalog_bundle_index(catalog_json_file: str) -> Optional[BundleIndex]:
+    """
+    Parses rendered JSON operators catalog file into an index of its operator bundles.
+
+    Args:
+        catalog_json_file (str): Rendered JSON catalog of operators,
+        gzip compressed if its name ends with '.gz'.
+
+    Returns:
+        Optional[BundleIndex]: Name, package and image of each operator bundle,
+        or None if the catalog could not be parsed.
+    """
+    logger.info(f"Parsing operator bundles from catalog {catalog_json_file}")
+    try:
+        catalog: TextIO
+        if catalog_json_file.endswith(".gz"):
+            catalog = gzip.open(catalog_json_file, "rt", encoding="utf-8")
+        else:
+            catalog = open(catalog_json_file, encoding="utf-8")
+        with catalog:
+            return index_catalog_bundles(catalog)
+
+    except OSError as error:
+        logger.error(f"Could not read catalog {catalog_json_file}: {error}")
+        logger.info(f"Skipping catalog {catalog_json_file}...")
+        return None
+
+    except Exception as exception:
         logger.error(
-            f"Rendering of catalog image failed (Exit Code: {error.returncode}):"
+            f"An unexpected error occurred during catalog parsing: {exception}"
         )
-        logger.error(f"Command: {' '.join(error.cmd)}")
-        logger.debug(f"Stdout:\n{error.stdout}")
-        logger.error(f"Stderr:\n{error.stderr}")
-        logger.info(f"Skipping catalog {catalog_image}...")
-        return False
-    except Exception as exception:
-        logger.error(f"An unexpected error occurred during opm render: {exception}")
-        logger.info(f"Skipping catalog {catalog_image}...")
-        return False
+        logger.info(f"Skipping catalog {catalog_json_file}...")
+        return None
 
 
-def create_repository_paths_maps(
-    catalog_json_file: str, known_image_translations: Dict[str, str]
+def build_repository_paths_maps(
+    bundle_index: BundleIndex, known_image_translations: Dict[str, str]
 ) -> Tuple[RepositoryMap, RepositoryMap, RepositoryMap]:
     """
-    Parses rendered JSON operators catalog and creates mappings between
-    all the repository paths and lists of the operator bundle versions
-    that are tied with these repositories.
+    Creates mappings between all the repository paths and lists of the operator
+    bundle versions that are tied with these repositories.
 
     Args:
-        catalog_json_file (str): Rendered JSON catalog of operators.
-        known_image_translations (Tuple[str, str]): mapping from non-quay image to quay image
+        bundle_index (BundleIndex): Operator bundles of a catalog.
+        known_image_translations (Dict[str, str]): mapping from non-quay image to quay image
 
     Returns:
         Tuple[RepositoryMap, RepositoryMap, RepositoryMap]: Three dictionaries with key-value pairs,
@@ -81,87 +307,59 @@ def create_repository_paths_maps(
     repository_paths_map_missing_digest: RepositoryMap = {}
     repository_paths_map_not_quay: RepositoryMap = {}
 
-    # select all bundle objects and make the output compact (-c ... one line, one item)
-    # so we can easily process the output line by line, item by item and create
-    # an OperatorBundle object for each item
-    jq_command = ["jq", "-c", '. | select(.schema == "olm.bundle")', catalog_json_file]
-
-    logger.info(f"Executing: {' '.join(jq_command)}")
-    try:
-        process = subprocess.run(jq_command, capture_output=True, text=True, check=True)
-
-        for line_num, line in enumerate(process.stdout.splitlines(), 1):
-            if not line.strip():
-                continue
+    for name, package, image in bundle_index:
+        operator = OperatorBundle(name=name, package=package, image=image)
 
-            try:
-                item = json.loads(line)
-            except json.JSONDecodeError as e:
-                logger.warning(
-                    f"Could not decode JSON from jq output on line {line_num}: {e}"
+        repo_path = operator.repo_path
+        if repo_path:
+            if operator.registry == "quay.io":
+                repository_paths_map.setdefault(repo_path, []).append(operator)
+                if operator.digest is None:
+                    repository_paths_map_missing_digest.setdefault(
+                        repo_path, []
+                    ).append(operator)
+            elif known_image_translations.get(operator.image):
+                new_bundle = OperatorBundle(
+                    operator.name,
+                    operator.package,
+                    known_image_translations[operator.image],
                 )
-                logger.warning(f"Problematic line content: {line.strip()}")
-                continue
+                if new_bundle.repo_path:
+                    repository_paths_map.setdefault(new_bundle.repo_path, []).append(
+                        new_bundle
+                    )
+            elif operator.registry == "registry.connect.redhat.com":
+                repository_paths_map_not_quay.setdefault(repo_path, []).append(operator)
 
-            if "name" in item and "package" in item and "image" in item:
-                operator = OperatorBundle(
-                    name=item["name"], package=item["package"], image=item["image"]
-                )
+    logger.info(
+        f"Successfully identified {len(repository_paths_map)} repository paths "
+        "and a list of their operator bundles from the catalog."
+    )
+    return (
+        repository_paths_map,
+        repository_paths_map_missing_digest,
+        repository_paths_map_not_quay,
+    )
 
-                repo_path = operator.repo_path
-                if repo_path:
-                    if operator.registry == "quay.io":
-                        repository_paths_map.setdefault(repo_path, []).append(operator)
-                        if operator.digest is None:
-                            repository_paths_map_missing_digest.setdefault(
-                                repo_path, []
-                            ).append(operator)
-                    elif known_image_translations.get(operator.image):
-                        new_bundle = OperatorBundle(
-                            operator.name,
-                            operator.package,
-                            known_image_translations[operator.image],
-                        )
-                        if new_bundle.repo_path:
-                            repository_paths_map.setdefault(
-                                new_bundle.repo_path, []
-                            ).append(new_bundle)
-                    elif operator.registry == "registry.connect.redhat.com":
-                        repository_paths_map_not_quay.setdefault(repo_path, []).append(
-                            operator
-                        )
-            else:
-                logger.warning(
-                    f"Item on line {line_num} is missing some of the attributes "
-                    "(expected: name, package, image). Skipping item..."
-                )
 
-        logger.info(
-            f"Successfully identified {len(repository_paths_map)} repository paths "
-            "and a list of their operator bundles from jq output."
-        )
-        return (
-            repository_paths_map,
-            repository_paths_map_missing_digest,
-            repository_paths_map_not_quay,
-        )
+def create_repository_paths_maps(
+    catalog_json_file: str, known_image_translations: Dict[str, str]
+) -> Tuple[RepositoryMap, RepositoryMap, RepositoryMap]:
+    """
+    Parses rendered JSON operators catalog file and creates mappings between
+    all the repository paths and lists of the operator bundle versions
+    that are tied with these repositories, see 'build_repository_paths_maps'.
 
-    except FileNotFoundError:
-        logger.error(
-            f"'{jq_command[0]}' command not found. Please, add it to your PATH. Terminating..."
-        )
-        raise
-    except subprocess.CalledProcessError as error:
-        logger.error(f"Error running jq command (Exit Code: {error.returncode}):")
-        logger.error(f"Command: {' '.join(error.cmd)}")
-        logger.debug(f"Stdout:\n{error.stdout}...")
-        logger.error(f"Stderr:\n{error.stderr}")
-        logger.info(f"Skipping catalog {catalog_json_file}...")
-        return ({}, {}, {})
+    Args:
+        catalog_json_file (str): Rendered JSON catalog of operators,
+        gzip compressed if its name ends with '.gz'.
+        known_image_translations (Dict[str, str]): mapping from non-quay image to quay image
 
-    except Exception as exception:
-        logger.error(
-            f"An unexpected error occurred during jq processing or operator creation: {exception}"
-        )
-        logger.info(f"Skipping catalog {catalog_json_file}...")
+    Returns:
+        Tuple[RepositoryMap, RepositoryMap, RepositoryMap]: Repository paths maps,
+        all of them empty if the catalog could not be parsed.
+    """
+    bundle_index = load_catalog_bundle_index(catalog_json_file)
+    if bundle_index is None:
         return ({}, {}, {})
+    return build_repository_paths_maps(bundle_index, known_image_translations)
@@ -1,5 +1,8 @@
 import requests
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import quote
 from requests_kerberos import HTTPKerberosAuth, DISABLED
 
@@ -9,61 +12,181 @@ from pullsar.config import logger, BaseConfig
 class _BasePyxisClient:
     """A base client for Pyxis API containing shared client logic."""
 
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        page_size: Optional[int] = None,
+        max_page_workers: Optional[int] = None,
+        timeout: Optional[Tuple[float, float]] = None,
+    ):
+        """
+        Initializes the Pyxis client.
+
+        Args:
+            base_url (str): The base URL for the Pyxis API.
+            page_size (Optional[int]): Number of items per page.
+            Defaults to BaseConfig.PYXIS_PAGE_SIZE.
+            max_page_workers (Optional[int]): Number of pages of a single query
+            fetched concurrently. Defaults to BaseConfig.PYXIS_PAGE_WORKERS.
+            timeout (Optional[Tuple[float, float]]): Connect and read timeouts
+            of requests. Defaults to BaseConfig.PYXIS_TIMEOUT.
+        """
         self.base_url = base_url
+        self.page_size = page_size or BaseConfig.PYXIS_PAGE_SIZE
+        self.max_page_workers = max_page_workers or BaseConfig.PYXIS_PAGE_WORKERS
+        self.timeout = timeout or BaseConfig.PYXIS_TIMEOUT
         self.session = requests.Session()
         self.session.headers.update({"Accept": "application/json"})
+        # queries of concurrent callers fetch their pages concurrently as well
+        self.session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(
+                pool_maxsize=BaseConfig.PYXIS_MAX_WORKERS * self.max_page_workers
+            ),
+        )
 
-    def _fetch_paginated_data(
-        self, endpoint: str, params: Dict[str, Any], auth: Any = None
+    @property
+    def auth_method(self) -> Optional[HTTPKerberosAuth]:
+        """
+        Authentication handler of the calling thread, None with no authentication.
+
+        Returns:
+            Optional[HTTPKerberosAuth]: The handler, if any.
+        """
+        return None
+
+    @staticmethod
+    def _include_total(params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds 'total' to the fields included in the response, if they are limited.
+        Pyxis drops top-level fields not included, the total number of items
+        would be missing and the pages could not be fetched concurrently.
+
+        Args:
+            params: A dictionary of query parameters for the request.
+
+        Returns:
+            Dict[str, Any]: The parameters including 'total' field.
+        """
+        include = params.get("include")
+        if not include or "total" in include.split(","):
+            return params
+        return {**params, "include": f"{include},total"}
+
+    def _fetch_page(
+        self, api_url: str, params: Dict[str, Any], page: int
+    ) -> Dict[str, Any]:
+        """
+        Fetches a single page of a Pyxis API query, authenticated by the handler
+        of the calling thread (see auth_method).
+
+        Args:
+            api_url: The URL of the API endpoint.
+            params: A dictionary of query parameters for the request.
+            page: The number of the page, starting from 0.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+
+        Returns:
+            Dict[str, Any]: The response, items are stored under 'data'
+            and their total number under 'total'.
+        """
+        full_params: Dict[str, str | int] = {
+            **params,
+            "page_size": self.page_size,
+            "page": page,
+        }
+        logger.debug(f"Fetching Pyxis data from {api_url} with params: {full_params}")
+
+        response = self.session.get(
+            api_url, params=full_params, auth=self.auth_method, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_all_pages(
+        self, endpoint: str, params: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """
         A generic helper to handle pagination for Pyxis API endpoints.
         It fetches all pages of data for a given endpoint and set of parameters.
+        The first page tells the total number of items, so the remaining pages
+        are fetched concurrently. If the total is missing, pages are fetched
+        one by one until a page is not full.
 
         Args:
             endpoint: The API endpoint to query (e.g., "operators/indices").
             params: A dictionary of query parameters for the request.
-            auth: The authentication handler to use (e.g., Kerberos), if any.
+
+        Raises:
+            requests.exceptions.RequestException: If any of the requests fails.
 
         Returns:
             List[Dict[str, Any]]: A list of all items fetched from all pages.
         """
-        all_items = []
-        page = 0
-        while True:
-            full_params: Dict[str, str | int] = {
-                **params,
-                "page_size": 100,
-                "page": page,
-            }
-            api_url = f"{self.base_url}/{endpoint}"
-            logger.debug(
-                f"Fetching Pyxis data from {api_url} with params: {full_params}"
-            )
+        api_url = f"{self.base_url}/{endpoint}"
+        params = self._include_total(params)
+        data = self._fetch_page(api_url, params, 0)
+        all_items = list(data.get("data", []))
 
-            try:
-                response = self.session.get(api_url, params=full_params, auth=auth)
-                response.raise_for_status()
-                data = response.json()
-                items_on_page = data.get("data", [])
-                if not items_on_page:
-                    break
-
-                all_items.extend(items_on_page)
-                page += 1
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Pyxis API request failed for endpoint {endpoint}: {e}")
-                return []
+        total = data.get("total")
+        if isinstance(total, int):
+            page_count = -(-total // self.page_size)
+            if page_count > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.max_page_workers, page_count - 1)
+                ) as executor:
+                    pages = executor.map(
+                        partial(self._fetch_page, api_url, params),
+                        range(1, page_count),
+                    )
+                    for page_data in pages:
+                        all_items.extend(page_data.get("data", []))
+            return all_items
+
+        page = 0
+        while len(data.get("data", [])) >= self.page_size:
+            page += 1
+            data = self._fetch_page(api_url, params, page)
+            all_items.extend(data.get("data", []))
         return all_items
 
+    def _fetch_paginated_data(
+        self, endpoint: str, params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches all pages of data for a given endpoint and set of parameters
+        (see _fetch_all_pages), logging an error if any of the requests fails.
+
+        Args:
+            endpoint: The API endpoint to query (e.g., "operators/indices").
+            params: A dictionary of query parameters for the request.
+
+        Returns:
+            List[Dict[str, Any]]: A list of all items fetched from all pages,
+            empty list if any of the requests failed.
+        """
+        try:
+            return self._fetch_all_pages(endpoint, params)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Pyxis API request failed for endpoint {endpoint}: {e}")
+            return []
+
 
 class PyxisClient(_BasePyxisClient):
     """A client for interacting with the Pyxis API. Uses mTLS or Kerberos authentication."""
 
-    def __init__(self, base_url: str):
-        super().__init__(base_url)
-        self.auth_method = None
+    def __init__(
+        self,
+        base_url: str,
+        page_size: Optional[int] = None,
+        max_page_workers: Optional[int] = None,
+        timeout: Optional[Tuple[float, float]] = None,
+    ):
+        super().__init__(base_url, page_size, max_page_workers, timeout)
+        self._use_kerberos = False
+        self._thread_auth = threading.local()
 
         cert_path = BaseConfig.CLIENT_CERT_PATH
         key_path = BaseConfig.CLIENT_KEY_PATH
@@ -77,7 +200,25 @@ class PyxisClient(_BasePyxisClient):
             logger.info(
                 "Client certificate paths not found. Falling back to Kerberos authentication for Pyxis."
             )
-            self.auth_method = HTTPKerberosAuth(mutual_authentication=DISABLED)
+            self._use_kerberos = True
+
+    @property
+    def auth_method(self) -> Optional[HTTPKerberosAuth]:
+        """
+        Kerberos authentication handler of the calling thread, None with mTLS.
+        The handler keeps the state of its handshake, so each thread sending
+        requests, including the workers fetching pages, gets its own.
+
+        Returns:
+            Optional[HTTPKerberosAuth]: The handler, None if Kerberos is not used.
+        """
+        if not self._use_kerberos:
+            return None
+        auth = getattr(self._thread_auth, "auth", None)
+        if auth is None:
+            auth = HTTPKerberosAuth(mutual_authentication=DISABLED)
+            self._thread_auth.auth = auth
+        return auth
 
     def get_images_for_repository(
         self, registry: str, repo_path: str, include: str
@@ -97,11 +238,62 @@ class PyxisClient(_BasePyxisClient):
         endpoint = f"repositories/registry/{registry}/repository/{encoded_repo}/images"
         params = {"include": include}
 
-        all_images = self._fetch_paginated_data(endpoint, params, auth=self.auth_method)
+        all_images = self._fetch_paginated_data(endpoint, params)
 
         logger.info(f"Found {len(all_images)} images in Pyxis for repo {repo_path}")
         return all_images
 
+    def get_images_for_repositories(
+        self, registry: str, repo_paths: List[str], include: str
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Fetches all image data for multiple repositories from Pyxis in a single
+        filtered query, split back into images of each repository.
+
+        Args:
+            registry (str): The image registry e.g. "registry.connect.redhat.com".
+            repo_paths (List[str]): The repository paths, e.g., "abinitio/runtime-operator-bundle".
+            include (str): The fields to include in the API response, must include
+            "data.repositories.registry" and "data.repositories.repository".
+
+        Returns:
+            Optional[Dict[str, List[Dict[str, Any]]]]: Dictionary of key-value pairs,
+            key being a repository path and value being a list of its image data objects,
+            None if any of the requests failed.
+        """
+        repositories = ",".join(f'"{repo_path}"' for repo_path in repo_paths)
+        params = {
+            "include": include,
+            "filter": f'repositories.registry=="{registry}";'
+            f"repositories.repository=in=({repositories})",
+        }
+
+        try:
+            all_images = self._fetch_all_pages("images", params)
+        except requests.exceptions.RequestException as e:
+            logger.error(
+                f"Pyxis API request failed for images of {len(repo_paths)} repositories: {e}"
+            )
+            return None
+
+        repo_path_to_images: Dict[str, List[Dict[str, Any]]] = {
+            repo_path: [] for repo_path in repo_paths
+        }
+        for image in all_images:
+            image_repo_paths = {
+                repository.get("repository")
+                for repository in image.get("repositories") or []
+                if repository.get("registry") == registry
+            }
+            for repo_path in image_repo_paths:
+                if repo_path in repo_path_to_images:
+                    repo_path_to_images[repo_path].append(image)
+
+        logger.info(
+            f"Found {len(all_images)} images in Pyxis for {len(repo_paths)} repositories"
+        )
+        return repo_path_to_images
+
 
 class PyxisClientPublic(_BasePyxisClient):
     """
@@ -1,13 +1,67 @@
+import random
+import time
 import requests
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
 
-from pullsar.config import logger
+from pullsar.config import logger, HttpRetryConfig
 
 QuayOrgToTokenMap = Dict[str, str]
 QuayLog = Dict[str, Any]
 QuayTag = Dict[str, str]
 
+# rate limited or temporarily unavailable, worth retrying
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# maximum number of tags per page of /tag endpoint allowed by Quay
+TAG_PAGE_SIZE = 100
+
+# first and last date (inclusive) of a window of days
+LogWindow = Tuple[date, date]
+
+
+class QuayTokenMissingError(requests.exceptions.RequestException):
+    """Raised when no Quay API token is defined for the organization of a request."""
+
+
+def log_window(log_days: int) -> LogWindow:
+    """
+    Computes the window of the last 'log_days' completed days (in UTC).
+
+    Args:
+        log_days (int): Number of completed past days.
+
+    Returns:
+        LogWindow: First and last date of the window, both inclusive.
+    """
+    end_date = datetime.now(timezone.utc).date() - timedelta(days=1)
+    return (end_date - timedelta(days=log_days - 1), end_date)
+
+
+def split_log_window(
+    start_date: date, end_date: date, window_days: int
+) -> List[LogWindow]:
+    """
+    Splits a window of days into consecutive windows of at most 'window_days' days.
+    Logs of these windows can be fetched independently of each other.
+
+    Args:
+        start_date (date): First day of the window.
+        end_date (date): Last day of the window (inclusive).
+        window_days (int): Maximum number of days of a single window.
+
+    Returns:
+        List[LogWindow]: Consecutive windows covering the whole input window.
+    """
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(window_start + timedelta(days=window_days - 1), end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
 
 class QuayClient:
     """
@@ -15,7 +69,13 @@ class QuayClient:
     for all requests to improve performance.
     """
 
-    def __init__(self, base_url: str, api_tokens: QuayOrgToTokenMap):
+    def __init__(
+        self,
+        base_url: str,
+        api_tokens: QuayOrgToTokenMap,
+        max_connections: int = 10,
+        retry_config: Optional[HttpRetryConfig] = None,
+    ):
         """
         Initializes the QuayClient.
 
@@ -23,11 +83,19 @@ class QuayClient:
             base_url (str): The base URL for the Quay API.
             api_tokens (QuayOrgToTokenMap): A dictionary mapping organization names
             to their API tokens.
+            max_connections (int): Size of the session's connection pool, should
+            match the number of threads sharing the client. Defaults to 10.
+            retry_config (Optional[HttpRetryConfig]): Timeouts and retry policy
+            of the requests. Defaults to HttpRetryConfig defaults.
         """
         self.base_url = base_url
         self.api_tokens = api_tokens
+        self.retry_config = retry_config or HttpRetryConfig()
         self.session = requests.Session()
         self.session.headers.update({"Accept": "application/json"})
+        self.session.mount(
+            "https://", requests.adapters.HTTPAdapter(pool_maxsize=max_connections)
+        )
 
     @staticmethod
     def _extract_org(repo_path: str) -> str:
@@ -42,28 +110,143 @@ class QuayClient:
         """
         return repo_path.split("/")[0]
 
-    def _make_paginated_request(
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Computes exponential backoff delay with jitter for a retry attempt.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting from 0.
+
+        Returns:
+            float: Delay in seconds, between half and full of the exponential backoff.
+        """
+        config = self.retry_config
+        backoff = min(config.max_backoff, config.backoff_factor * 2**attempt)
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """
+        Parses 'Retry-After' header of a response, if there is any.
+
+        Args:
+            response (requests.Response): Response of a rate limited request.
+
+        Returns:
+            Optional[float]: Number of seconds to wait before retrying,
+            None if the header is missing or invalid.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _get_with_retries(
+        self, api_url: str, headers: Dict[str, str], params: Dict[str, Any]
+    ) -> requests.Response:
+        """
+        Makes a GET request with timeouts, retrying connection errors, timeouts
+        and retryable HTTP statuses with exponential backoff. For rate limited
+        requests, waits at least for the time requested by 'Retry-After' header,
+        up to 'max_retry_after' seconds of the retry policy.
+
+        Args:
+            api_url (str): URL of the request.
+            headers (Dict[str, str]): Request headers.
+            params (Dict[str, Any]): Request parameters.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+            with a non-retryable error or all retries were used up.
+
+        Returns:
+            requests.Response: Successful response.
+        """
+        config = self.retry_config
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(
+                    api_url,
+                    headers=headers,
+                    params=params,
+                    timeout=(config.connect_timeout, config.read_timeout),
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if attempt >= config.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                reason = str(e)
+            else:
+                if (
+                    response.status_code not in RETRYABLE_STATUS_CODES
+                    or attempt >= config.max_retries
+                ):
+                    response.raise_for_status()
+                    return response
+                delay = self._backoff_delay(attempt)
+                retry_after = self._retry_after(response)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, config.max_retry_after))
+                reason = f"HTTP {response.status_code}"
+
+            attempt += 1
+            logger.warning(
+                f"Request to {api_url} failed ({reason}). "
+                f"Retry {attempt}/{config.max_retries} in {delay:.1f}s..."
+            )
+            time.sleep(delay)
+
+    def _iter_paginated_request(
         self,
         repo_path: str,
         endpoint: str,
         results_key: str,
         params: Optional[Dict[str, Any]] = None,
-    ) -> List[Dict[str, Any]]:
+        scope: str = "repository",
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Makes a generic, paginated GET request to a Quay repository endpoint.
+        Makes a generic, paginated GET request to a Quay repository endpoint
+        (or organization endpoint), yielding the items page by page as they
+        arrive, so the caller only needs to hold a single page in memory at a time.
 
         It handles two types of pagination:
         1. 'next_page' token (used by /logs).
         2. 'page' number with 'has_additional' flag (used by /tag).
 
+        Each page request is retried on its own (see _get_with_retries), so a
+        transient error resumes pagination from the last page token instead
+        of starting over.
+
         Args:
             repo_path (str): The full repository path (e.g., "org/repo").
             endpoint (str): The API endpoint (e.g., "logs", "tag").
             results_key (str): The key in the JSON response containing the list of items.
             params (Optional[Dict[str, Any]]): Initial request parameters.
+            scope (str): Either "repository", or "organization" if 'repo_path'
+            is an organization name. Defaults to "repository".
 
-        Returns:
-            List[Dict[str, Any]]: A list of all items retrieved from all pages.
+        Raises:
+            QuayTokenMissingError: If no API token is defined for the organization,
+            after the error is logged, so that it is handled as a failed request.
+            requests.exceptions.RequestException: If a page request fails, after
+            the error is logged. Pages yielded so far are incomplete results.
+
+        Yields:
+            List[Dict[str, Any]]: Items retrieved from a single page.
         """
         org = self._extract_org(repo_path)
         api_token = self.api_tokens.get(org)
@@ -72,13 +255,15 @@ class QuayClient:
             logger.error(
                 f"Quay API token not defined for organization '{org}'. Skipping repository {repo_path}..."
             )
-            return []
+            raise QuayTokenMissingError(
+                f"Quay API token not defined for organization '{org}'"
+            )
 
-        api_url = f"{self.base_url}/repository/{repo_path}/{endpoint}"
+        api_url = f"{self.base_url}/{scope}/{repo_path}/{endpoint}"
         api_headers = {"Authorization": f"Bearer {api_token}"}
         api_params = params.copy() if params else {}
 
-        all_results = []
+        total_results = 0
         page_num = 1
 
         while True:
@@ -86,76 +271,215 @@ class QuayClient:
                 f"Fetching {results_key} for {repo_path}, params: {api_params}"
             )
             try:
-                response = self.session.get(
-                    api_url, headers=api_headers, params=api_params
-                )
-                response.raise_for_status()
+                response = self._get_with_retries(api_url, api_headers, api_params)
                 data = response.json()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Request error for {repo_path}: {e}. Skipping...")
+                raise
 
-                results = data.get(results_key, [])
-                all_results.extend(results)
-                logger.debug(f"Retrieved {len(results)} {results_key} from this page.")
+            results = data.get(results_key, [])
+            total_results += len(results)
+            logger.debug(f"Retrieved {len(results)} {results_key} from this page.")
+            yield results
 
-                if "next_page" in data and data["next_page"]:
-                    api_params["next_page"] = data["next_page"]
-                elif data.get("has_additional"):
-                    page_num += 1
-                    api_params["page"] = page_num
-                else:
-                    break
+            if "next_page" in data and data["next_page"]:
+                api_params["next_page"] = data["next_page"]
+            elif data.get("has_additional"):
+                page_num += 1
+                api_params["page"] = page_num
+            else:
+                break
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request error for {repo_path}: {e}. Skipping...")
-                return []
+        logger.info(f"Total {results_key} retrieved for {repo_path}: {total_results}")
+
+    def _make_paginated_request(
+        self,
+        repo_path: str,
+        endpoint: str,
+        results_key: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Makes a generic, paginated GET request to a Quay repository endpoint
+        and collects the items of all pages (see _iter_paginated_request).
+
+        Args:
+            repo_path (str): The full repository path (e.g., "org/repo").
+            endpoint (str): The API endpoint (e.g., "logs", "tag").
+            results_key (str): The key in the JSON response containing the list of items.
+            params (Optional[Dict[str, Any]]): Initial request parameters.
+
+        Returns:
+            List[Dict[str, Any]]: A list of all items retrieved from all pages,
+            empty list if any of the requests failed.
+        """
+        all_results = []
+        try:
+            for results in self._iter_paginated_request(
+                repo_path, endpoint, results_key, params
+            ):
+                all_results.extend(results)
+        except requests.exceptions.RequestException:
+            return []
 
-        logger.info(
-            f"Total {results_key} retrieved for {repo_path}: {len(all_results)}"
-        )
         return all_results
 
-    def get_repo_logs(self, repo_path: str, log_days: int) -> List[QuayLog]:
+    @staticmethod
+    def _log_time_params(start_date: date, end_date: date) -> Dict[str, str]:
         """
-        Fetches usage logs for a given Quay repository using Quay API.
+        Creates time window parameters for a request to /logs endpoint.
 
         Args:
-            repo_path (str): Format: "organization/repository".
-            log_days (int): Fetch logs from the last 'log_days' completed days.
+            start_date (date): First day of the window.
+            end_date (date): Last day of the window (inclusive).
 
         Returns:
-            List[QuayLog]: All logs retrieved from Quay API.
+            Dict[str, str]: Parameters 'starttime' and 'endtime'.
         """
-        logger.info(f"Fetching logs for repository: {repo_path}")
-
-        end_time_utc = datetime.now(timezone.utc) - timedelta(days=1)
-        start_time_utc = end_time_utc - timedelta(days=log_days - 1)
-        time_params = {
-            "starttime": start_time_utc.strftime("%m/%d/%Y"),
-            "endtime": end_time_utc.strftime("%m/%d/%Y"),
+        return {
+            "starttime": start_date.strftime("%m/%d/%Y"),
+            "endtime": end_date.strftime("%m/%d/%Y"),
         }
 
-        return self._make_paginated_request(
+    def iter_repo_log_pages(
+        self, repo_path: str, start_date: date, end_date: date
+    ) -> Iterator[List[QuayLog]]:
+        """
+        Fetches usage logs for a given Quay repository using Quay API,
+        yielding them page by page.
+
+        Args:
+            repo_path (str): Format: "organization/repository".
+            start_date (date): Fetch logs starting from this day.
+            end_date (date): Fetch logs up to this day (inclusive).
+
+        Raises:
+            requests.exceptions.RequestException: If a page request fails.
+
+        Yields:
+            List[QuayLog]: Logs retrieved from a single page.
+        """
+        logger.info(
+            f"Fetching logs for repository: {repo_path} ({start_date} - {end_date})"
+        )
+
+        return self._iter_paginated_request(
             repo_path=repo_path,
             endpoint="logs",
             results_key="logs",
-            params=time_params,
+            params=self._log_time_params(start_date, end_date),
         )
 
-    def get_repo_tags(self, repo_path: str) -> List[QuayTag]:
+    def iter_org_log_pages(
+        self, org: str, start_date: date, end_date: date
+    ) -> Iterator[List[QuayLog]]:
         """
-        Fetches tags of a given Quay repository using Quay API.
+        Fetches usage logs of all repositories of a given Quay organization
+        using Quay API, yielding them page by page. Repository of each log
+        is stored in its metadata under 'repo' (without the organization).
 
         Args:
-            repo_path (str): Format: "organization/repository".
+            org (str): Quay organization name.
+            start_date (date): Fetch logs starting from this day.
+            end_date (date): Fetch logs up to this day (inclusive).
+
+        Raises:
+            requests.exceptions.RequestException: If a page request fails.
+
+        Yields:
+            List[QuayLog]: Logs retrieved from a single page.
+        """
+        logger.info(
+            f"Fetching logs for organization: {org} ({start_date} - {end_date})"
+        )
+
+        return self._iter_paginated_request(
+            repo_path=org,
+            endpoint="logs",
+            results_key="logs",
+            params=self._log_time_params(start_date, end_date),
+            scope="organization",
+        )
+
+    def get_org_aggregated_logs(
+        self, org: str, start_date: date, end_date: date
+    ) -> Optional[List[QuayLog]]:
+        """
+        Fetches numbers of logs per day and kind for all repositories of a given
+        Quay organization together using Quay API, a single request instead
+        of scanning the logs.
+
+        Args:
+            org (str): Quay organization name.
+            start_date (date): Count logs starting from this day.
+            end_date (date): Count logs up to this day (inclusive).
 
         Returns:
-            List[QuayTag]: All tags retrieved from Quay API in form
-            of JSON objects, attributes we care for are tag 'name'
-            and 'manifest_digest'.
+            Optional[List[QuayLog]]: Aggregated logs with attributes 'kind', 'count'
+            and 'datetime' (the day), None if the request failed or no API token
+            is defined for the organization, so that missing counts are never
+            taken for no pull activity.
+        """
+        try:
+            return [
+                aggregated_log
+                for aggregated_logs in self._iter_paginated_request(
+                    repo_path=org,
+                    endpoint="aggregatelogs",
+                    results_key="aggregated",
+                    params=self._log_time_params(start_date, end_date),
+                    scope="organization",
+                )
+                for aggregated_log in aggregated_logs
+            ]
+        except requests.exceptions.RequestException:
+            return None
+
+    def iter_repo_tag_pages(self, repo_path: str) -> Iterator[List[QuayTag]]:
+        """
+        Fetches tags of a given Quay repository (including their history)
+        using Quay API, yielding them page by page, newest first.
+
+        Args:
+            repo_path (str): Format: "organization/repository".
+
+        Raises:
+            requests.exceptions.RequestException: If a page request fails.
+
+        Yields:
+            List[QuayTag]: Tags retrieved from a single page.
         """
         logger.info(f"Fetching tags for repository: {repo_path}")
 
-        return self._make_paginated_request(
+        return self._iter_paginated_request(
+            repo_path=repo_path,
+            endpoint="tag",
+            results_key="tags",
+            params={"limit": TAG_PAGE_SIZE},
+        )
+
+    def get_repo_tag(self, repo_path: str, tag: str) -> Optional[QuayTag]:
+        """
+        Looks up a single active tag of a given Quay repository using Quay API,
+        without paginating through the whole tag history.
+
+        Args:
+            repo_path (str): Format: "organization/repository".
+            tag (str): Name of the tag, e.g. v1.2.3
+
+        Returns:
+            Optional[QuayTag]: The tag in form of JSON object, None if the tag
+            does not exist in the repository or the request failed.
+        """
+        logger.debug(f"Looking up tag {tag} in repository: {repo_path}")
+
+        tag_objects = self._make_paginated_request(
             repo_path=repo_path,
             endpoint="tag",
             results_key="tags",
+            params={"specificTag": tag, "onlyActiveTags": "true"},
         )
+        for tag_object in tag_objects:
+            if tag_object.get("name") == tag:
+                return tag_object
+        return None
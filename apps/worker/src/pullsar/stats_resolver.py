@@ -1,19 +1,57 @@
-from typing import Optional, Dict, List, Tuple
-from datetime import datetime, date
+import requests
+from collections import Counter
+from typing import Callable, Optional, Dict, Iterable, List, Set, Tuple
+from datetime import date, timedelta
+from functools import partial
 
 from pullsar.config import BaseConfig, logger
 from pullsar.parse_operators_catalog import (
-    render_operator_catalog,
-    create_repository_paths_maps,
+    BundleIndex,
     RepositoryMap,
+    build_repository_paths_maps,
 )
+from pullsar.catalog_renderer import load_catalog
 from pullsar.operator_bundle_model import OperatorBundle
-from pullsar.quay_client import QuayClient, QuayLog, QuayTag
+from pullsar.quay_client import (
+    QuayClient,
+    QuayLog,
+    LogWindow,
+    log_window,
+    split_log_window,
+)
 from pullsar.pyxis_client import PyxisClient
-from pullsar.cached_context import CachedContext, PullLog
+from pullsar.cached_context import (
+    CachedContext,
+    PullLogCounts,
+    PyxisImage,
+    PYXIS_IMAGES,
+)
+from pullsar.db.api_cache import ApiCacheEntries
+from pullsar.concurrent_fetcher import ConcurrentFetcher
+from pullsar.log_decoder import decode_pull_repo_logs, oldest_log_date, parse_log_date
 
 TagToOperatorBundleMap = Dict[str, OperatorBundle]
 DigestToOperatorBundleMap = Dict[str, OperatorBundle]
+# key-value pairs, key being a tag or manifest digest as found in pull logs
+# and value being position of the matching operator bundle in its repository
+PullLogKeyToBundlePosition = Dict[str, int]
+# key-value pairs, key being a tag and value being its manifest digest,
+# None if the tag was not found
+TagToDigestMap = Dict[str, Optional[str]]
+
+
+class LogWindowTooLargeError(Exception):
+    """
+    Raised when logs of a window of days span more pages than allowed.
+
+    Attributes:
+        oldest_date: Date of the oldest log consumed before the abort, logs
+            of all the later days were consumed, None if there were no logs.
+    """
+
+    def __init__(self, message: str, oldest_date: Optional[date] = None):
+        super().__init__(message)
+        self.oldest_date = oldest_date
 
 
 class OperatorUsageStatsResolver:
@@ -22,11 +60,35 @@ class OperatorUsageStatsResolver:
     scanning input catalog of operators for operator bundles, resolving their metadata
     and using them in order to retrieve their individual pull counts from their Quay
     repositories. Also, caches data for reuse to avoid repeating API calls for data
-    we've already asked for previously.
+    we've already asked for previously. Repositories are queried concurrently.
+
+    Attributes:
+        log_watermarks: A dictionary of key-value pairs, key being a repository path
+            and value being the last date its logs were ingested through in previous
+            runs. Logs of these repositories are fetched only for the later days.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        fetcher: Optional[ConcurrentFetcher] = None,
+        pyxis_fetcher: Optional[ConcurrentFetcher] = None,
+    ) -> None:
         self._cache = CachedContext()
+        self._fetcher = fetcher or ConcurrentFetcher(
+            max_workers=BaseConfig.QUAY_MAX_WORKERS,
+            max_workers_per_group=BaseConfig.QUAY_MAX_WORKERS_PER_ORG,
+        )
+        self._pyxis_fetcher = pyxis_fetcher or ConcurrentFetcher(
+            max_workers=BaseConfig.PYXIS_MAX_WORKERS,
+            max_workers_per_group=BaseConfig.PYXIS_MAX_WORKERS,
+        )
+        self.log_watermarks: Dict[str, date] = {}
+        self._updated_log_watermarks: Dict[str, date] = {}
+
+    @staticmethod
+    def _extract_org(repo_path: str) -> str:
+        """Extracts organization name from repository path, e.g. org/repo."""
+        return repo_path.split("/", 1)[0]
 
     def tag_in_tag_map(self, tag: str, tag_map: TagToOperatorBundleMap) -> str | None:
         """
@@ -44,9 +106,14 @@ class OperatorUsageStatsResolver:
         if tag in tag_map:
             return tag
 
-        equivalent_tag = tag[1:] if tag.startswith("v") else f"v{tag}"
+        equivalent_tag = self.equivalent_tag(tag)
         return equivalent_tag if equivalent_tag in tag_map else None
 
+    @staticmethod
+    def equivalent_tag(tag: str) -> str:
+        """Returns the tag with prefix 'v' removed, or added if it has none."""
+        return tag[1:] if tag.startswith("v") else f"v{tag}"
+
     def create_local_tag_digest_maps(
         self,
         operator_bundles: List[OperatorBundle],
@@ -75,6 +142,122 @@ class OperatorUsageStatsResolver:
 
         return (tag_to_operator_bundle, digest_to_operator_bundle)
 
+    @staticmethod
+    def log_tags_of(tag: str) -> List[str]:
+        """
+        Lists tags of pull logs counted towards an operator bundle with the tag,
+        see 'tag_in_tag_map': the tag itself, the tag with prefix 'v' and,
+        if the tag has a single prefix 'v', the tag without it.
+        """
+        log_tags = [tag, f"v{tag}"]
+        if tag.startswith("v") and not tag.startswith("vv"):
+            log_tags.append(tag[1:])
+        return log_tags
+
+    def create_pull_log_lookups(
+        self,
+        operator_bundles: List[OperatorBundle],
+    ) -> Tuple[PullLogKeyToBundlePosition, PullLogKeyToBundlePosition]:
+        """
+        Create lookups of operator bundles matching tags and digests of pull logs,
+        with equivalent tags (see 'tag_in_tag_map') already folded into the keys,
+        so that each log is matched by a single lookup.
+
+        Args:
+            operator_bundles (List[OperatorBundle]): List of operator bundles belonging
+            to one repository.
+
+        Returns:
+            Tuple[PullLogKeyToBundlePosition, PullLogKeyToBundlePosition]: Two
+            dictionaries with key-value pairs, key being the log tag or digest and
+            value being position of the matching bundle in 'operator_bundles'.
+            First dictionary - LOG_TAG:POSITION
+            Second dictionary - MANIFEST_DIGEST:POSITION
+        """
+        tag_lookup: PullLogKeyToBundlePosition = {}
+        exact_tags: PullLogKeyToBundlePosition = {}
+        digest_lookup: PullLogKeyToBundlePosition = {}
+        for position, operator_bundle in enumerate(operator_bundles):
+            if operator_bundle.tag:
+                for log_tag in self.log_tags_of(operator_bundle.tag):
+                    tag_lookup[log_tag] = position
+                exact_tags[operator_bundle.tag] = position
+            if operator_bundle.digest:
+                digest_lookup[operator_bundle.digest] = position
+
+        # the same tag takes precedence over an equivalent one
+        tag_lookup.update(exact_tags)
+        return (tag_lookup, digest_lookup)
+
+    def _fetch_pyxis_images(
+        self,
+        pyxis_client: PyxisClient,
+        registry: str,
+        repo_paths: List[str],
+        include: str,
+    ) -> Dict[str, List[PyxisImage]]:
+        """
+        Fetches Pyxis images of multiple repositories, in batches of up to
+        PYXIS_BATCH_SIZE repositories per filtered query. Repositories of failed
+        batches (and a single repository) are fetched one by one. Batches and
+        single repositories are fetched concurrently.
+
+        Args:
+            pyxis_client (PyxisClient): An instance of the PyxisClient.
+            registry (str): The image registry e.g. "registry.connect.redhat.com".
+            repo_paths (List[str]): The repository paths to fetch images for.
+            include (str): The fields to include in the API response.
+
+        Returns:
+            Dict[str, List[PyxisImage]]: Dictionary of key-value pairs, key being
+            a repository path and value being a list of its Pyxis images.
+        """
+        repo_path_to_images: Dict[str, List[PyxisImage]] = {}
+        leftover_repo_paths = repo_paths
+        if len(repo_paths) > 1:
+            batch_size = BaseConfig.PYXIS_BATCH_SIZE
+            batches = [
+                repo_paths[i : i + batch_size]
+                for i in range(0, len(repo_paths), batch_size)
+            ]
+            fetched_batches = self._pyxis_fetcher.run(
+                (
+                    i,
+                    registry,
+                    partial(
+                        pyxis_client.get_images_for_repositories,
+                        registry,
+                        batch,
+                        include,
+                    ),
+                )
+                for i, batch in enumerate(batches)
+            )
+
+            leftover_repo_paths = []
+            for i, batch_images in fetched_batches.items():
+                if batch_images is None:
+                    leftover_repo_paths.extend(batches[i])
+                else:
+                    repo_path_to_images.update(batch_images)
+
+        repo_path_to_images.update(
+            self._pyxis_fetcher.run(
+                (
+                    repo_path,
+                    registry,
+                    partial(
+                        pyxis_client.get_images_for_repository,
+                        registry,
+                        repo_path,
+                        include,
+                    ),
+                )
+                for repo_path in leftover_repo_paths
+            )
+        )
+        return repo_path_to_images
+
     def resolve_not_quay_repositories(
         self,
         pyxis_client: PyxisClient,
@@ -101,17 +284,36 @@ class OperatorUsageStatsResolver:
         )
 
         cache = self._cache
+        repo_paths_to_fetch = []
         for repo_path, bundles in not_quay_repos_map.items():
-            pyxis_images = []
-            if repo_path not in cache.repo_path_to_pyxis_images:
-                pyxis_images = pyxis_client.get_images_for_repository(
-                    target_registry, repo_path, include_fields
-                )
-                cache.repo_path_to_pyxis_images[repo_path] = pyxis_images
+            pyxis_images = cache.repo_path_to_pyxis_images.get(repo_path)
+            if pyxis_images is not None and cache.is_stored(
+                PYXIS_IMAGES, repo_path, pyxis_images
+            ):
+                # images persisted by a previous run miss the newly released ones,
+                # bundles without a digest are never matched to Pyxis images
+                image_ids = {
+                    pyxis_image.get("image_id") for pyxis_image in pyxis_images
+                }
+                if any(
+                    bundle.digest and bundle.digest not in image_ids
+                    for bundle in bundles
+                ):
+                    pyxis_images = None
+
+            if pyxis_images is None:
+                repo_paths_to_fetch.append(repo_path)
             else:
                 logger.info(f"Reusing stored Pyxis images for repository: {repo_path}")
-                pyxis_images = cache.repo_path_to_pyxis_images[repo_path]
 
+        cache.repo_path_to_pyxis_images.update(
+            self._fetch_pyxis_images(
+                pyxis_client, target_registry, repo_paths_to_fetch, include_fields
+            )
+        )
+
+        for repo_path, bundles in not_quay_repos_map.items():
+            pyxis_images = cache.repo_path_to_pyxis_images[repo_path]
             if not pyxis_images:
                 continue
 
@@ -138,6 +340,84 @@ class OperatorUsageStatsResolver:
                             )
                             break
 
+    def _lookup_tag_digests(
+        self, quay_client: QuayClient, repository_path: str, tag: str
+    ) -> Tuple[TagToDigestMap, Set[str]]:
+        """
+        Looks up manifest digest of a single tag, trying its equivalent tag
+        (with or without prefix 'v') if the tag itself does not exist.
+
+        Args:
+            quay_client (QuayClient): Quay client used for API requests.
+            repository_path (str): Quay repository of the tag.
+            tag (str): Operator bundle tag, e.g. v1.2.3
+
+        Returns:
+            Tuple[TagToDigestMap, Set[str]]: The tag mapped to its digest,
+            and no tags left to look up.
+        """
+        for candidate in (tag, self.equivalent_tag(tag)):
+            tag_object = quay_client.get_repo_tag(repository_path, candidate)
+            if tag_object:
+                return ({tag: tag_object.get("manifest_digest")}, set())
+        return ({tag: None}, set())
+
+    def _list_tag_digests(
+        self, quay_client: QuayClient, repository_path: str, tags: Set[str]
+    ) -> Tuple[TagToDigestMap, Set[str]]:
+        """
+        Resolves manifest digests of tags by listing tags of the repository page
+        by page. Stops listing as soon as few enough tags remain unresolved
+        that looking them up one by one is cheaper than listing further pages.
+        If listing fails, the unresolved tags are left to be looked up one by one.
+
+        The tag history is listed newest first, so a tag is resolved to the digest
+        it points to now (like a lookup of the active tag does), not to a digest
+        it pointed to in the past. The tag itself takes precedence over its
+        equivalent tag (with or without prefix 'v').
+
+        Args:
+            quay_client (QuayClient): Quay client used for API requests.
+            repository_path (str): Quay repository of the tags.
+            tags (Set[str]): Operator bundle tags to resolve.
+
+        Returns:
+            Tuple[TagToDigestMap, Set[str]]: Resolved tags mapped to their digests
+            (None if not found), and tags left to look up one by one.
+        """
+        wanted = tags | {self.equivalent_tag(tag) for tag in tags}
+        found: Dict[str, str] = {}
+        remaining = set(tags)
+        try:
+            for tag_objects in quay_client.iter_repo_tag_pages(repository_path):
+                # tag history is listed newest first, the first occurrence wins
+                for tag_object in tag_objects:
+                    name = tag_object.get("name")
+                    if name in wanted and name not in found:
+                        found[name] = tag_object["manifest_digest"]
+                remaining = {
+                    tag
+                    for tag in remaining
+                    if tag not in found and self.equivalent_tag(tag) not in found
+                }
+                if len(remaining) <= BaseConfig.QUAY_TAG_LOOKUP_MAX_TAGS:
+                    break
+            else:
+                remaining = set()
+        except requests.exceptions.RequestException:
+            # tags not listed yet were never looked up, they are not missing
+            remaining = {
+                tag
+                for tag in remaining
+                if tag not in found and self.equivalent_tag(tag) not in found
+            }
+
+        tag_digests: TagToDigestMap = {
+            tag: found.get(tag) or found.get(self.equivalent_tag(tag))
+            for tag in tags - remaining
+        }
+        return (tag_digests, remaining)
+
     def update_image_digests(
         self,
         quay_client: QuayClient,
@@ -147,6 +427,11 @@ class OperatorUsageStatsResolver:
         Looks up and updates image digests of all the operator bundles defined
         in the given repository paths map based on their defined tags using Quay API.
 
+        A repository with only a few unresolved tags has each of them looked up
+        directly, instead of paginating through its whole tag history. More tags
+        are resolved by listing the repository's tags, until few enough remain
+        to be looked up. Repositories and lookups are queried concurrently.
+
         Args:
             quay_client (QuayClient): Quay client used for API requests.
             repository_paths_map (RepositoryMap): Dictionary of key-value pairs,
@@ -154,27 +439,56 @@ class OperatorUsageStatsResolver:
             objects, images of which are stored in the repository.
         """
         cache = self._cache
-        for (
-            repository_path,
-            operator_bundles,
-        ) in repository_paths_map.items():
-            tag_objects: List[QuayTag] = []
-            if repository_path not in cache.repo_path_to_tags:
-                tag_objects = quay_client.get_repo_tags(repository_path)
-                cache.repo_path_to_tags[repository_path] = tag_objects
-            else:
+        lookups: List[Tuple[str, str]] = []
+        listings: Dict[str, Set[str]] = {}
+        for repository_path, operator_bundles in repository_paths_map.items():
+            known_tags = cache.repo_path_to_tag_digests.setdefault(repository_path, {})
+            tags = {
+                operator_bundle.tag
+                for operator_bundle in operator_bundles
+                if operator_bundle.tag and operator_bundle.tag not in known_tags
+            }
+            if not tags:
                 logger.info(f"Reusing stored tags for repository: {repository_path}")
-                tag_objects = cache.repo_path_to_tags[repository_path]
+            elif len(tags) <= BaseConfig.QUAY_TAG_LOOKUP_MAX_TAGS:
+                lookups.extend((repository_path, tag) for tag in sorted(tags))
+            else:
+                listings[repository_path] = tags
 
-            tag_to_operator_bundle, _ = self.create_local_tag_digest_maps(
-                operator_bundles
-            )
-            for tag_object in tag_objects:
-                tag = self.tag_in_tag_map(tag_object["name"], tag_to_operator_bundle)
-                if tag:
-                    tag_to_operator_bundle[tag].update_image_digest(
-                        tag_object["manifest_digest"]
+        while lookups or listings:
+            results = self._fetcher.run(
+                [
+                    (
+                        (repository_path, tag),
+                        self._extract_org(repository_path),
+                        partial(
+                            self._lookup_tag_digests, quay_client, repository_path, tag
+                        ),
+                    )
+                    for repository_path, tag in lookups
+                ]
+                + [
+                    (
+                        (repository_path, None),
+                        self._extract_org(repository_path),
+                        partial(
+                            self._list_tag_digests, quay_client, repository_path, tags
+                        ),
                     )
+                    for repository_path, tags in listings.items()
+                ]
+            )
+            lookups, listings = [], {}
+            for (repository_path, _), (tag_digests, remaining) in results.items():
+                cache.repo_path_to_tag_digests[repository_path].update(tag_digests)
+                lookups.extend((repository_path, tag) for tag in sorted(remaining))
+
+        for repository_path, operator_bundles in repository_paths_map.items():
+            known_tags = cache.repo_path_to_tag_digests[repository_path]
+            for operator_bundle in operator_bundles:
+                digest = known_tags.get(operator_bundle.tag or "")
+                if digest:
+                    operator_bundle.update_image_digest(digest)
 
     def extract_date(self, datetime_str: str) -> date:
         """Extracts date from datetime string used in Quay logs.
@@ -185,39 +499,498 @@ class OperatorUsageStatsResolver:
         Returns:
             date: Extracted date object.
         """
-        dt = datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %z")
-        return dt.date()
+        return parse_log_date(datetime_str)
 
-    def filter_pull_repo_logs(self, logs: List[QuayLog]) -> List[PullLog]:
+    def _fold_pull_repo_logs(
+        self,
+        log_pages: Iterable[List[QuayLog]],
+        pull_logs_of: Callable[[Optional[str], date], Optional[PullLogCounts]],
+        since: Optional[date] = None,
+        max_pages: Optional[int] = None,
+    ) -> None:
         """
-        Processes Quay logs, filters 'pull_repo' type logs and simplify them keeping
-        only the data needed for futher processing ('date' and an operator version
-        identifier, either 'digest' or 'tag').
+        Consumes Quay logs page by page, filters 'pull_repo' type logs and folds
+        them into counters by date and an operator version identifier, either
+        'tag' or 'digest'. Other logs are dropped as soon as their page arrives.
 
         Args:
-            logs (List[QuayLog]): Mixed logs from Quay.
+            log_pages (Iterable[List[QuayLog]]): Pages of mixed logs from Quay,
+            newest logs first.
+            pull_logs_of (Callable[[Optional[str], date], Optional[PullLogCounts]]):
+            Picks counters for a log by its repository (set in organization logs)
+            and date, None to drop the log.
+            since (Optional[date]): If set, logs older than this date are dropped
+            and no more pages are consumed once such logs are reached.
+            max_pages (Optional[int]): If set, consuming more pages than this
+            is aborted.
+
+        Raises:
+            LogWindowTooLargeError: If there are more than 'max_pages' pages,
+            logs of the consumed pages stay counted.
+        """
+        consumed_date: Optional[date] = None
+        for page_num, logs in enumerate(log_pages, 1):
+            if max_pages and page_num > max_pages:
+                raise LogWindowTooLargeError(
+                    f"More than {max_pages} pages of logs.", consumed_date
+                )
+
+            for log_date, repo, tag, digest in decode_pull_repo_logs(logs, since):
+                pull_logs = pull_logs_of(repo, log_date)
+                if pull_logs is None:
+                    continue
+                if tag:
+                    pull_logs.tags[(log_date, tag)] += 1
+                elif digest:
+                    pull_logs.digests[(log_date, digest)] += 1
+
+            oldest_date = oldest_log_date(logs)
+            consumed_date = oldest_date or consumed_date
+            if since and oldest_date and oldest_date < since:
+                logger.debug(f"Reached logs older than {since}, stopping pagination.")
+                break
+
+    def count_pull_repo_logs(
+        self,
+        log_pages: Iterable[List[QuayLog]],
+        since: Optional[date] = None,
+        max_pages: Optional[int] = None,
+        pull_logs: Optional[PullLogCounts] = None,
+    ) -> PullLogCounts:
+        """
+        Consumes Quay logs of a repository page by page, filters 'pull_repo' type
+        logs and folds them into counters by date and an operator version identifier,
+        either 'tag' or 'digest'. Other logs are dropped as soon as their page arrives.
+
+        Args:
+            log_pages (Iterable[List[QuayLog]]): Pages of mixed logs from Quay,
+            newest logs first.
+            since (Optional[date]): If set, logs older than this date are dropped
+            and no more pages are consumed once such logs are reached.
+            max_pages (Optional[int]): If set, consuming more pages than this
+            is aborted.
+            pull_logs (Optional[PullLogCounts]): Counters to add the logs to,
+            new ones by default.
+
+        Raises:
+            LogWindowTooLargeError: If there are more than 'max_pages' pages,
+            logs of the consumed pages stay counted in 'pull_logs'.
+
+        Returns:
+            PullLogCounts: Numbers of 'pull_repo' actions per date and tag,
+            and per date and digest.
+        """
+        if pull_logs is None:
+            pull_logs = PullLogCounts()
+        counts = pull_logs
+        self._fold_pull_repo_logs(
+            log_pages, lambda repo, log_date: counts, since, max_pages
+        )
+
+        logger.info(f"Total pull log entries retrieved: {pull_logs.total}")
+        return pull_logs
+
+    def count_org_pull_repo_logs(
+        self,
+        org: str,
+        log_pages: Iterable[List[QuayLog]],
+        log_windows: Dict[str, LogWindow],
+        since: Optional[date] = None,
+        max_pages: Optional[int] = None,
+        repo_pull_logs: Optional[Dict[str, PullLogCounts]] = None,
+    ) -> Dict[str, PullLogCounts]:
+        """
+        Consumes Quay logs of an organization page by page and demultiplexes
+        'pull_repo' type logs by their repository into the same counters as
+        count_pull_repo_logs. Logs of other repositories, or outside the window
+        of days of their repository, are dropped.
+
+        Args:
+            org (str): Quay organization the logs belong to.
+            log_pages (Iterable[List[QuayLog]]): Pages of mixed logs from Quay,
+            newest logs first.
+            log_windows (Dict[str, LogWindow]): Dictionary of key-value pairs,
+            key being a repository path and value being its window of days.
+            since (Optional[date]): If set, logs older than this date are dropped
+            and no more pages are consumed once such logs are reached.
+            max_pages (Optional[int]): If set, consuming more pages than this
+            is aborted.
+            repo_pull_logs (Optional[Dict[str, PullLogCounts]]): Counters
+            of the repositories to add the logs to, new ones by default.
+
+        Raises:
+            LogWindowTooLargeError: If there are more than 'max_pages' pages,
+            logs of the consumed pages stay counted in 'repo_pull_logs'.
 
         Returns:
-            List[PullLog]: List of objects representing 'pull_repo' actions
-            with attributes 'date' and an identifier, either 'digest' or 'tag'.
+            Dict[str, PullLogCounts]: Dictionary of key-value pairs, key being
+            a repository path and value being its aggregated logs.
         """
-        pull_logs = []
-        for log in logs:
+        if repo_pull_logs is None:
+            repo_pull_logs = {}
+        for repository_path in log_windows:
+            repo_pull_logs.setdefault(repository_path, PullLogCounts())
+        counts = repo_pull_logs
+
+        def pull_logs_of(
+            repo: Optional[str], log_date: date
+        ) -> Optional[PullLogCounts]:
+            repository_path = f"{org}/{repo}"
+            window = log_windows.get(repository_path)
+            if window and window[0] <= log_date <= window[1]:
+                return counts[repository_path]
+            return None
+
+        self._fold_pull_repo_logs(log_pages, pull_logs_of, since, max_pages)
+
+        logger.info(
+            f"Total pull log entries retrieved for organization {org}: "
+            f"{sum(pull_logs.total for pull_logs in repo_pull_logs.values())}"
+        )
+        return repo_pull_logs
+
+    def _repo_log_window(
+        self, repository_path: str, log_days: int
+    ) -> Optional[LogWindow]:
+        """
+        Computes the window of days to fetch logs for. Defaults to the last
+        'log_days' completed days. If logs of the repository were ingested in
+        previous runs, the window covers all the days after its watermark
+        instead, limited to the last LOG_DAYS_MAX days available in Quay.
+
+        Args:
+            repository_path (str): Quay repository path, e.g. org/repo.
+            log_days (int): Number of completed past days for repositories
+            without a watermark.
+
+        Returns:
+            Optional[LogWindow]: First and last date of the window,
+            None if logs of the repository are already ingested through the last day.
+        """
+        start_date, end_date = log_window(log_days)
+        watermark = self.log_watermarks.get(repository_path)
+        if watermark:
+            earliest_date, _ = log_window(BaseConfig.LOG_DAYS_MAX)
+            start_date = max(watermark + timedelta(days=1), earliest_date)
+
+        if start_date > end_date:
+            return None
+        return (start_date, end_date)
+
+    def _fetch_pull_logs(
+        self,
+        quay_client: QuayClient,
+        source: str,
+        log_windows: Dict[str, LogWindow],
+        start_date: date,
+        end_date: date,
+    ) -> Optional[Tuple[Dict[str, PullLogCounts], List[LogWindow]]]:
+        """
+        Streams Quay logs of a repository, or of an organization, for the given
+        window of days into aggregated 'pull_repo' logs of each repository.
+        A window of multiple days spanning more than QUAY_LOG_WINDOW_MAX_PAGES
+        pages is abandoned. Logs of its newest days already consumed in full
+        are kept (logs come newest first), the rest of the window is split
+        into halves to be fetched concurrently instead.
+
+        Args:
+            quay_client (QuayClient): Quay client used for API requests.
+            source (str): Repository path, or organization name.
+            log_windows (Dict[str, LogWindow]): Windows of days of the repositories
+            the logs are fetched for, a single one if 'source' is a repository.
+            start_date (date): First day of the window.
+            end_date (date): Last day of the window (inclusive).
+
+        Returns:
+            Optional[Tuple[Dict[str, PullLogCounts], List[LogWindow]]]: Aggregated
+            logs by repository path and windows of days left to fetch (if the window
+            was too large), or None if any of the requests failed (logs retrieved
+            so far are dropped).
+        """
+        max_pages = (
+            BaseConfig.QUAY_LOG_WINDOW_MAX_PAGES if end_date > start_date else None
+        )
+        repo_pull_logs = {
+            repository_path: PullLogCounts() for repository_path in log_windows
+        }
+        try:
+            if source in log_windows:
+                self.count_pull_repo_logs(
+                    quay_client.iter_repo_log_pages(source, start_date, end_date),
+                    since=start_date,
+                    max_pages=max_pages,
+                    pull_logs=repo_pull_logs[source],
+                )
+            else:
+                self.count_org_pull_repo_logs(
+                    source,
+                    quay_client.iter_org_log_pages(source, start_date, end_date),
+                    log_windows,
+                    since=start_date,
+                    max_pages=max_pages,
+                    repo_pull_logs=repo_pull_logs,
+                )
+            return (repo_pull_logs, [])
+        except LogWindowTooLargeError as e:
+            # logs of the oldest consumed day may continue on the next pages
+            last_date = min(e.oldest_date or end_date, end_date)
+            for pull_logs in repo_pull_logs.values():
+                pull_logs.drop_until(last_date)
+
+            logger.info(
+                f"Logs of {source} ({start_date} - {end_date}) span more than "
+                f"{max_pages} pages, fetching {start_date} - {last_date} "
+                "in smaller windows..."
+            )
+            if last_date == start_date:
+                return (repo_pull_logs, [(start_date, start_date)])
+            middle_date = start_date + (last_date - start_date) // 2
+            return (
+                repo_pull_logs,
+                [
+                    (start_date, middle_date),
+                    (middle_date + timedelta(days=1), last_date),
+                ],
+            )
+        except requests.exceptions.RequestException:
+            return None
+
+    def _group_log_sources(
+        self, log_windows: Dict[str, LogWindow]
+    ) -> Dict[str, Dict[str, LogWindow]]:
+        """
+        Decides where to fetch logs of each repository from. Organizations with at
+        least QUAY_ORG_LOGS_MIN_REPOS repositories to fetch logs for are scanned
+        once through the organization logs, instead of once per repository.
+
+        Args:
+            log_windows (Dict[str, LogWindow]): Dictionary of key-value pairs,
+            key being a repository path and value being its window of days.
+
+        Returns:
+            Dict[str, Dict[str, LogWindow]]: Dictionary of key-value pairs, key being
+            a log source (repository path or organization name) and value being
+            windows of days of the repositories, logs of which it provides.
+        """
+        org_log_windows: Dict[str, Dict[str, LogWindow]] = {}
+        for repository_path, window in log_windows.items():
+            org = self._extract_org(repository_path)
+            org_log_windows.setdefault(org, {})[repository_path] = window
+
+        min_repos = BaseConfig.QUAY_ORG_LOGS_MIN_REPOS
+        sources: Dict[str, Dict[str, LogWindow]] = {}
+        for org, repository_windows in org_log_windows.items():
+            if min_repos and len(repository_windows) >= min_repos:
+                logger.info(
+                    f"Fetching logs of {len(repository_windows)} repositories "
+                    f"through organization logs of {org}."
+                )
+                sources[org] = repository_windows
+            else:
+                for repository_path, window in repository_windows.items():
+                    sources[repository_path] = {repository_path: window}
+        return sources
+
+    def _pull_activity_days(
+        self,
+        quay_client: QuayClient,
+        org: str,
+        start_date: date,
+        end_date: date,
+    ) -> Optional[Set[date]]:
+        """
+        Finds the days of a window with any 'pull_repo' activity
+        of an organization, based on aggregated log counts.
+
+        Args:
+            quay_client (QuayClient): Quay client used for API requests.
+            org (str): Quay organization name.
+            start_date (date): First day of the window.
+            end_date (date): Last day of the window (inclusive).
+
+        Returns:
+            Optional[Set[date]]: Days with pulls, None if the request failed.
+        """
+        aggregated_logs = quay_client.get_org_aggregated_logs(org, start_date, end_date)
+        if aggregated_logs is None:
+            return None
+
+        days = set()
+        for aggregated_log in aggregated_logs:
             if (
-                log.get("kind") == "pull_repo"
-                and log.get("metadata")
-                and log.get("datetime")
+                aggregated_log.get("kind") == "pull_repo"
+                and aggregated_log.get("count")
+                and aggregated_log.get("datetime")
             ):
-                date = self.extract_date(log["datetime"])
-                if log["metadata"].get("tag"):
-                    pull_logs.append(PullLog(date=date, tag=log["metadata"]["tag"]))
-                elif log["metadata"].get("manifest_digest"):
-                    pull_logs.append(
-                        PullLog(date=date, digest=log["metadata"]["manifest_digest"])
-                    )
+                log_date = self.extract_date(aggregated_log["datetime"])
+                if start_date <= log_date <= end_date:
+                    days.add(log_date)
+        return days
 
-        logger.info(f"Total pull log entries retrieved: {len(pull_logs)}")
-        return pull_logs
+    def _precheck_pull_activity(
+        self,
+        quay_client: QuayClient,
+        source_windows: Dict[str, LogWindow],
+    ) -> Dict[str, LogWindow]:
+        """
+        Narrows windows of log sources down to the days with any 'pull_repo'
+        activity of their organization, dropping sources of inactive organizations
+        altogether, so their logs are not scanned. Activity of single repositories
+        is not checked, a scan of an inactive repository's logs is mostly a single
+        request anyway, while an active one would pay an extra request. If a check
+        fails, the window stays as is.
+
+        Args:
+            quay_client (QuayClient): Quay client used for API requests.
+            source_windows (Dict[str, LogWindow]): Window of days of each source
+            (see _group_log_sources).
+
+        Returns:
+            Dict[str, LogWindow]: Narrowed windows of the sources with any pulls.
+        """
+        org_windows: Dict[str, LogWindow] = {}
+        for source, (start_date, end_date) in source_windows.items():
+            org = self._extract_org(source)
+            org_start_date, org_end_date = org_windows.get(org, (start_date, end_date))
+            org_windows[org] = (
+                min(start_date, org_start_date),
+                max(end_date, org_end_date),
+            )
+
+        org_days = self._fetcher.run(
+            (
+                org,
+                org,
+                partial(self._pull_activity_days, quay_client, org, *window),
+            )
+            for org, window in org_windows.items()
+        )
+
+        active_windows: Dict[str, LogWindow] = {}
+        for source, (start_date, end_date) in source_windows.items():
+            days = org_days[self._extract_org(source)]
+            if days is None:
+                active_windows[source] = (start_date, end_date)
+                continue
+
+            days = {day for day in days if start_date <= day <= end_date}
+            if days:
+                active_windows[source] = (min(days), max(days))
+            else:
+                logger.info(
+                    f"No pull activity of {source} ({start_date} - {end_date}), "
+                    "skipping its logs."
+                )
+        return active_windows
+
+    def _fetch_repos_pull_logs(
+        self, quay_client: QuayClient, log_windows: Dict[str, LogWindow]
+    ) -> Dict[str, Optional[PullLogCounts]]:
+        """
+        Fetches logs of multiple repositories concurrently, from the repositories
+        themselves or from their organization (see _group_log_sources). Sources
+        without any pulls are skipped, leaving their repositories with no logs
+        (see _precheck_pull_activity). The window of each source is split into
+        windows of at most QUAY_LOG_WINDOW_DAYS days, fetched independently
+        and merged afterwards. Days of windows that turn out too large and whose
+        logs were not consumed in full are split further and fetched in the next round.
+
+        Args:
+            quay_client (QuayClient): Quay client used for API requests.
+            log_windows (Dict[str, LogWindow]): Dictionary of key-value pairs,
+            key being a repository path and value being its window of days.
+
+        Returns:
+            Dict[str, Optional[PullLogCounts]]: Dictionary of key-value pairs,
+            key being a repository path and value being its aggregated logs,
+            or None if fetching any of its windows failed.
+        """
+        results: Dict[str, Optional[PullLogCounts]] = {
+            repository_path: PullLogCounts() for repository_path in log_windows
+        }
+        sources = self._group_log_sources(log_windows)
+        source_windows = {
+            source: (
+                min(start_date for start_date, _ in repository_windows.values()),
+                max(end_date for _, end_date in repository_windows.values()),
+            )
+            for source, repository_windows in sources.items()
+        }
+        if BaseConfig.QUAY_LOG_PRECHECK and source_windows:
+            source_windows = self._precheck_pull_activity(quay_client, source_windows)
+
+        failed_sources: Set[str] = set()
+        pending = [
+            (source, window)
+            for source, (start_date, end_date) in source_windows.items()
+            for window in split_log_window(
+                start_date, end_date, BaseConfig.QUAY_LOG_WINDOW_DAYS
+            )
+        ]
+
+        while pending:
+            fetched = self._fetcher.run(
+                (
+                    (source, window),
+                    self._extract_org(source),
+                    partial(
+                        self._fetch_pull_logs,
+                        quay_client,
+                        source,
+                        sources[source],
+                        *window,
+                    ),
+                )
+                for source, window in pending
+                if source not in failed_sources
+            )
+
+            pending = []
+            for (source, _), outcome in fetched.items():
+                if outcome is None:
+                    failed_sources.add(source)
+                    for repository_path in sources[source]:
+                        results[repository_path] = None
+                    continue
+
+                fetched_logs, windows_left = outcome
+                pending.extend((source, window) for window in windows_left)
+                for repository_path, repo_pull_logs in fetched_logs.items():
+                    pull_logs = results[repository_path]
+                    if pull_logs is not None:
+                        pull_logs.update(repo_pull_logs)
+
+        return results
+
+    def load_api_cache(self, entries: ApiCacheEntries) -> None:
+        """
+        Reuses API responses persisted by previous runs (image translations,
+        resolved tag digests and Pyxis images), so they are not requested again.
+
+        Args:
+            entries (ApiCacheEntries): Persisted API responses by namespace.
+        """
+        self._cache.load(entries)
+
+    def get_api_cache_updates(self) -> ApiCacheEntries:
+        """
+        Returns API responses of this run worth persisting for the next runs.
+
+        Returns:
+            ApiCacheEntries: API responses to persist by namespace.
+        """
+        return self._cache.get_new_entries()
+
+    def get_updated_log_watermarks(self) -> Dict[str, date]:
+        """
+        Accesses watermarks of the repositories, logs of which were successfully
+        ingested during this run.
+
+        Returns:
+            Dict[str, date]: Dictionary of key-value pairs, key being a repository
+            path and value being the last date its logs were ingested through.
+        """
+        return dict(self._updated_log_watermarks)
 
     def update_image_pull_counts(
         self,
@@ -228,43 +1001,69 @@ class OperatorUsageStatsResolver:
         """
         Looks up and updates pull counts of all the operator bundles defined in the given
         repository paths map based on their defined tags and digests using Quay API.
+        Logs of the repositories are fetched concurrently, pull counts are then
+        updated sequentially. Repositories with a log watermark are fetched
+        only for the days after it (see _repo_log_window).
 
         Args:
             quay_client (QuayClient): Quay client used for API requests.
             repository_paths_map (RepositoryMap): Dictionary of key-value pairs, key being
             a quay repository and value being a list of OperatorBundle objects, images
             of which are stored in the repository.
-            log_days (int): Update stats based on logs from the last 'log_days' completed days.
+            log_days (int): Update stats based on logs from the last 'log_days' completed days
+            (for repositories without a log watermark).
         """
         cache = self._cache
-        for repository_path, operator_bundles in repository_paths_map.items():
-            pull_logs = []
-            if repository_path not in cache.repo_path_to_logs:
-                logs = quay_client.get_repo_logs(repository_path, log_days)
-                pull_logs = self.filter_pull_repo_logs(logs)
-                cache.repo_path_to_logs[repository_path] = pull_logs
+        log_windows: Dict[str, LogWindow] = {}
+        for repository_path in repository_paths_map:
+            if repository_path in cache.repo_path_to_logs:
+                continue
+
+            window = self._repo_log_window(repository_path, log_days)
+            if window:
+                log_windows[repository_path] = window
             else:
+                logger.info(
+                    f"Logs of repository {repository_path} are already ingested "
+                    f"through {self.log_watermarks[repository_path]}."
+                )
+                cache.repo_path_to_logs[repository_path] = PullLogCounts()
+
+        fetched_logs = self._fetch_repos_pull_logs(quay_client, log_windows)
+        for repository_path, pull_logs in fetched_logs.items():
+            if pull_logs is None:
+                cache.repo_path_to_logs[repository_path] = PullLogCounts()
+                continue
+
+            cache.repo_path_to_logs[repository_path] = pull_logs
+            _, end_date = log_windows[repository_path]
+            self._updated_log_watermarks[repository_path] = end_date
+
+        # counting runs sequentially in map order, independent of fetch completion
+        for repository_path, operator_bundles in repository_paths_map.items():
+            if repository_path not in log_windows:
                 logger.info(f"Reusing stored logs for repository: {repository_path}")
-                pull_logs = cache.repo_path_to_logs[repository_path]
+            pull_logs = cache.repo_path_to_logs[repository_path]
 
-            if not pull_logs:
+            if not pull_logs.total:
                 logger.info(
                     f"No pull logs found for repository path: {repository_path}"
                 )
                 continue
 
-            tag_to_operator_bundle, digest_to_operator_bundle = (
-                self.create_local_tag_digest_maps(operator_bundles)
-            )
-            for log in pull_logs:
-                if "digest" in log and log["digest"] in digest_to_operator_bundle:
-                    pull_count = digest_to_operator_bundle[log["digest"]].pull_count
-                    pull_count[log["date"]] = pull_count.get(log["date"], 0) + 1
-                elif "tag" in log:
-                    tag = self.tag_in_tag_map(log["tag"], tag_to_operator_bundle)
-                    if tag:
-                        pull_count = tag_to_operator_bundle[tag].pull_count
-                        pull_count[log["date"]] = pull_count.get(log["date"], 0) + 1
+            tag_lookup, digest_lookup = self.create_pull_log_lookups(operator_bundles)
+            bundle_pulls: Counter[Tuple[int, date]] = Counter()
+            for (log_date, digest), count in pull_logs.digests.items():
+                position = digest_lookup.get(digest)
+                if position is not None:
+                    bundle_pulls[position, log_date] += count
+            for (log_date, log_tag), count in pull_logs.tags.items():
+                position = tag_lookup.get(log_tag)
+                if position is not None:
+                    bundle_pulls[position, log_date] += count
+
+            for (position, log_date), count in bundle_pulls.items():
+                operator_bundles[position].pull_count.add(log_date, count)
 
     def print_operator_usage_stats(self, repository_paths_map: RepositoryMap):
         """
@@ -288,42 +1087,41 @@ class OperatorUsageStatsResolver:
                     print(f"\n{counter}.\n{operator_bundle}")
                     counter += 1
 
-    def update_operator_usage_stats(
+    def resolve_operator_bundles(
         self,
         quay_client: QuayClient,
         pyxis_client: PyxisClient,
-        log_days: int,
         catalog_image: str,
         catalog_json_file: Optional[str] = None,
+        bundle_index: Optional[BundleIndex] = None,
     ) -> RepositoryMap:
         """
-        Scans input catalog of operators for operator bundles, then uses their metadata
-        to retrieve their individual pull counts from their Quay repositories. If optional
+        Scans input catalog of operators for operator bundles and resolves their
+        Quay repositories and image digests, without counting their pulls. If optional
         'catalog_json_file' is provided, 'opm render' on 'catalog_image' is skipped and
-        the provided catalog file is used instead.
+        the provided catalog file is used instead. If 'bundle_index' of an already
+        loaded catalog is provided (see 'iter_loaded_catalogs'), both are skipped.
 
         Args:
             quay_client (QuayClient): Quay client used for API requests.
             pyxis_client (PyxisClient): Pyxis client used for API requests.
-            log_days (int): Update stats based on logs from the last 'log_days' completed days.
             catalog_image (str): Operators catalog image.
             catalog_json_file (Optional[str]): Pre-rendered operators catalog JSON file. Defaults to None.
+            bundle_index (Optional[BundleIndex]): Operator bundles of the already
+            loaded catalog. Defaults to None.
 
         Returns:
             RepositoryMap: Dictionary of key-value pairs, key being a quay repository and value
             being a list of OperatorBundle objects, images of which are stored in the repository.
         """
-        if not catalog_json_file:
-            is_success = render_operator_catalog(
-                catalog_image, BaseConfig.CATALOG_JSON_FILE
-            )
-            if not is_success:
-                return {}
+        if bundle_index is None:
+            bundle_index = load_catalog(catalog_image, catalog_json_file)
+        if bundle_index is None:
+            return {}
 
         quay_repos_map, no_digest_repos_map, not_quay_repos_map = (
-            create_repository_paths_maps(
-                catalog_json_file or BaseConfig.CATALOG_JSON_FILE,
-                self._cache.known_image_translations,
+            build_repository_paths_maps(
+                bundle_index, self._cache.known_image_translations
             )
         )
 
@@ -337,10 +1135,35 @@ class OperatorUsageStatsResolver:
         logger.info("\nLooking up missing manifest digests if any...")
         self.update_image_digests(quay_client, no_digest_repos_map)
 
-        logger.info("\nOperator bundles and their usage stats:")
-        self.update_image_pull_counts(quay_client, quay_repos_map, log_days)
+        return quay_repos_map
 
-        logger.info(f"\nOperators pulled at least once in the last {log_days} days:")
-        self.print_operator_usage_stats(quay_repos_map)
+    def count_operator_usage_stats(
+        self,
+        quay_client: QuayClient,
+        repository_paths_map: RepositoryMap,
+        log_days: int,
+    ) -> None:
+        """
+        Updates pull counts of the operator bundles with resolved images
+        and prints the pulled ones on the stdout.
 
-        return quay_repos_map
+        Args:
+            quay_client (QuayClient): Quay client used for API requests.
+            repository_paths_map (RepositoryMap): Dictionary of key-value pairs,
+            key being a quay repository and value being a list of OperatorBundle
+            objects, images of which are stored in the repository.
+            log_days (int): Update stats based on logs from the last 'log_days' completed days.
+        """
+        logger.info("\nOperator bundles and their usage stats:")
+        self.update_image_pull_counts(quay_client, repository_paths_map, log_days)
+
+        if self.log_watermarks:
+            logger.info(
+                f"\nOperators pulled at least once in the last {log_days} days, "
+                "or since the last ingested day of repositories ingested before:"
+            )
+        else:
+            logger.info(
+                f"\nOperators pulled at least once in the last {log_days} days:"
+            )
+        self.print_operator_usage_stats(repository_paths_map)
@@ -3,6 +3,7 @@ from datetime import date
 
 from pullsar.parse_operators_catalog import RepositoryMap
 from pullsar.operator_bundle_model import OperatorBundle
+from pullsar.global_index import GlobalBundleIndex
 
 
 @pytest.fixture
@@ -17,3 +18,11 @@ def sample_repo_map() -> RepositoryMap:
     bundles[1].pull_count[date(2025, 7, 21)] = 10
     bundles[2].pull_count[date(2025, 7, 21)] = 15
     return {"org/repo": bundles}
+
+
+@pytest.fixture
+def sample_global_index(sample_repo_map: RepositoryMap) -> GlobalBundleIndex:
+    """Provides a GlobalBundleIndex with the sample RepositoryMap of a single catalog."""
+    global_index = GlobalBundleIndex()
+    global_index.add_catalog("catalog-name:v4.18", sample_repo_map)
+    return global_index
@@ -0,0 +1,68 @@
+from pytest_mock import MockerFixture
+
+from pullsar.db import api_cache
+
+
+def test_select_api_cache(mocker: MockerFixture) -> None:
+    """Tests that cached API responses are grouped by namespace."""
+    mock_cur = mocker.MagicMock()
+    mock_cur.__iter__.return_value = iter(
+        [
+            ("tag_digests", "org/repo:v1", "sha256:abc"),
+            ("pyxis_images", "org/repo", [{"image_id": "sha256:abc"}]),
+            ("tag_digests", "org/repo:v2", "sha256:def"),
+        ]
+    )
+
+    result = api_cache.select_api_cache(mock_cur, 30)
+
+    assert result == {
+        "tag_digests": {"org/repo:v1": "sha256:abc", "org/repo:v2": "sha256:def"},
+        "pyxis_images": {"org/repo": [{"image_id": "sha256:abc"}]},
+    }
+    sql, params = mock_cur.execute.call_args.args
+    assert "FROM api_cache" in sql
+    assert params == (30,)
+
+
+def test_upsert_api_cache(mocker: MockerFixture) -> None:
+    """Tests that entries of all namespaces are upserted in a single statement."""
+    mock_execute_values = mocker.patch("pullsar.db.api_cache.execute_values")
+
+    api_cache.upsert_api_cache(
+        mocker.Mock(),
+        {
+            "image_translations": {"connect/image": "quay/image"},
+            "tag_digests": {"org/repo:v1": "sha256:abc"},
+        },
+    )
+
+    mock_execute_values.assert_called_once()
+    sql, rows = mock_execute_values.call_args.args[1:]
+    assert "INSERT INTO api_cache" in sql
+    assert [(namespace, key, json.adapted) for namespace, key, json in rows] == [
+        ("image_translations", "connect/image", "quay/image"),
+        ("tag_digests", "org/repo:v1", "sha256:abc"),
+    ]
+
+
+def test_upsert_api_cache_empty(mocker: MockerFixture) -> None:
+    """Tests that nothing is executed when there are no entries."""
+    mock_execute_values = mocker.patch("pullsar.db.api_cache.execute_values")
+
+    api_cache.upsert_api_cache(mocker.Mock(), {"tag_digests": {}})
+
+    mock_execute_values.assert_not_called()
+
+
+def test_delete_api_cache(mocker: MockerFixture) -> None:
+    """Tests that either expired or all cached API responses are deleted."""
+    mock_cur = mocker.Mock(rowcount=2)
+
+    assert api_cache.delete_api_cache(mock_cur, 30) == 2
+    sql, params = mock_cur.execute.call_args.args
+    assert "WHERE updated_at <=" in sql
+    assert params == (30,)
+
+    assert api_cache.delete_api_cache(mock_cur) == 2
+    assert mock_cur.execute.call_args.args == ("DELETE FROM api_cache;",)
@@ -0,0 +1,52 @@
+from pytest_mock import MockerFixture
+
+from pullsar.db import bundles
+from pullsar.operator_bundle_model import OperatorBundle
+
+
+def test_select_bundle_ids(mocker: MockerFixture) -> None:
+    """Tests that ids of all the images are selected by a single query."""
+    mock_cur = mocker.MagicMock()
+    mock_cur.__iter__.return_value = iter([("quay.io/org/repo:v1", 1)])
+
+    result = bundles.select_bundle_ids(
+        mock_cur, ["quay.io/org/repo:v1", "quay.io/org/repo:v2"]
+    )
+
+    assert result == {"quay.io/org/repo:v1": 1}
+    mock_cur.execute.assert_called_once()
+    assert mock_cur.execute.call_args.args[1] == (
+        ["quay.io/org/repo:v1", "quay.io/org/repo:v2"],
+    )
+
+
+def test_select_bundle_ids_no_images(mocker: MockerFixture) -> None:
+    """Tests that nothing is selected for no images."""
+    mock_cur = mocker.Mock()
+
+    assert bundles.select_bundle_ids(mock_cur, []) == {}
+    mock_cur.execute.assert_not_called()
+
+
+def test_insert_bundles(mocker: MockerFixture) -> None:
+    """Tests that bundles are inserted in bulk, returning their ids."""
+    mock_execute_values = mocker.patch(
+        "pullsar.db.bundles.execute_values",
+        return_value=[("quay.io/org/repo:v1", 7)],
+    )
+    mock_cur = mocker.Mock()
+
+    result = bundles.insert_bundles(
+        mock_cur, [OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")]
+    )
+
+    assert result == {"quay.io/org/repo:v1": 7}
+    sql, rows = mock_execute_values.call_args.args[1:]
+    assert "INSERT INTO bundles" in sql
+    assert "RETURNING image, id" in sql
+    assert rows == [("op.v1", "op", "quay.io/org/repo:v1")]
+    assert mock_execute_values.call_args.kwargs["fetch"] is True
+
+    mock_execute_values.reset_mock()
+    assert bundles.insert_bundles(mock_cur, []) == {}
+    mock_execute_values.assert_not_called()
@@ -0,0 +1,57 @@
+from pytest_mock import MockerFixture
+
+from pullsar.db import catalog_index
+from pullsar.parse_operators_catalog import BundleIndex
+
+BUNDLE_INDEX: BundleIndex = [
+    ("op.v1", "op", "quay.io/org/repo:v1"),
+    ("op.v2", "op", "registry.connect.redhat.com/org/repo@sha256:abc"),
+]
+
+
+def test_serialize_bundle_index() -> None:
+    """Tests that bundle index survives serialization in a compact form."""
+    data = catalog_index.serialize_bundle_index(BUNDLE_INDEX * 100)
+
+    assert catalog_index.deserialize_bundle_index(data) == BUNDLE_INDEX * 100
+    assert len(data) < len(repr(BUNDLE_INDEX * 100)) // 10
+
+
+def test_select_catalog_index(mocker: MockerFixture) -> None:
+    """Tests that the selected bundle index is deserialized and marked as used."""
+    mock_cur = mocker.Mock()
+    mock_cur.fetchone.return_value = (
+        memoryview(catalog_index.serialize_bundle_index(BUNDLE_INDEX)),
+    )
+
+    assert catalog_index.select_catalog_index(mock_cur, "sha256:abc") == BUNDLE_INDEX
+
+    sql, params = mock_cur.execute.call_args.args
+    assert "UPDATE catalog_index SET last_used_at" in sql
+    assert params == ("sha256:abc",)
+
+    mock_cur.fetchone.return_value = None
+    assert catalog_index.select_catalog_index(mock_cur, "sha256:def") is None
+
+
+def test_upsert_catalog_index(mocker: MockerFixture) -> None:
+    """Tests that the bundle index is upserted serialized."""
+    mock_cur = mocker.Mock()
+
+    catalog_index.upsert_catalog_index(mock_cur, "sha256:abc", BUNDLE_INDEX)
+
+    sql, (digest, data) = mock_cur.execute.call_args.args
+    assert "INSERT INTO catalog_index" in sql
+    assert digest == "sha256:abc"
+    assert catalog_index.deserialize_bundle_index(bytes(data.adapted)) == BUNDLE_INDEX
+
+
+def test_delete_catalog_index(mocker: MockerFixture) -> None:
+    """Tests that catalog indexes unused for 'ttl_days' days are deleted."""
+    mock_cur = mocker.Mock(rowcount=3)
+
+    assert catalog_index.delete_catalog_index(mock_cur, 30) == 3
+
+    sql, params = mock_cur.execute.call_args.args
+    assert "DELETE FROM catalog_index" in sql
+    assert params == (30,)
@@ -0,0 +1,46 @@
+from pytest_mock import MockerFixture
+
+from pullsar.catalog_delta import CatalogSnapshot
+from pullsar.db import catalog_snapshots
+
+SNAPSHOT: CatalogSnapshot = {
+    ("op.v1", "op", "quay.io/org/repo:v1"): "quay.io/org/repo@sha256:abc",
+    ("op.v2", "op", "registry.connect.redhat.com/org/repo:v2"): None,
+}
+
+
+def test_serialize_catalog_snapshot() -> None:
+    """Tests that catalog snapshot survives serialization."""
+    data = catalog_snapshots.serialize_catalog_snapshot(SNAPSHOT)
+
+    assert catalog_snapshots.deserialize_catalog_snapshot(data) == SNAPSHOT
+
+
+def test_select_catalog_snapshot(mocker: MockerFixture) -> None:
+    """Tests that the selected catalog snapshot is deserialized."""
+    mock_cur = mocker.Mock()
+    mock_cur.fetchone.return_value = (
+        memoryview(catalog_snapshots.serialize_catalog_snapshot(SNAPSHOT)),
+    )
+
+    assert catalog_snapshots.select_catalog_snapshot(mock_cur, "index:v4.18") == (
+        SNAPSHOT
+    )
+    assert mock_cur.execute.call_args.args[1] == ("index:v4.18",)
+
+    mock_cur.fetchone.return_value = None
+    assert catalog_snapshots.select_catalog_snapshot(mock_cur, "index:v4.19") is None
+
+
+def test_upsert_catalog_snapshot(mocker: MockerFixture) -> None:
+    """Tests that the catalog snapshot is upserted serialized."""
+    mock_cur = mocker.Mock()
+
+    catalog_snapshots.upsert_catalog_snapshot(mock_cur, "index:v4.18", SNAPSHOT)
+
+    sql, (catalog, data) = mock_cur.execute.call_args.args
+    assert "INSERT INTO catalog_snapshots" in sql
+    assert catalog == "index:v4.18"
+    assert (
+        catalog_snapshots.deserialize_catalog_snapshot(bytes(data.adapted)) == SNAPSHOT
+    )
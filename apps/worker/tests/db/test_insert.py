@@ -1,37 +1,151 @@
+from typing import Any, Dict, List
+
 from pytest_mock import MockerFixture
 from datetime import date
 
 from pullsar.db import insert
+from pullsar.global_index import GlobalBundleIndex
+from pullsar.operator_bundle_model import OperatorBundle
 from pullsar.parse_operators_catalog import RepositoryMap
 
 
+def mock_cursor(mocker: MockerFixture) -> Any:
+    """Creates a mock cursor with no stored, inserted or updated pull counts rows."""
+    mock_cur = mocker.Mock()
+    mock_cur.fetchone.return_value = (0,)
+    mock_cur.rowcount = 0
+    return mock_cur
+
+
+def copied_rows(mock_cur: Any) -> Dict[str, List[List[str]]]:
+    """Collects rows copied into each staging table, by the table name."""
+    rows = {}
+    for call in mock_cur.copy_expert.call_args_list:
+        table = call.args[0].split()[1]
+        rows[table] = [line.split("\t") for line in call.args[1].read().splitlines()]
+    return rows
+
+
+SAMPLE_BUNDLE_IDS = {
+    "quay.io/org/repo:v1": 1,
+    "quay.io/org/repo:v2": 2,
+    "quay.io/org/repo:v3": 3,
+}
+
+
 def test_insert_data_with_multiple_bundles(
-    mocker: MockerFixture, sample_repo_map: RepositoryMap
+    mocker: MockerFixture, sample_global_index: GlobalBundleIndex
 ) -> None:
     """
-    Tests that insert_data generates the correct SQL statements for multiple bundles.
+    Tests that appearances and pull counts are copied into staging tables
+    and merged into the schema with a constant number of statements.
     """
     mock_connect = mocker.patch("psycopg2.connect")
     mock_conn = mock_connect.return_value
     mock_cur = mock_conn.cursor.return_value
+    # 2 of 3 staged rows are already stored, 1 of them with a different count
+    mock_cur.fetchone.return_value = (2,)
+    mock_cur.rowcount = 2
+
+    summary = insert.insert_data(mock_cur, sample_global_index, SAMPLE_BUNDLE_IDS)
+
+    # staging tables are created, then merged
+    assert mock_cur.execute.call_count == 4
+    create, merge_appearances, count_stored, merge_pull_counts = [
+        call.args[0] for call in mock_cur.execute.call_args_list
+    ]
+    assert "CREATE TEMP TABLE staging_appearances" in create
+    assert "INSERT INTO bundle_appearances" in merge_appearances
+    assert "JOIN pull_counts" in count_stored
+    assert "INSERT INTO pull_counts" in merge_pull_counts
+    # rows with the same count are neither updated nor counted as such
+    assert "IS DISTINCT FROM" in merge_pull_counts
+    assert summary == insert.PullCountsSummary(inserted=1, updated=1, unchanged=1)
+
+    assert copied_rows(mock_cur) == {
+        "staging_appearances": [
+            ["1", "catalog-name", "v4.18"],
+            ["2", "catalog-name", "v4.18"],
+            ["3", "catalog-name", "v4.18"],
+        ],
+        "staging_pull_counts": [
+            ["1", "2025-07-20", "5"],
+            ["2", "2025-07-21", "10"],
+            ["3", "2025-07-21", "15"],
+        ],
+    }
+
+
+def test_insert_data_unchanged_bundles(
+    mocker: MockerFixture, sample_repo_map: RepositoryMap
+) -> None:
+    """
+    Tests that bundles unchanged since the previous run only have their
+    pull counts updated, unless they were just inserted.
+    """
+    global_index = GlobalBundleIndex()
+    global_index.add_catalog(
+        "catalog-name:v4.18",
+        sample_repo_map,
+        {"quay.io/org/repo:v1", "quay.io/org/repo:v2"},
+    )
+    mock_cur = mock_cursor(mocker)
+
+    insert.insert_data(
+        mock_cur, global_index, SAMPLE_BUNDLE_IDS, {"quay.io/org/repo:v2"}
+    )
+
+    rows = copied_rows(mock_cur)
+    assert rows["staging_appearances"] == [
+        ["2", "catalog-name", "v4.18"],
+        ["3", "catalog-name", "v4.18"],
+    ]
+    assert len(rows["staging_pull_counts"]) == 3
+
+
+def test_insert_data_bundle_in_multiple_catalogs(mocker: MockerFixture) -> None:
+    """
+    Tests that a bundle of multiple catalogs is staged once with all
+    its appearances, and bundles without an id are skipped.
+    """
+    bundle = OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")
+    bundle.pull_count[date(2025, 7, 20)] = 5
+    orphan = OperatorBundle("op.v2", "op", "quay.io/org/repo:v2")
+    orphan.pull_count[date(2025, 7, 20)] = 1
+    global_index = GlobalBundleIndex()
+    global_index.add_catalog("catalog-b:v4.18", {"org/repo": [bundle]})
+    global_index.add_catalog("catalog-a:v4.18", {"org/repo": [bundle]})
+    global_index.add_catalog("catalog-a:latest", {"org/repo": [orphan]})
+    mock_cur = mock_cursor(mocker)
+
+    insert.insert_data(mock_cur, global_index, {"quay.io/org/repo:v1": 1})
+
+    rows = copied_rows(mock_cur)
+    assert rows["staging_appearances"] == [
+        ["1", "catalog-a", "v4.18"],
+        ["1", "catalog-b", "v4.18"],
+    ]
+    assert rows["staging_pull_counts"] == [["1", "2025-07-20", "5"]]
+
 
-    mock_cur.fetchone.side_effect = [(1,), (2,), (3,)]
+def test_insert_data_escapes_copied_values(mocker: MockerFixture) -> None:
+    """Tests that special characters of the COPY text format are escaped."""
+    bundle = OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")
+    global_index = GlobalBundleIndex()
+    global_index.add_catalog("cata\\log:v4.18", {"org/repo": [bundle]})
+    mock_cur = mock_cursor(mocker)
 
-    insert.insert_data(mock_cur, sample_repo_map, "catalog-name", "v4.18")
+    insert.insert_data(mock_cur, global_index, {"quay.io/org/repo:v1": 1})
 
-    # 3 calls for each bundle: bundles, bundle_appearances, pull_counts
-    assert mock_cur.execute.call_count == 9
+    data = mock_cur.copy_expert.call_args_list[0].args[1].getvalue()
+    assert data == "1\tcata\\\\log\tv4.18\n"
 
-    all_params = [call.args[1] for call in mock_cur.execute.call_args_list]
 
-    assert ("op-a.v1", "op-a", "quay.io/org/repo:v1") in all_params
-    assert ("op-a.v2", "op-a", "quay.io/org/repo:v2") in all_params
-    assert ("op-a.v3", "op-a", "quay.io/org/repo:v3") in all_params
+def test_insert_data_nothing_to_insert(mocker: MockerFixture) -> None:
+    """Tests that no statements are executed for an empty index."""
+    mock_cur = mock_cursor(mocker)
 
-    assert (1, "catalog-name", "v4.18") in all_params
-    assert (2, "catalog-name", "v4.18") in all_params
-    assert (3, "catalog-name", "v4.18") in all_params
+    insert.insert_data(mock_cur, GlobalBundleIndex(), {})
 
-    assert (1, date(2025, 7, 20), 5) in all_params
-    assert (2, date(2025, 7, 21), 10) in all_params
-    assert (3, date(2025, 7, 21), 15) in all_params
+    mock_cur.execute.assert_not_called()
+    mock_cur.copy_expert.assert_not_called()
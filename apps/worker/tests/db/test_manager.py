@@ -1,8 +1,11 @@
 from pytest_mock import MockerFixture
+from datetime import date
 from pytest import LogCaptureFixture
 
 from pullsar.db.manager import DatabaseManager
-from pullsar.parse_operators_catalog import RepositoryMap
+from pullsar.db.insert import PullCountsSummary
+from pullsar.db.pull_count_partitions import add_months
+from pullsar.global_index import GlobalBundleIndex
 from pullsar.config import BaseConfig, DBConfig
 
 
@@ -14,9 +17,14 @@ def test_connect_success(mocker: MockerFixture) -> None:
     mock_connect = mocker.patch("psycopg2.connect")
     mock_conn = mock_connect.return_value
     mock_create_tables = mocker.patch("pullsar.db.manager.create_tables")
+    mocker.patch("pullsar.db.manager.is_pull_counts_partitioned", return_value=True)
+    mock_partitions = mocker.patch(
+        "pullsar.db.manager.create_pull_counts_partitions", return_value=[]
+    )
     mocker.patch.object(
         BaseConfig, "DB_CONFIG", DBConfig("db", "user", "pw", "host", 5432)
     )
+    mocker.patch.object(BaseConfig, "PULL_COUNTS_PARTITIONS_AHEAD", 3)
 
     manager = DatabaseManager()
     manager.connect()
@@ -30,56 +38,90 @@ def test_connect_success(mocker: MockerFixture) -> None:
         gssencmode="disable",
     )
     mock_create_tables.assert_called_once_with(mock_conn.cursor.return_value)
+    # partitions of pull counts are created from this month 3 months ahead
+    today = date.today()
+    mock_partitions.assert_called_once_with(
+        mock_conn.cursor.return_value, today, add_months(today, 3)
+    )
     mock_conn.commit.assert_called_once()
 
 
-def test_save_stats_success(
-    mocker: MockerFixture, sample_repo_map: RepositoryMap
+def test_connect_pull_counts_not_partitioned(
+    mocker: MockerFixture, caplog: LogCaptureFixture
 ) -> None:
     """
-    Tests the success path of the save method, where data is correctly inserted.
+    Tests that no partitions are created before 'pull_counts' is partitioned
+    by the migration.
     """
-    mocker.patch(
-        "pullsar.db.manager.extract_catalog_attributes",
-        return_value=("community", "4.18"),
-    )
-    mock_insert = mocker.patch("pullsar.db.manager.insert_data")
+    mocker.patch("psycopg2.connect")
+    mocker.patch("pullsar.db.manager.create_tables")
+    mocker.patch("pullsar.db.manager.is_pull_counts_partitioned", return_value=False)
+    mock_partitions = mocker.patch("pullsar.db.manager.create_pull_counts_partitions")
 
     manager = DatabaseManager()
-    manager.conn = mocker.Mock()
-    manager.cur = mocker.Mock()
+    manager.connect()
 
-    manager.save_operator_usage_stats(sample_repo_map, "community:4.18")
+    mock_partitions.assert_not_called()
+    assert "migration V6 is pending" in caplog.text
 
-    mock_insert.assert_called_once_with(
-        manager.cur, sample_repo_map, "community", "4.18"
-    )
-    manager.conn.commit.assert_called_once()
 
-
-def test_save_stats_parse_fail(
-    mocker: MockerFixture, caplog: LogCaptureFixture, sample_repo_map: RepositoryMap
+def test_save_stats_success(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    sample_global_index: GlobalBundleIndex,
 ) -> None:
     """
-    Tests that an error is logged and insert is not called if catalog parsing fails.
+    Tests the success path of the save method, where existing bundles
+    are looked up and only unknown bundles are inserted.
     """
+    mock_select = mocker.patch(
+        "pullsar.db.manager.select_bundle_ids",
+        return_value={"quay.io/org/repo:v1": 1},
+    )
     mocker.patch(
-        "pullsar.db.manager.extract_catalog_attributes", return_value=(None, None)
+        "pullsar.db.manager.insert_bundles",
+        side_effect=lambda cur, bundles: {
+            bundle.image: index for index, bundle in enumerate(bundles, 2)
+        },
+    )
+    mock_insert = mocker.patch(
+        "pullsar.db.manager.insert_data", return_value=PullCountsSummary(1, 2, 3)
+    )
+    mocker.patch("pullsar.db.manager.is_pull_counts_partitioned", return_value=True)
+    mock_partitions = mocker.patch(
+        "pullsar.db.manager.create_pull_counts_partitions",
+        return_value=["pull_counts_y2025m07"],
     )
-    mock_insert = mocker.patch("pullsar.db.manager.insert_data")
 
     manager = DatabaseManager()
     manager.conn = mocker.Mock()
     manager.cur = mocker.Mock()
 
-    manager.save_operator_usage_stats(sample_repo_map, "bad-image-format")
+    manager.save_operator_usage_stats(sample_global_index)
 
-    mock_insert.assert_not_called()
-    assert "Cannot save data" in caplog.text
+    assert "pull counts: 1 inserted, 2 updated, 3 unchanged" in caplog.text
+    # partitions are created from the first pull date being saved
+    assert mock_partitions.call_args.args[:2] == (manager.cur, date(2025, 7, 20))
+    assert "pull_counts_y2025m07" in caplog.text
+    mock_select.assert_called_once_with(
+        manager.cur,
+        ["quay.io/org/repo:v1", "quay.io/org/repo:v2", "quay.io/org/repo:v3"],
+    )
+    cur, bundle_index, bundle_ids, inserted_images = mock_insert.call_args.args
+    assert (cur, bundle_index) == (manager.cur, sample_global_index)
+    assert dict(bundle_ids) == {
+        "quay.io/org/repo:v1": 1,
+        "quay.io/org/repo:v2": 2,
+        "quay.io/org/repo:v3": 3,
+    }
+    assert set(inserted_images) == {"quay.io/org/repo:v2", "quay.io/org/repo:v3"}
+    manager.conn.commit.assert_called_once()
 
 
 def test_save_stats_not_connected(
-    mocker: MockerFixture, caplog: LogCaptureFixture, sample_repo_map: RepositoryMap
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    sample_global_index: GlobalBundleIndex,
 ) -> None:
     """
     Tests that an error is logged if save is called before connect.
@@ -87,7 +129,7 @@ def test_save_stats_not_connected(
     mock_insert = mocker.patch("pullsar.db.manager.insert_data")
     manager = DatabaseManager()
 
-    manager.save_operator_usage_stats(sample_repo_map, "image:tag")
+    manager.save_operator_usage_stats(sample_global_index)
 
     mock_insert.assert_not_called()
     assert "Database is not connected" in caplog.text
@@ -103,3 +145,152 @@ def test_close_connection(mocker: MockerFixture) -> None:
 
     manager.cur.close.assert_called_once()
     manager.conn.close.assert_called_once()
+
+
+def test_log_watermarks(mocker: MockerFixture) -> None:
+    """Tests that log watermarks are loaded and saved with a commit."""
+    watermarks = {"org/repo": date(2025, 7, 21)}
+    mock_select = mocker.patch(
+        "pullsar.db.manager.select_log_watermarks", return_value=watermarks
+    )
+    mock_upsert = mocker.patch("pullsar.db.manager.upsert_log_watermarks")
+
+    manager = DatabaseManager()
+    manager.conn = mocker.Mock()
+    manager.cur = mocker.Mock()
+
+    assert manager.get_log_watermarks() == watermarks
+    mock_select.assert_called_once_with(manager.cur)
+
+    manager.save_log_watermarks(watermarks)
+    mock_upsert.assert_called_once_with(manager.cur, watermarks)
+    manager.conn.commit.assert_called_once()
+
+
+def test_log_watermarks_not_connected(
+    mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """Tests that an error is logged if watermarks are accessed before connect."""
+    mock_upsert = mocker.patch("pullsar.db.manager.upsert_log_watermarks")
+    manager = DatabaseManager()
+
+    assert manager.get_log_watermarks() == {}
+    manager.save_log_watermarks({"org/repo": date(2025, 7, 21)})
+
+    mock_upsert.assert_not_called()
+    assert "Cannot load log watermarks" in caplog.text
+    assert "Cannot save log watermarks" in caplog.text
+
+
+def test_api_cache(mocker: MockerFixture) -> None:
+    """Tests that expired responses are dropped before the cache is loaded."""
+    entries = {"tag_digests": {"org/repo:v1": "sha256:abc"}}
+    mocker.patch.object(BaseConfig, "API_CACHE_TTL_DAYS", 14)
+    mock_delete = mocker.patch("pullsar.db.manager.delete_api_cache", return_value=1)
+    mock_select = mocker.patch(
+        "pullsar.db.manager.select_api_cache", return_value=entries
+    )
+    mock_upsert = mocker.patch("pullsar.db.manager.upsert_api_cache")
+
+    manager = DatabaseManager()
+    manager.conn = mocker.Mock()
+    manager.cur = mocker.Mock()
+
+    assert manager.get_api_cache() == entries
+    mock_delete.assert_called_once_with(manager.cur, 14)
+    mock_select.assert_called_once_with(manager.cur, 14)
+
+    manager.save_api_cache(entries)
+    mock_upsert.assert_called_once_with(manager.cur, entries)
+
+    manager.clear_api_cache()
+    mock_delete.assert_called_with(manager.cur)
+    assert manager.conn.commit.call_count == 3
+
+
+def test_api_cache_not_connected(
+    mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """Tests that an error is logged if the API cache is accessed before connect."""
+    mock_delete = mocker.patch("pullsar.db.manager.delete_api_cache")
+    manager = DatabaseManager()
+
+    assert manager.get_api_cache() == {}
+    manager.save_api_cache({})
+    manager.clear_api_cache()
+
+    mock_delete.assert_not_called()
+    assert "Cannot load API cache" in caplog.text
+    assert "Cannot save API cache" in caplog.text
+    assert "Cannot clear API cache" in caplog.text
+
+
+def test_catalog_index(mocker: MockerFixture) -> None:
+    """Tests that unused catalogs are dropped when a catalog index is saved."""
+    bundle_index = [("op.v1", "op", "quay.io/org/repo:v1")]
+    mocker.patch.object(BaseConfig, "CATALOG_CACHE_TTL_DAYS", 14)
+    mock_select = mocker.patch(
+        "pullsar.db.manager.select_catalog_index", return_value=bundle_index
+    )
+    mock_delete = mocker.patch(
+        "pullsar.db.manager.delete_catalog_index", return_value=2
+    )
+    mock_upsert = mocker.patch("pullsar.db.manager.upsert_catalog_index")
+
+    manager = DatabaseManager()
+    manager.conn = mocker.Mock()
+    manager.cur = mocker.Mock()
+
+    assert manager.get_catalog_index("sha256:abc") == bundle_index
+    mock_select.assert_called_once_with(manager.cur, "sha256:abc")
+
+    manager.save_catalog_index("sha256:def", bundle_index)
+    mock_delete.assert_called_once_with(manager.cur, 14)
+    mock_upsert.assert_called_once_with(manager.cur, "sha256:def", bundle_index)
+    assert manager.conn.commit.call_count == 2
+
+
+def test_catalog_index_not_connected(
+    mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """Tests that an error is logged if the catalog index is accessed before connect."""
+    mock_upsert = mocker.patch("pullsar.db.manager.upsert_catalog_index")
+    manager = DatabaseManager()
+
+    assert manager.get_catalog_index("sha256:abc") is None
+    manager.save_catalog_index("sha256:abc", [])
+
+    mock_upsert.assert_not_called()
+    assert "Cannot load catalog index" in caplog.text
+    assert "Cannot save catalog index" in caplog.text
+
+
+def test_catalog_snapshot(mocker: MockerFixture) -> None:
+    """Tests that catalog snapshots are loaded and saved by catalog image."""
+    snapshot = {("op.v1", "op", "quay.io/org/repo:v1"): "quay.io/org/repo@sha256:a"}
+    mock_select = mocker.patch(
+        "pullsar.db.manager.select_catalog_snapshot", return_value=snapshot
+    )
+    mock_upsert = mocker.patch("pullsar.db.manager.upsert_catalog_snapshot")
+
+    manager = DatabaseManager()
+    manager.conn = mocker.Mock()
+    manager.cur = mocker.Mock()
+
+    assert manager.get_catalog_snapshot("community:4.18") == snapshot
+    mock_select.assert_called_once_with(manager.cur, "community:4.18")
+
+    manager.save_catalog_snapshot("community:4.18", snapshot)
+    mock_upsert.assert_called_once_with(manager.cur, "community:4.18", snapshot)
+    manager.conn.commit.assert_called_once()
+
+
+def test_catalog_snapshot_not_connected(caplog: LogCaptureFixture) -> None:
+    """Tests that an error is logged if snapshots are accessed before connect."""
+    manager = DatabaseManager()
+
+    assert manager.get_catalog_snapshot("community:4.18") is None
+    manager.save_catalog_snapshot("community:4.18", {})
+
+    assert "Cannot load catalog snapshot" in caplog.text
+    assert "Cannot save catalog snapshot" in caplog.text
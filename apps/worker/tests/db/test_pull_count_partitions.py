@@ -0,0 +1,56 @@
+from pytest_mock import MockerFixture
+from datetime import date
+
+from pullsar.db import pull_count_partitions
+
+
+def test_add_months() -> None:
+    """Tests that months are added across years from the first day of the month."""
+    assert pull_count_partitions.add_months(date(2025, 7, 20), 1) == date(2025, 8, 1)
+    assert pull_count_partitions.add_months(date(2025, 11, 30), 3) == date(2026, 2, 1)
+    assert pull_count_partitions.add_months(date(2025, 1, 31), -1) == date(2024, 12, 1)
+
+
+def test_is_pull_counts_partitioned(mocker: MockerFixture) -> None:
+    """Tests that only a partitioned table ('p' relkind) is recognized."""
+    mock_cur = mocker.Mock()
+
+    mock_cur.fetchone.return_value = ("p",)
+    assert pull_count_partitions.is_pull_counts_partitioned(mock_cur)
+    mock_cur.fetchone.return_value = ("r",)
+    assert not pull_count_partitions.is_pull_counts_partitioned(mock_cur)
+    mock_cur.fetchone.return_value = None
+    assert not pull_count_partitions.is_pull_counts_partitioned(mock_cur)
+
+
+def test_create_pull_counts_partitions(mocker: MockerFixture) -> None:
+    """
+    Tests that a partition is created for each month of the range,
+    except the already existing ones.
+    """
+    mock_cur = mocker.MagicMock()
+    mock_cur.__iter__.return_value = iter([("pull_counts_y2025m12",)])
+
+    created = pull_count_partitions.create_pull_counts_partitions(
+        mock_cur, date(2025, 11, 20), date(2026, 1, 1)
+    )
+
+    assert created == ["pull_counts_y2025m11", "pull_counts_y2026m01"]
+    select, *creates = mock_cur.execute.call_args_list
+    assert "FROM pg_inherits" in select.args[0]
+    assert "pull_counts_y2025m11 PARTITION OF pull_counts" in creates[0].args[0]
+    assert creates[0].args[1] == (date(2025, 11, 1), date(2025, 12, 1))
+    assert creates[1].args[1] == (date(2026, 1, 1), date(2026, 2, 1))
+
+
+def test_create_pull_counts_partitions_all_existing(mocker: MockerFixture) -> None:
+    """Tests that nothing is created when all the partitions exist."""
+    mock_cur = mocker.MagicMock()
+    mock_cur.__iter__.return_value = iter([("pull_counts_y2025m07",)])
+
+    created = pull_count_partitions.create_pull_counts_partitions(
+        mock_cur, date(2025, 7, 20), date(2025, 7, 21)
+    )
+
+    assert created == []
+    assert mock_cur.execute.call_count == 1
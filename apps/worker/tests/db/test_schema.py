@@ -11,8 +11,13 @@ def test_create_tables(mocker: MockerFixture) -> None:
 
     schema.create_tables(mock_cur)
 
-    assert mock_cur.execute.call_count == 3
+    assert mock_cur.execute.call_count == 7
     sql_calls = "".join(call.args[0] for call in mock_cur.execute.call_args_list)
     assert "CREATE TABLE IF NOT EXISTS bundles" in sql_calls
     assert "CREATE TABLE IF NOT EXISTS bundle_appearances" in sql_calls
     assert "CREATE TABLE IF NOT EXISTS pull_counts" in sql_calls
+    assert "PARTITION BY RANGE (pull_date)" in sql_calls
+    assert "CREATE TABLE IF NOT EXISTS log_watermarks" in sql_calls
+    assert "CREATE TABLE IF NOT EXISTS api_cache" in sql_calls
+    assert "CREATE TABLE IF NOT EXISTS catalog_index" in sql_calls
+    assert "CREATE TABLE IF NOT EXISTS catalog_snapshots" in sql_calls
@@ -0,0 +1,48 @@
+from pytest_mock import MockerFixture
+from datetime import date
+
+from pullsar.db import watermarks
+
+
+def test_select_log_watermarks(mocker: MockerFixture) -> None:
+    """Tests that watermarks are loaded into a dictionary by repository path."""
+    mock_cur = mocker.MagicMock()
+    mock_cur.__iter__.return_value = iter(
+        [("org/repo-a", date(2025, 7, 20)), ("org/repo-b", date(2025, 7, 21))]
+    )
+
+    result = watermarks.select_log_watermarks(mock_cur)
+
+    assert result == {
+        "org/repo-a": date(2025, 7, 20),
+        "org/repo-b": date(2025, 7, 21),
+    }
+    assert "FROM log_watermarks" in mock_cur.execute.call_args.args[0]
+
+
+def test_upsert_log_watermarks(mocker: MockerFixture) -> None:
+    """Tests that all watermarks are upserted in a single statement."""
+    mock_execute_values = mocker.patch("pullsar.db.watermarks.execute_values")
+    mock_cur = mocker.Mock()
+
+    watermarks.upsert_log_watermarks(
+        mock_cur, {"org/repo-a": date(2025, 7, 20), "org/repo-b": date(2025, 7, 21)}
+    )
+
+    mock_execute_values.assert_called_once()
+    sql, rows = mock_execute_values.call_args.args[1:]
+    assert "INSERT INTO log_watermarks" in sql
+    assert "GREATEST" in sql
+    assert rows == [
+        ("org/repo-a", date(2025, 7, 20)),
+        ("org/repo-b", date(2025, 7, 21)),
+    ]
+
+
+def test_upsert_log_watermarks_empty(mocker: MockerFixture) -> None:
+    """Tests that nothing is executed when there are no watermarks."""
+    mock_execute_values = mocker.patch("pullsar.db.watermarks.execute_values")
+
+    watermarks.upsert_log_watermarks(mocker.Mock(), {})
+
+    mock_execute_values.assert_not_called()
@@ -0,0 +1,132 @@
+import base64
+import json
+from pathlib import Path
+from typing import Any
+
+import requests
+from pytest import LogCaptureFixture
+from pytest_mock import MockerFixture
+
+from pullsar.catalog_cache import (
+    CatalogCache,
+    RegistryDigestResolver,
+    parse_image_reference,
+)
+
+
+def mock_response(mocker: MockerFixture, status_code: int, **kwargs: Any) -> Any:
+    """Creates a mock registry response with the given status code and attributes."""
+    response = mocker.Mock(status_code=status_code, **kwargs)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status_code} Error"
+        )
+    return response
+
+
+def test_parse_image_reference() -> None:
+    """Tests that image pullspecs are split into registry, repository and reference."""
+    assert parse_image_reference("registry.io/redhat/index:v4.18") == (
+        "registry.io",
+        "redhat/index",
+        "v4.18",
+    )
+    assert parse_image_reference("registry.io:5000/index@sha256:abc") == (
+        "registry.io:5000",
+        "index",
+        "sha256:abc",
+    )
+    assert parse_image_reference("registry.io/redhat/index") == (
+        "registry.io",
+        "redhat/index",
+        "latest",
+    )
+
+
+def test_registry_digest_resolver_anonymous(mocker: MockerFixture) -> None:
+    """Tests that digest is taken from the manifest response headers."""
+    resolver = RegistryDigestResolver(auth_file=None)
+    mock_head = mocker.patch.object(
+        resolver.session,
+        "head",
+        return_value=mock_response(
+            mocker, 200, headers={"Docker-Content-Digest": "sha256:abc"}
+        ),
+    )
+
+    assert resolver("registry.io/redhat/index:v4.18") == "sha256:abc"
+    assert mock_head.call_args.args[0] == (
+        "https://registry.io/v2/redhat/index/manifests/v4.18"
+    )
+    assert "manifest.list" in mock_head.call_args.kwargs["headers"]["Accept"]
+
+
+def test_registry_digest_resolver_digest_pullspec(mocker: MockerFixture) -> None:
+    """Tests that no request is made for pullspec with a digest."""
+    resolver = RegistryDigestResolver(auth_file=None)
+    mock_head = mocker.patch.object(resolver.session, "head")
+
+    assert resolver("registry.io/index@sha256:abc") == "sha256:abc"
+    mock_head.assert_not_called()
+
+
+def test_registry_digest_resolver_token(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Tests that bearer token is requested with credentials of the auth file."""
+    auth_file = tmp_path / "auth.json"
+    auth = base64.b64encode(b"user:secret").decode()
+    auth_file.write_text(json.dumps({"auths": {"registry.io": {"auth": auth}}}))
+    resolver = RegistryDigestResolver(auth_file=str(auth_file))
+    challenge = (
+        'Bearer realm="https://auth.registry.io/token",'
+        'service="registry.io",scope="repository:redhat/index:pull"'
+    )
+    mock_head = mocker.patch.object(
+        resolver.session,
+        "head",
+        side_effect=[
+            mock_response(mocker, 401, headers={"WWW-Authenticate": challenge}),
+            mock_response(mocker, 200, headers={"Docker-Content-Digest": "sha256:abc"}),
+        ],
+    )
+    mock_get = mocker.patch.object(
+        resolver.session,
+        "get",
+        return_value=mock_response(mocker, 200, json=lambda: {"token": "t0k3n"}),
+    )
+
+    assert resolver("registry.io/redhat/index:v4.18") == "sha256:abc"
+    mock_get.assert_called_once_with(
+        "https://auth.registry.io/token",
+        params={"service": "registry.io", "scope": "repository:redhat/index:pull"},
+        auth=("user", "secret"),
+        timeout=resolver.timeout,
+    )
+    assert mock_head.call_args.kwargs["headers"]["Authorization"] == "Bearer t0k3n"
+
+
+def test_registry_digest_resolver_failure(
+    mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """Tests that a failed request is logged and resolves to None."""
+    resolver = RegistryDigestResolver(auth_file=None)
+    mocker.patch.object(
+        resolver.session, "head", return_value=mock_response(mocker, 404, headers={})
+    )
+
+    assert resolver("registry.io/redhat/index:v4.18") is None
+    assert "Could not resolve digest of catalog image" in caplog.text
+
+
+def test_catalog_cache(mocker: MockerFixture, caplog: LogCaptureFixture) -> None:
+    """Tests that the cache delegates to its store and digest resolver."""
+    mock_store = mocker.Mock()
+    mock_store.get_catalog_index.side_effect = [[("op.v1", "op", "image")], None]
+    catalog_cache = CatalogCache(mock_store, digest_resolver=lambda image: "sha256:a")
+
+    assert catalog_cache.resolve_digest("index:v1") == "sha256:a"
+    assert catalog_cache.get("index:v1", "sha256:a") == [("op.v1", "op", "image")]
+    assert "Catalog index:v1 is unchanged" in caplog.text
+    assert catalog_cache.get("index:v2", "sha256:b") is None
+
+    catalog_cache.put("sha256:b", [])
+    mock_store.save_catalog_index.assert_called_once_with("sha256:b", [])
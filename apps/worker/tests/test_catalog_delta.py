@@ -0,0 +1,68 @@
+from pullsar.catalog_delta import diff_catalog, take_catalog_snapshot
+from pullsar.operator_bundle_model import OperatorBundle
+from pullsar.parse_operators_catalog import BundleIndex
+
+BUNDLE_V1 = ("op.v1", "op", "quay.io/org/repo:v1")
+BUNDLE_V2 = ("op.v2", "op", "registry.connect.redhat.com/org/repo:v2")
+BUNDLE_V3 = ("op.v3", "op", "quay.io/org/repo:v3")
+BUNDLE_V4 = ("op.v4", "op", "quay.io/org/repo:v4")
+
+
+def test_diff_catalog_without_snapshot() -> None:
+    """Tests that all bundles are added if the catalog was not processed before."""
+    delta = diff_catalog([BUNDLE_V1, BUNDLE_V2], None)
+
+    assert delta.added == [BUNDLE_V1, BUNDLE_V2]
+    assert delta.removed == []
+    assert delta.unchanged == []
+    assert delta.apply([BUNDLE_V1, BUNDLE_V2]) == [BUNDLE_V1, BUNDLE_V2]
+    assert delta.unchanged_images == set()
+
+
+def test_diff_catalog() -> None:
+    """
+    Tests that unchanged bundles get their resolved images,
+    unless these were not resolved by the previous run.
+    """
+    snapshot = {
+        BUNDLE_V1: "quay.io/org/repo@sha256:a",
+        BUNDLE_V2: "quay.io/org/repo@sha256:b",
+        BUNDLE_V3: None,
+        ("op.v0", "op", "quay.io/org/repo:v0"): "quay.io/org/repo@sha256:0",
+    }
+    bundle_index: BundleIndex = [BUNDLE_V1, BUNDLE_V2, BUNDLE_V3, BUNDLE_V4]
+
+    delta = diff_catalog(bundle_index, snapshot)
+
+    assert delta.added == [BUNDLE_V4]
+    assert delta.removed == [("op.v0", "op", "quay.io/org/repo:v0")]
+    assert delta.unchanged == [BUNDLE_V1, BUNDLE_V2, BUNDLE_V3]
+    assert delta.apply(bundle_index) == [
+        ("op.v1", "op", "quay.io/org/repo@sha256:a"),
+        ("op.v2", "op", "quay.io/org/repo@sha256:b"),
+        BUNDLE_V3,
+        BUNDLE_V4,
+    ]
+    assert delta.unchanged_images == {
+        "quay.io/org/repo@sha256:a",
+        "quay.io/org/repo@sha256:b",
+    }
+
+
+def test_take_catalog_snapshot() -> None:
+    """Tests that bundles are recorded with images resolved to digests."""
+    resolved_v1 = OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")
+    resolved_v1.update_image_digest("sha256:a")
+    translated_v2 = OperatorBundle("op.v2", "op", "quay.io/org/repo@sha256:b")
+    unresolved_v3 = OperatorBundle("op.v3", "op", "quay.io/org/repo:v3")
+
+    snapshot = take_catalog_snapshot(
+        [BUNDLE_V1, BUNDLE_V2, BUNDLE_V3],
+        {"org/repo": [resolved_v1, translated_v2, unresolved_v3]},
+    )
+
+    assert snapshot == {
+        BUNDLE_V1: "quay.io/org/repo@sha256:a",
+        BUNDLE_V2: "quay.io/org/repo@sha256:b",
+        BUNDLE_V3: None,
+    }
@@ -0,0 +1,218 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pytest_mock import MockerFixture
+
+from pullsar import catalog_renderer
+from pullsar.catalog_cache import CatalogCache
+from pullsar.catalog_renderer import (
+    available_memory,
+    catalog_render_workers,
+    iter_loaded_catalogs,
+    load_catalog,
+)
+from pullsar.config import BaseConfig
+from pullsar.parse_operators_catalog import BundleIndex
+
+
+def write_catalog(path: Path, bundle_names: List[str]) -> str:
+    """Writes rendered JSON catalog with bundles of the given names into 'path'."""
+    path.write_text(
+        "\n".join(
+            json.dumps(
+                {
+                    "schema": "olm.bundle",
+                    "name": name,
+                    "package": "op",
+                    "image": f"quay.io/org/repo:{name}",
+                }
+            )
+            for name in bundle_names
+        )
+    )
+    return str(path)
+
+
+class DictCatalogIndexStore:
+    """Catalog index store keeping the indexes in a dictionary."""
+
+    def __init__(self) -> None:
+        self.indexes: Dict[str, BundleIndex] = {}
+
+    def get_catalog_index(self, digest: str) -> Optional[BundleIndex]:
+        return self.indexes.get(digest)
+
+    def save_catalog_index(self, digest: str, bundle_index: BundleIndex) -> None:
+        self.indexes[digest] = bundle_index
+
+
+def test_load_catalog_json_file(mocker: MockerFixture) -> None:
+    """Tests that a pre-rendered catalog file is parsed instead of rendering the image."""
+    mock_render = mocker.patch("pullsar.catalog_renderer.render_operator_catalog")
+    mock_load_index = mocker.patch(
+        "pullsar.catalog_renderer.load_catalog_bundle_index", return_value=[]
+    )
+
+    assert load_catalog("my-image:v4.18", "catalog.json") == []
+
+    mock_render.assert_not_called()
+    mock_load_index.assert_called_once_with("catalog.json")
+
+
+def test_load_catalog_render_artifact(mocker: MockerFixture, tmp_path: Path) -> None:
+    """
+    Tests that the rendered catalog is saved as an artifact
+    if the artifacts directory is configured.
+    """
+    artifacts_dir = tmp_path / "artifacts"
+    mocker.patch.object(BaseConfig, "CATALOG_ARTIFACTS_DIR", str(artifacts_dir))
+    mock_render = mocker.patch(
+        "pullsar.catalog_renderer.render_operator_catalog", return_value=None
+    )
+
+    assert load_catalog("registry.io/redhat/my-index:v4.18", None) is None
+
+    assert artifacts_dir.is_dir()
+    mock_render.assert_called_once_with(
+        "registry.io/redhat/my-index:v4.18",
+        str(artifacts_dir / "my-index-v4.18.json.gz"),
+    )
+
+
+def test_load_catalog_render_by_digest(mocker: MockerFixture) -> None:
+    """
+    Tests that the catalog image is rendered by its digest if it is known,
+    and that no artifact is saved if the artifacts directory is not configured.
+    """
+    mocker.patch.object(BaseConfig, "CATALOG_ARTIFACTS_DIR", None)
+    mock_render = mocker.patch("pullsar.catalog_renderer.render_operator_catalog")
+
+    load_catalog("registry.io/redhat/my-index:v4.18", None, "sha256:abc")
+
+    mock_render.assert_called_once_with("registry.io/redhat/my-index@sha256:abc", None)
+
+
+def test_available_memory(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Tests that available memory is limited by the cgroup memory limit."""
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal: 8000000 kB\nMemAvailable: 4000000 kB\n")
+    memory_max = tmp_path / "memory.max"
+    memory_current = tmp_path / "memory.current"
+    mocker.patch.object(catalog_renderer, "_MEMINFO_FILE", str(meminfo))
+    mocker.patch.object(catalog_renderer, "_CGROUP_MEMORY_MAX_FILE", str(memory_max))
+    mocker.patch.object(
+        catalog_renderer, "_CGROUP_MEMORY_CURRENT_FILE", str(memory_current)
+    )
+
+    # no cgroup
+    assert available_memory() == 4000000 * 1024
+
+    memory_max.write_text("max\n")
+    memory_current.write_text("1000\n")
+    assert available_memory() == 4000000 * 1024
+
+    memory_max.write_text("3000\n")
+    assert available_memory() == 2000
+
+    meminfo.unlink()
+    assert available_memory() == 2000
+
+    memory_max.unlink()
+    assert available_memory() is None
+
+
+def test_catalog_render_workers(mocker: MockerFixture) -> None:
+    """Tests that concurrent renders are limited by available memory."""
+    mib = 1024 * 1024
+    mock_memory = mocker.patch(
+        "pullsar.catalog_renderer.available_memory", return_value=3000 * mib
+    )
+
+    assert catalog_render_workers(4, 1000) == 3
+    assert catalog_render_workers(2, 1000) == 2
+    assert catalog_render_workers(4, 5000) == 1
+    assert catalog_render_workers(0, 1000) == 1
+    assert catalog_render_workers(4, 0) == 4
+
+    mock_memory.return_value = None
+    assert catalog_render_workers(4, 1000) == 4
+
+
+def test_iter_loaded_catalogs_serial(mocker: MockerFixture) -> None:
+    """Tests that with a single worker catalogs are loaded one by one in order."""
+    mock_load = mocker.patch(
+        "pullsar.catalog_renderer.load_catalog",
+        side_effect=lambda image, json_file, digest: (
+            None if json_file is None else [(image, "op", "quay.io/org/repo:v1")]
+        ),
+    )
+    catalogs = [("a:v1", "a.json"), ("b:v1", None)]
+
+    loaded = list(iter_loaded_catalogs(catalogs, max_workers=1))
+
+    assert loaded == [
+        (catalogs[0], [("a:v1", "op", "quay.io/org/repo:v1")]),
+        (catalogs[1], None),
+    ]
+    assert mock_load.call_count == 2
+
+
+def test_iter_loaded_catalogs_concurrent(tmp_path: Path) -> None:
+    """
+    Tests that catalogs loaded in a process pool are yielded in the input order,
+    with their bundles intact.
+    """
+    catalogs = [
+        (f"image:v{index}", write_catalog(tmp_path / f"{index}.json", names))
+        for index, names in enumerate((["op.v1", "op.v2"], ["op.v3"], [], ["op.v4"]), 1)
+    ]
+
+    loaded = list(iter_loaded_catalogs(catalogs, max_workers=2))
+
+    assert [catalog for catalog, _ in loaded] == catalogs
+    assert [
+        [name for name, _, _ in bundle_index or []] for _, bundle_index in loaded
+    ] == [["op.v1", "op.v2"], ["op.v3"], [], ["op.v4"]]
+    assert loaded[0][1] == [
+        ("op.v1", "op", "quay.io/org/repo:op.v1"),
+        ("op.v2", "op", "quay.io/org/repo:op.v2"),
+    ]
+
+
+def test_iter_loaded_catalogs_cached(mocker: MockerFixture) -> None:
+    """
+    Tests that catalog images with cached digests are not rendered, the rendered
+    ones are cached, and catalogs with pre-rendered files bypass the cache.
+    """
+    store = DictCatalogIndexStore()
+    cached_index: BundleIndex = [("op.v1", "op", "quay.io/org/repo:v1")]
+    store.indexes["sha256:old"] = cached_index
+    digests = {"index:v1": "sha256:old", "index:v2": "sha256:new", "index:v3": None}
+    catalog_cache = CatalogCache(store, digest_resolver=digests.get)
+    rendered_index: BundleIndex = [("op.v2", "op", "quay.io/org/repo:v2")]
+    mock_load = mocker.patch(
+        "pullsar.catalog_renderer.load_catalog", return_value=rendered_index
+    )
+    catalogs = [
+        ("index:v1", None),
+        ("index:v2", None),
+        ("index:v3", None),
+        ("index:v4", "rendered.json"),
+    ]
+
+    loaded = list(iter_loaded_catalogs(catalogs, 1, catalog_cache))
+
+    assert loaded == [
+        (catalogs[0], cached_index),
+        (catalogs[1], rendered_index),
+        (catalogs[2], rendered_index),
+        (catalogs[3], rendered_index),
+    ]
+    assert mock_load.call_args_list == [
+        mocker.call("index:v2", None, "sha256:new"),
+        mocker.call("index:v3", None, None),
+        mocker.call("index:v4", "rendered.json", None),
+    ]
+    # unresolved digest can not be cached
+    assert store.indexes == {"sha256:old": cached_index, "sha256:new": rendered_index}
@@ -35,6 +35,7 @@ from pullsar.config import BaseConfig
                 "--log-days",
                 "30",
                 "--dry-run",
+                "--refresh-watermarks",
             ],
             ParsedArgs(
                 True,
@@ -45,6 +46,7 @@ from pullsar.config import BaseConfig
                     ParsedCatalogArg("image:2", "rendered.json"),
                     ParsedCatalogArg("image:3", None),
                 ],
+                refresh_watermarks=True,
             ),
         ),
     ],
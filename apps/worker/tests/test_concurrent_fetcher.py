@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from pullsar.concurrent_fetcher import ConcurrentFetcher
+
+
+class ConcurrencyTracker:
+    """Records the highest number of concurrently running tasks, overall and per group."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.running: Dict[str, int] = {}
+        self.max_running: Dict[str, int] = {}
+        self.total = 0
+        self.max_total = 0
+
+    def task(self, group: str, result: int) -> Callable[[], int]:
+        def func() -> int:
+            with self._lock:
+                self.running[group] = self.running.get(group, 0) + 1
+                self.total += 1
+                self.max_running[group] = max(
+                    self.max_running.get(group, 0), self.running[group]
+                )
+                self.max_total = max(self.max_total, self.total)
+            time.sleep(0.01)
+            with self._lock:
+                self.running[group] -= 1
+                self.total -= 1
+            return result
+
+        return func
+
+
+def test_run_returns_results_in_task_order() -> None:
+    """Tests that results are keyed and ordered by the given tasks."""
+    fetcher = ConcurrentFetcher(max_workers=4, max_workers_per_group=2)
+
+    def slow(value: int, delay: float) -> Callable[[], int]:
+        def func() -> int:
+            time.sleep(delay)
+            return value
+
+        return func
+
+    results = fetcher.run(
+        [
+            ("org-a/first", "org-a", slow(1, 0.03)),
+            ("org-b/second", "org-b", slow(2, 0.0)),
+            ("org-a/third", "org-a", slow(3, 0.01)),
+        ]
+    )
+
+    assert list(results.items()) == [
+        ("org-a/first", 1),
+        ("org-b/second", 2),
+        ("org-a/third", 3),
+    ]
+
+
+def test_run_respects_concurrency_limits() -> None:
+    """Tests that neither the global nor the per-group limit is exceeded."""
+    tracker = ConcurrencyTracker()
+    fetcher = ConcurrentFetcher(max_workers=3, max_workers_per_group=2)
+    tasks: List[Tuple[str, str, Callable[[], int]]] = [
+        (f"{group}/repo-{i}", group, tracker.task(group, i))
+        for group in ("org-a", "org-b", "org-c")
+        for i in range(5)
+    ]
+
+    results = fetcher.run(tasks)
+
+    assert len(results) == 15
+    assert tracker.max_total <= 3
+    assert all(count <= 2 for count in tracker.max_running.values())
+
+
+def test_run_no_tasks() -> None:
+    """Tests that running no tasks returns no results."""
+    fetcher = ConcurrentFetcher(max_workers=2, max_workers_per_group=1)
+    assert fetcher.run([]) == {}
@@ -0,0 +1,66 @@
+from pytest import LogCaptureFixture
+
+from pullsar.global_index import GlobalBundleIndex
+from pullsar.operator_bundle_model import OperatorBundle
+
+
+def test_add_catalog_merges_bundles() -> None:
+    """
+    Tests that bundles with the same image in multiple catalogs
+    are indexed once, with appearances of all the catalogs.
+    """
+    shared = OperatorBundle("op.v1", "op", "quay.io/org/repo@sha256:a")
+    duplicate = OperatorBundle("op.v1", "op", "quay.io/org/repo@sha256:a")
+    other = OperatorBundle("other.v1", "other", "quay.io/org/other:v1")
+    global_index = GlobalBundleIndex()
+
+    global_index.add_catalog("index:v4.17", {"org/repo": [shared]})
+    global_index.add_catalog(
+        "index:v4.18", {"org/repo": [duplicate], "org/other": [other]}
+    )
+
+    assert len(global_index) == 2
+    assert global_index.catalog_count == 2
+    assert list(global_index) == [shared, other]
+    assert global_index.repository_paths == {
+        "org/repo": [shared],
+        "org/other": [other],
+    }
+    assert global_index.appearances(shared) == {
+        ("index", "v4.17"),
+        ("index", "v4.18"),
+    }
+    assert global_index.appearances(duplicate) == global_index.appearances(shared)
+    assert global_index.appearances(other) == {("index", "v4.18")}
+
+
+def test_add_catalog_unchanged_images() -> None:
+    """
+    Tests that a bundle is unchanged only if it is unchanged in all its catalogs.
+    """
+    bundle = OperatorBundle("op.v1", "op", "quay.io/org/repo@sha256:a")
+    other = OperatorBundle("op.v2", "op", "quay.io/org/repo@sha256:b")
+    global_index = GlobalBundleIndex()
+
+    global_index.add_catalog(
+        "index:v4.17", {"org/repo": [bundle, other]}, {bundle.image, other.image}
+    )
+    global_index.add_catalog("index:v4.18", {"org/repo": [bundle]})
+
+    assert not global_index.is_unchanged(bundle)
+    assert global_index.is_unchanged(other)
+
+
+def test_add_catalog_unsupported_format(caplog: LogCaptureFixture) -> None:
+    """
+    Tests that bundles of a catalog of unsupported format
+    are indexed without an appearance in it.
+    """
+    bundle = OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")
+    global_index = GlobalBundleIndex()
+
+    global_index.add_catalog("index:latest", {"org/repo": [bundle]})
+
+    assert list(global_index) == [bundle]
+    assert global_index.appearances(bundle) == set()
+    assert "Cannot save data for index:latest" in caplog.text
@@ -0,0 +1,53 @@
+from datetime import date, datetime
+
+from pullsar.log_decoder import decode_pull_repo_logs, oldest_log_date, parse_log_date
+
+
+def test_parse_log_date_matches_strptime() -> None:
+    """Tests that dates are parsed the same way as with the full datetime format."""
+    for datetime_str in (
+        "Mon, 09 Jun 2025 16:23:18 -0000",
+        "Wed, 31 Dec 2025 23:59:59 +0100",
+        "Thu, 01 Jan 2026 00:00:00 -0500",
+    ):
+        expected = datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %z").date()
+        assert parse_log_date(datetime_str) == expected
+
+
+def test_parse_log_date_fallback() -> None:
+    """Tests that a day prefix not in the fixed layout is parsed by strptime."""
+    assert parse_log_date("Mon, 9 Jun 2025 16:23:18 -0000") == date(2025, 6, 9)
+
+
+def test_decode_pull_repo_logs() -> None:
+    """Tests that only 'pull_repo' logs are decoded into compact tuples."""
+    logs = [
+        {
+            "kind": "pull_repo",
+            "datetime": "Tue, 15 Jul 2025 10:00:00 -0000",
+            "metadata": {"repo": "repo", "tag": "v1"},
+        },
+        {
+            "kind": "push_repo",
+            "datetime": "Tue, 15 Jul 2025 10:00:00 -0000",
+            "metadata": {"tag": "v1"},
+        },
+        {"kind": "pull_repo", "datetime": "Tue, 15 Jul 2025 10:00:00 -0000"},
+        {
+            "kind": "pull_repo",
+            "datetime": "Mon, 14 Jul 2025 10:00:00 -0000",
+            "metadata": {"manifest_digest": "sha256:abc"},
+        },
+        {
+            "kind": "pull_repo",
+            "datetime": "Sun, 13 Jul 2025 10:00:00 -0000",
+            "metadata": {"tag": "v1"},
+        },
+    ]
+
+    assert list(decode_pull_repo_logs(logs, since=date(2025, 7, 14))) == [
+        (date(2025, 7, 15), "repo", "v1", None),
+        (date(2025, 7, 14), None, None, "sha256:abc"),
+    ]
+    assert oldest_log_date(logs) == date(2025, 7, 13)
+    assert oldest_log_date([]) is None
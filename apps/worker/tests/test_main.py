@@ -1,10 +1,34 @@
 import logging
+import pytest
+from typing import Any, Iterator, List, Optional, Tuple
 from pytest_mock import MockerFixture
 
 from pullsar.main import main
 from pullsar.cli import ParsedArgs, ParsedCatalogArg
 from pullsar.db.manager import DatabaseManager
 from pullsar.stats_resolver import OperatorUsageStatsResolver
+from pullsar.catalog_cache import CatalogCache
+from pullsar.catalog_renderer import CatalogSource
+from pullsar.operator_bundle_model import OperatorBundle
+from pullsar.parse_operators_catalog import BundleIndex
+
+BUNDLE_INDEX: BundleIndex = [("op.v1", "op", "quay.io/org/repo:v1")]
+
+
+def iter_empty_catalogs(
+    catalogs: List[CatalogSource], max_workers: int, catalog_cache: Any
+) -> Iterator[Tuple[CatalogSource, Optional[BundleIndex]]]:
+    """Loads catalogs without rendering them, each with the same bundle index."""
+    for catalog in catalogs:
+        yield catalog, None if catalog[0].endswith(":broken") else BUNDLE_INDEX
+
+
+@pytest.fixture(autouse=True)
+def loaded_catalogs(mocker: MockerFixture) -> Any:
+    """A fixture that replaces loading (rendering) of the input catalogs."""
+    return mocker.patch(
+        "pullsar.main.iter_loaded_catalogs", side_effect=iter_empty_catalogs
+    )
 
 
 def test_main_flow_with_db_and_debug(mocker: MockerFixture) -> None:
@@ -24,8 +48,11 @@ def test_main_flow_with_db_and_debug(mocker: MockerFixture) -> None:
     mocker.patch("pullsar.main.load_quay_api_tokens", return_value={})
     mocker.patch("pullsar.main.QuayClient")
     mocker.patch("pullsar.main.is_database_configured", return_value=True)
+    bundle = OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")
     mock_resolver_instance = mocker.Mock(spec=OperatorUsageStatsResolver)
-    mock_resolver_instance.update_operator_usage_stats.return_value = {"org/repo": []}
+    mock_resolver_instance.resolve_operator_bundles.return_value = {
+        "org/repo": [bundle]
+    }
     mocker.patch(
         "pullsar.main.OperatorUsageStatsResolver", return_value=mock_resolver_instance
     )
@@ -33,6 +60,7 @@ def test_main_flow_with_db_and_debug(mocker: MockerFixture) -> None:
     mock_set_level = mocker.patch("pullsar.config.logger.setLevel")
 
     mock_db_instance = mocker.Mock(spec=DatabaseManager)
+    mock_db_instance.get_catalog_snapshot.return_value = None
     mock_db_class = mocker.patch(
         "pullsar.main.DatabaseManager", return_value=mock_db_instance
     )
@@ -43,28 +71,44 @@ def test_main_flow_with_db_and_debug(mocker: MockerFixture) -> None:
     mock_db_class.assert_called_once()
     mock_db_instance.connect.assert_called_once()
 
-    assert mock_resolver_instance.update_operator_usage_stats.call_count == 2
-    mock_resolver_instance.update_operator_usage_stats.assert_any_call(
+    assert mock_resolver_instance.resolve_operator_bundles.call_count == 2
+    mock_resolver_instance.resolve_operator_bundles.assert_any_call(
         mocker.ANY,
         mocker.ANY,
-        7,
         "image:v1",
         None,
+        BUNDLE_INDEX,
     )
-    mock_resolver_instance.update_operator_usage_stats.assert_any_call(
+    mock_resolver_instance.resolve_operator_bundles.assert_any_call(
         mocker.ANY,
         mocker.ANY,
-        7,
         "image:v2",
         "rendered.json",
+        BUNDLE_INDEX,
     )
 
-    assert mock_db_instance.save_operator_usage_stats.call_count == 2
+    # pulls are counted and saved once for both catalogs
+    mock_resolver_instance.count_operator_usage_stats.assert_called_once_with(
+        mocker.ANY, {"org/repo": [bundle]}, 7
+    )
+    global_index = mock_db_instance.save_operator_usage_stats.call_args.args[0]
+    assert list(global_index) == [bundle]
+    assert global_index.appearances(bundle) == {("image", "v1"), ("image", "v2")}
+    mock_db_instance.save_log_watermarks.assert_called_once_with(
+        mock_resolver_instance.get_updated_log_watermarks.return_value
+    )
+    mock_resolver_instance.load_api_cache.assert_called_once_with(
+        mock_db_instance.get_api_cache.return_value
+    )
+    mock_db_instance.save_api_cache.assert_called_once_with(
+        mock_resolver_instance.get_api_cache_updates.return_value
+    )
+    mock_db_instance.clear_api_cache.assert_not_called()
 
     mock_db_instance.close.assert_called_once()
 
 
-def test_main_flow_with_dry_run(mocker: MockerFixture) -> None:
+def test_main_flow_with_dry_run(mocker: MockerFixture, loaded_catalogs: Any) -> None:
     """
     Simulates a run where the database is configured but --dry-run is enabled.
     """
@@ -79,7 +123,7 @@ def test_main_flow_with_dry_run(mocker: MockerFixture) -> None:
     mocker.patch("pullsar.main.QuayClient")
     mocker.patch("pullsar.main.is_database_configured", return_value=True)
     mock_resolver_instance = mocker.Mock(spec=OperatorUsageStatsResolver)
-    mock_resolver_instance.update_operator_usage_stats.return_value = {"org/repo": []}
+    mock_resolver_instance.resolve_operator_bundles.return_value = {"org/repo": []}
     mocker.patch(
         "pullsar.main.OperatorUsageStatsResolver", return_value=mock_resolver_instance
     )
@@ -89,6 +133,8 @@ def test_main_flow_with_dry_run(mocker: MockerFixture) -> None:
     main()
 
     mock_db_class.assert_not_called()
+    # no database to cache catalogs in
+    assert loaded_catalogs.call_args.args[2] is None
 
 
 def test_main_flow_with_db_not_configured(mocker: MockerFixture) -> None:
@@ -106,7 +152,7 @@ def test_main_flow_with_db_not_configured(mocker: MockerFixture) -> None:
     mocker.patch("pullsar.main.QuayClient")
     mocker.patch("pullsar.main.is_database_configured", return_value=False)
     mock_resolver_instance = mocker.Mock(spec=OperatorUsageStatsResolver)
-    mock_resolver_instance.update_operator_usage_stats.return_value = {"org/repo": []}
+    mock_resolver_instance.resolve_operator_bundles.return_value = {"org/repo": []}
     mocker.patch(
         "pullsar.main.OperatorUsageStatsResolver", return_value=mock_resolver_instance
     )
@@ -116,3 +162,158 @@ def test_main_flow_with_db_not_configured(mocker: MockerFixture) -> None:
     main()
 
     mock_db_class.assert_not_called()
+
+
+def test_main_flow_with_refresh_cache(mocker: MockerFixture) -> None:
+    """
+    Simulates a run where API responses cached by previous runs are invalidated.
+    """
+    mock_args = ParsedArgs(
+        dry_run=False,
+        debug=False,
+        log_days=7,
+        catalogs=[ParsedCatalogArg("image:v5", None)],
+        refresh_cache=True,
+    )
+    mocker.patch("pullsar.main.parse_arguments", return_value=mock_args)
+    mocker.patch("pullsar.main.load_quay_api_tokens", return_value={})
+    mocker.patch("pullsar.main.QuayClient")
+    mocker.patch("pullsar.main.is_database_configured", return_value=True)
+    mock_resolver_instance = mocker.Mock(spec=OperatorUsageStatsResolver)
+    mock_resolver_instance.resolve_operator_bundles.return_value = {}
+    mocker.patch(
+        "pullsar.main.OperatorUsageStatsResolver", return_value=mock_resolver_instance
+    )
+    mock_db_instance = mocker.Mock(spec=DatabaseManager)
+    mock_db_instance.get_catalog_snapshot.return_value = None
+    mocker.patch("pullsar.main.DatabaseManager", return_value=mock_db_instance)
+
+    main()
+
+    mock_db_instance.clear_api_cache.assert_called_once()
+    mock_db_instance.get_api_cache.assert_not_called()
+    mock_resolver_instance.load_api_cache.assert_not_called()
+    mock_db_instance.save_api_cache.assert_called_once()
+
+
+def test_main_flow_with_refresh_watermarks(mocker: MockerFixture) -> None:
+    """
+    Simulates a run where logs are fetched for the last --log-days days again,
+    regardless of the watermarks saved by previous runs.
+    """
+    mock_args = ParsedArgs(
+        dry_run=False,
+        debug=False,
+        log_days=7,
+        catalogs=[ParsedCatalogArg("image:v5", None)],
+        refresh_watermarks=True,
+    )
+    mocker.patch("pullsar.main.parse_arguments", return_value=mock_args)
+    mocker.patch("pullsar.main.load_quay_api_tokens", return_value={})
+    mocker.patch("pullsar.main.QuayClient")
+    mocker.patch("pullsar.main.is_database_configured", return_value=True)
+    mock_resolver_instance = mocker.Mock(spec=OperatorUsageStatsResolver)
+    mock_resolver_instance.log_watermarks = {}
+    mock_resolver_instance.resolve_operator_bundles.return_value = {}
+    mocker.patch(
+        "pullsar.main.OperatorUsageStatsResolver", return_value=mock_resolver_instance
+    )
+    mock_db_instance = mocker.Mock(spec=DatabaseManager)
+    mock_db_instance.get_catalog_snapshot.return_value = None
+    mocker.patch("pullsar.main.DatabaseManager", return_value=mock_db_instance)
+
+    main()
+
+    mock_db_instance.get_log_watermarks.assert_not_called()
+    assert mock_resolver_instance.log_watermarks == {}
+    mock_db_instance.save_log_watermarks.assert_called_once()
+
+
+def test_main_flow_catalogs_saved_in_order(
+    mocker: MockerFixture, loaded_catalogs: Any
+) -> None:
+    """
+    Tests that catalog snapshots are saved in the input order after the bundles
+    of all catalogs, skipping those which failed to load.
+    """
+    mock_args = ParsedArgs(
+        dry_run=False,
+        debug=False,
+        log_days=7,
+        catalogs=[
+            ParsedCatalogArg("image:v1", None),
+            ParsedCatalogArg("image:broken", None),
+            ParsedCatalogArg("image:v2", None),
+        ],
+    )
+    mocker.patch("pullsar.main.parse_arguments", return_value=mock_args)
+    mocker.patch("pullsar.main.load_quay_api_tokens", return_value={})
+    mocker.patch("pullsar.main.QuayClient")
+    mocker.patch("pullsar.main.is_database_configured", return_value=True)
+    mocker.patch("pullsar.main.catalog_render_workers", return_value=3)
+    mock_resolver_instance = mocker.Mock(spec=OperatorUsageStatsResolver)
+    mock_resolver_instance.resolve_operator_bundles.return_value = {
+        "org/repo": [OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")]
+    }
+    mocker.patch(
+        "pullsar.main.OperatorUsageStatsResolver", return_value=mock_resolver_instance
+    )
+    mock_db_instance = mocker.Mock(spec=DatabaseManager)
+    mock_db_instance.get_catalog_snapshot.return_value = None
+    mocker.patch("pullsar.main.DatabaseManager", return_value=mock_db_instance)
+
+    main()
+
+    assert loaded_catalogs.call_args.args[1] == 3
+    assert isinstance(loaded_catalogs.call_args.args[2], CatalogCache)
+    assert mock_resolver_instance.resolve_operator_bundles.call_count == 2
+    db_calls = [call[0] for call in mock_db_instance.method_calls]
+    assert db_calls.index("save_operator_usage_stats") < db_calls.index(
+        "save_catalog_snapshot"
+    )
+    assert [
+        call.args[0] for call in mock_db_instance.save_catalog_snapshot.call_args_list
+    ] == ["image:v1", "image:v2"]
+
+
+def test_main_flow_catalog_delta(mocker: MockerFixture) -> None:
+    """
+    Tests that bundles unchanged since the previous run are processed with their
+    resolved images and saved as unchanged, and the new snapshot is saved.
+    """
+    mock_args = ParsedArgs(
+        dry_run=False,
+        debug=False,
+        log_days=7,
+        catalogs=[ParsedCatalogArg("image:v1", None)],
+    )
+    mocker.patch("pullsar.main.parse_arguments", return_value=mock_args)
+    mocker.patch("pullsar.main.load_quay_api_tokens", return_value={})
+    mocker.patch("pullsar.main.QuayClient")
+    mocker.patch("pullsar.main.is_database_configured", return_value=True)
+    resolved_bundle = OperatorBundle("op.v1", "op", "quay.io/org/repo@sha256:a")
+    mock_resolver_instance = mocker.Mock(spec=OperatorUsageStatsResolver)
+    mock_resolver_instance.resolve_operator_bundles.return_value = {
+        "org/repo": [resolved_bundle]
+    }
+    mocker.patch(
+        "pullsar.main.OperatorUsageStatsResolver", return_value=mock_resolver_instance
+    )
+    mock_db_instance = mocker.Mock(spec=DatabaseManager)
+    mock_db_instance.get_catalog_snapshot.return_value = {
+        BUNDLE_INDEX[0]: resolved_bundle.image
+    }
+    mocker.patch("pullsar.main.DatabaseManager", return_value=mock_db_instance)
+
+    main()
+
+    mock_db_instance.get_catalog_snapshot.assert_called_once_with("image:v1")
+    assert mock_resolver_instance.resolve_operator_bundles.call_args.args[4] == [
+        ("op.v1", "op", "quay.io/org/repo@sha256:a")
+    ]
+    global_index = mock_db_instance.save_operator_usage_stats.call_args.args[0]
+    assert global_index.repository_paths == {"org/repo": [resolved_bundle]}
+    assert global_index.is_unchanged(resolved_bundle)
+    mock_db_instance.save_catalog_snapshot.assert_called_once_with(
+        "image:v1", {BUNDLE_INDEX[0]: resolved_bundle.image}
+    )
@@ -1,10 +1,12 @@
 import pytest
+from datetime import date
 
 from pullsar.operator_bundle_model import (
     extract_image_attributes,
     extract_catalog_attributes,
     extract_tag,
     OperatorBundle,
+    PullCounts,
     ImageAttributes,
     CatalogAttributes,
 )
@@ -118,3 +120,47 @@ def test_bundle_str_method(tagged_bundle: OperatorBundle) -> None:
     assert isinstance(str(tagged_bundle), str)
     assert "Name: alpha-operator.v1.0.0" in str(tagged_bundle)
     assert "Package: alpha-operator" in str(tagged_bundle)
+
+
+def test_bundle_shares_repository_strings() -> None:
+    """Test that bundles of the same repository share its strings."""
+    bundle_a = OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")
+    bundle_b = OperatorBundle("op.v2", "op", "quay.io/org/repo:v2")
+
+    assert bundle_a.repo_path is bundle_b.repo_path
+    assert bundle_a.org is bundle_b.org
+    with pytest.raises(AttributeError):
+        bundle_a.extra = "value"
+
+
+def test_pull_counts() -> None:
+    """Test that pull counts behave as a dictionary of counts by date."""
+    pull_counts = PullCounts()
+    assert pull_counts == {}
+    assert not pull_counts
+    assert pull_counts.get(date(2025, 7, 14)) is None
+
+    pull_counts.add(date(2025, 7, 14), 2)
+    pull_counts.add(date(2025, 7, 14), 3)
+    pull_counts.add(date(2025, 7, 16), 1)
+    # earlier date than the first one extends the array backwards
+    pull_counts[date(2025, 7, 10)] = 4
+
+    assert pull_counts == {
+        date(2025, 7, 10): 4,
+        date(2025, 7, 14): 5,
+        date(2025, 7, 16): 1,
+    }
+    assert list(pull_counts) == [
+        date(2025, 7, 10),
+        date(2025, 7, 14),
+        date(2025, 7, 16),
+    ]
+    assert len(pull_counts) == 3
+    assert date(2025, 7, 12) not in pull_counts
+    assert repr(pull_counts) == repr(dict(pull_counts))
+
+    del pull_counts[date(2025, 7, 14)]
+    assert pull_counts == {date(2025, 7, 10): 4, date(2025, 7, 16): 1}
+    with pytest.raises(KeyError):
+        del pull_counts[date(2025, 7, 14)]
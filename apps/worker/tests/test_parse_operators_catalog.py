@@ -1,35 +1,80 @@
+import gzip
+import io
 import json
 import subprocess
 import pytest
+from typing import Any, List
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
 from pathlib import Path
 
 from pullsar.parse_operators_catalog import (
+    catalog_artifact_path,
     render_operator_catalog,
     create_repository_paths_maps,
+    load_catalog_bundle_index,
+    iter_catalog_bundles,
 )
 
 
-def test_render_catalog_success(mocker: MockerFixture, tmp_path: Path) -> None:
-    """
-    Test that the opm command is called correctly and its output is written to a file.
-    """
+def mock_opm(
+    mocker: MockerFixture, stdout: str, returncode: int = 0, stderr: str = ""
+) -> Any:
+    """Mocks 'opm' process writing 'stdout' and 'stderr', exiting with 'returncode'."""
     mock_process = mocker.Mock()
-    mock_process.stdout = '{"schema": "olm.bundle"}'
-    mock_run = mocker.patch("subprocess.run", return_value=mock_process)
+    mock_process.stdout = io.StringIO(stdout)
+    mock_process.wait.return_value = returncode
+
+    def popen(command: List[str], **kwargs: Any) -> Any:
+        kwargs["stderr"].write(stderr)
+        return mock_process
+
+    return mocker.patch(
+        "subprocess.Popen", side_effect=popen, return_value=mock_process
+    )
 
-    output_file = tmp_path / "catalog.json"
+
+def test_render_catalog_success(mocker: MockerFixture, fake_catalog: str) -> None:
+    """
+    Test that the opm command is called correctly and its output is parsed.
+    """
+    mock_popen = mock_opm(mocker, fake_catalog)
     catalog_image = "my-image:latest"
 
-    is_success = render_operator_catalog(catalog_image, str(output_file))
+    bundle_index = render_operator_catalog(catalog_image)
+
+    assert mock_popen.call_args.args[0] == [
+        "opm",
+        "render",
+        catalog_image,
+        "-o",
+        "json",
+    ]
+    assert mock_popen.call_args.kwargs["stdout"] == subprocess.PIPE
+    assert bundle_index == [
+        ("op-a.v1", "op-a", "quay.io/org-a/repo:v1"),
+        ("op-a.v2", "op-a", "quay.io/org-a/repo:v2"),
+        ("op-b.v1", "op-b", "quay.io/org-b/repo@sha256:abc"),
+        ("op-c.v1", "op-c", "registry.connect.redhat.com/org-c/repo:v1"),
+    ]
+
+
+def test_render_catalog_artifact(
+    mocker: MockerFixture, fake_catalog: str, tmp_path: Path
+) -> None:
+    """
+    Test that the rendered catalog is saved into a compressed artifact,
+    which can be parsed again later.
+    """
+    mock_opm(mocker, fake_catalog)
+    artifact_file = tmp_path / "catalog.json.gz"
+
+    bundle_index = render_operator_catalog("my-image:v4.18", str(artifact_file))
 
-    expected_command = ["opm", "render", catalog_image, "-o", "json"]
-    mock_run.assert_called_once_with(
-        expected_command, capture_output=True, text=True, check=True
-    )
-    assert is_success is True
-    assert output_file.read_text() == '{"schema": "olm.bundle"}'
+    with gzip.open(artifact_file, "rt", encoding="utf-8") as artifact:
+        assert artifact.read() == fake_catalog
+    assert bundle_index is not None
+    assert load_catalog_bundle_index(str(artifact_file)) == bundle_index
 
 
 def test_render_catalog_opm_not_found(
@@ -38,30 +83,30 @@ def test_render_catalog_opm_not_found(
     """
     Test that a FileNotFoundError is raised and logged if opm is not installed.
     """
-    mock_run = mocker.patch("subprocess.run", side_effect=FileNotFoundError)
+    mock_popen = mocker.patch("subprocess.Popen", side_effect=FileNotFoundError)
 
     with pytest.raises(FileNotFoundError):
-        render_operator_catalog("my-image:latest", "output.json")
+        render_operator_catalog("my-image:latest")
 
-    mock_run.assert_called_once()
+    mock_popen.assert_called_once()
     assert "'opm' command not found" in caplog.text
 
 
 def test_render_catalog_opm_fails(
-    mocker: MockerFixture, caplog: LogCaptureFixture
+    mocker: MockerFixture, caplog: LogCaptureFixture, tmp_path: Path
 ) -> None:
     """
-    Test that errors from a failed opm command are logged.
+    Test that errors from a failed opm command are logged
+    and the incomplete artifact is removed.
     """
-    error = subprocess.CalledProcessError(
-        returncode=1, cmd=["opm", "..."], stderr="something went wrong"
-    )
-    mocker.patch("subprocess.run", side_effect=error)
+    mock_opm(mocker, '{"schema": "olm.bundle"', 1, "something went wrong")
+    artifact_file = tmp_path / "catalog.json.gz"
 
-    is_success = render_operator_catalog("my-image:latest", "output.json")
+    bundle_index = render_operator_catalog("my-image:latest", str(artifact_file))
 
-    assert is_success is False
-    assert "Rendering of catalog image failed" in caplog.text
+    assert bundle_index is None
+    assert not artifact_file.exists()
+    assert "Rendering of catalog image failed (Exit Code: 1)" in caplog.text
     assert "something went wrong" in caplog.text
 
 
@@ -69,56 +114,157 @@ def test_render_catalog_generic_exception(
     mocker: MockerFixture, caplog: LogCaptureFixture
 ) -> None:
     """
-    Covers the generic 'except Exception' block in render_operator_catalog.
+    Covers the generic 'except Exception' block in render_operator_catalog,
+    the opm process is killed.
     """
-    mocker.patch("subprocess.run", side_effect=Exception("A generic opm error"))
+    mock_popen = mock_opm(mocker, "{}")
+    mocker.patch(
+        "pullsar.parse_operators_catalog.iter_catalog_bundles",
+        side_effect=Exception("A generic parser error"),
+    )
 
-    is_success = render_operator_catalog("my-image:latest", "output.json")
+    bundle_index = render_operator_catalog("my-image:latest")
 
-    assert is_success is False
+    assert bundle_index is None
+    mock_popen.return_value.kill.assert_called_once()
     assert "An unexpected error occurred during opm render" in caplog.text
 
 
+def test_catalog_artifact_path() -> None:
+    """Test that artifacts are named after the catalog and its OCP version."""
+    assert (
+        catalog_artifact_path("registry.io/redhat/my-index:v4.18", "artifacts")
+        == "artifacts/my-index-v4.18.json.gz"
+    )
+    assert (
+        catalog_artifact_path("registry.io/redhat/my-index:latest", "artifacts")
+        == "artifacts/my-index-latest.json.gz"
+    )
+
+
 @pytest.fixture
-def fake_jq_output() -> str:
-    """A fixture that provides sample multi-line JSON output like jq -c."""
-    bundle1 = {"name": "op-a.v1", "package": "op-a", "image": "quay.io/org-a/repo:v1"}
-    bundle2 = {"name": "op-a.v2", "package": "op-a", "image": "quay.io/org-a/repo:v2"}
+def fake_catalog() -> str:
+    """
+    A fixture that provides sample rendered catalog like 'opm render -o json',
+    concatenated pretty-printed JSON objects of multiple schemas.
+    """
+    package = {"schema": "olm.package", "name": "op-a", "defaultChannel": "stable"}
+    bundle1 = {
+        "schema": "olm.bundle",
+        "name": "op-a.v1",
+        "package": "op-a",
+        "image": "quay.io/org-a/repo:v1",
+        "properties": [{"type": "olm.package", "value": {"version": "1.0.0"}}],
+    }
+    bundle2 = {
+        "schema": "olm.bundle",
+        "name": "op-a.v2",
+        "package": "op-a",
+        "image": "quay.io/org-a/repo:v2",
+    }
+    channel = {"schema": "olm.channel", "name": "stable", "package": "op-a"}
     bundle3 = {
+        "schema": "olm.bundle",
         "name": "op-b.v1",
         "package": "op-b",
         "image": "quay.io/org-b/repo@sha256:abc",
     }
     # bundle with registry.connect proxy should be in non-quay map
     bundle4 = {
+        "schema": "olm.bundle",
         "name": "op-c.v1",
         "package": "op-c",
         "image": "registry.connect.redhat.com/org-c/repo:v1",
     }
 
-    return (
-        "\n".join(
-            [
-                json.dumps(bundle1),
-                json.dumps(bundle2),
-                json.dumps(bundle3),
-                json.dumps(bundle4),
-            ]
-        )
-        + "\n\n"
-    )  # empty line to skip
-
-
-def test_create_maps_success(
-    mocker: MockerFixture, fake_jq_output: str, tmp_path: Path
+    return "\n".join(
+        json.dumps(item, indent=4)
+        for item in (package, bundle1, bundle2, channel, bundle3, bundle4)
+    )
+
+
+def test_iter_catalog_bundles(fake_catalog: str) -> None:
+    """
+    Test that only bundle objects are yielded, trimmed to the needed attributes,
+    regardless of how the objects are split into chunks.
+    """
+    for chunk_size in (1, 7, 64, len(fake_catalog)):
+        bundles = list(iter_catalog_bundles(io.StringIO(fake_catalog), chunk_size))
+
+        assert [bundle["name"] for bundle in bundles] == [
+            "op-a.v1",
+            "op-a.v2",
+            "op-b.v1",
+            "op-c.v1",
+        ]
+        assert bundles[0] == {
+            "name": "op-a.v1",
+            "package": "op-a",
+            "image": "quay.io/org-a/repo:v1",
+        }
+
+
+def test_iter_catalog_bundles_malformed_object(caplog: LogCaptureFixture) -> None:
+    """
+    Test that a malformed object is skipped with a warning,
+    resuming with the next object.
+    """
+    catalog = (
+        '{"schema": "olm.bundle", "name": "op-a.v1"}\n'
+        "not-json\n"
+        '{"schema": "olm.bundle", "name": "op-b.v1"}\n'
+    )
+
+    bundles = list(iter_catalog_bundles(io.StringIO(catalog), chunk_size=16))
+
+    assert bundles == [{"name": "op-a.v1"}, {"name": "op-b.v1"}]
+    assert "Could not decode JSON object from catalog" in caplog.text
+    assert "Problematic content: not-json" in caplog.text
+
+
+def test_iter_catalog_bundles_malformed_object_not_buffered(
+    mocker: MockerFixture,
 ) -> None:
     """
-    Test the happy path where jq output is parsed and maps are created correctly.
+    Test that a malformed object followed by another one is skipped right away,
+    without buffering the rest of the catalog.
+    """
+    catalog = '{"schema": "olm.bundle", "name": broken}\n' + "".join(
+        f'{{"schema": "olm.bundle", "name": "op.v{i}"}}\n' for i in range(50)
+    )
+    stream = io.StringIO(catalog)
+    read = mocker.spy(stream, "read")
+
+    bundles = list(iter_catalog_bundles(stream, chunk_size=64))
+
+    assert bundles == [{"name": f"op.v{i}"} for i in range(50)]
+    assert {call.args[0] for call in read.call_args_list} == {64}
+
+
+def test_iter_catalog_bundles_oversized_object(caplog: LogCaptureFixture) -> None:
+    """
+    Test that an object larger than the limit is skipped with a warning,
+    resuming with the next object.
+    """
+    catalog = (
+        f'{{"schema": "olm.bundle", "name": "{"x" * 200}"}}\n'
+        '{"schema": "olm.bundle", "name": "op-b.v1"}\n'
+    )
+
+    bundles = list(
+        iter_catalog_bundles(io.StringIO(catalog), chunk_size=16, max_object_size=64)
+    )
+
+    assert bundles == [{"name": "op-b.v1"}]
+    assert "Could not decode JSON object from catalog" in caplog.text
+
+
+def test_create_maps_success(fake_catalog: str, tmp_path: Path) -> None:
+    """
+    Test the happy path where the catalog is parsed and maps are created correctly.
     """
-    mock_process = mocker.Mock()
-    mock_process.stdout = fake_jq_output
-    mocker.patch("subprocess.run", return_value=mock_process)
     catalog_file = tmp_path / "catalog.json"
+    catalog_file.write_text(fake_catalog)
 
     all_map, missing_digest_map, not_quay_map = create_repository_paths_maps(
         str(catalog_file), {}
@@ -139,69 +285,71 @@ def test_create_maps_success(
     assert not_quay_map["org-c/repo"][0].registry == "registry.connect.redhat.com"
 
 
-def test_create_maps_jq_not_found(
-    mocker: MockerFixture, caplog: LogCaptureFixture
-) -> None:
+def test_create_maps_known_translation(fake_catalog: str, tmp_path: Path) -> None:
     """
-    Test that a FileNotFoundError is raised and logged if jq is not installed.
+    Test that bundles with known translations go straight to the Quay map.
     """
-    mock_run = mocker.patch("subprocess.run", side_effect=FileNotFoundError)
+    catalog_file = tmp_path / "catalog.json"
+    catalog_file.write_text(fake_catalog)
+    translations = {
+        "registry.connect.redhat.com/org-c/repo:v1": "quay.io/org-c/repo@sha256:def"
+    }
 
-    with pytest.raises(FileNotFoundError):
-        create_repository_paths_maps("catalog.json", {})
+    all_map, _, not_quay_map = create_repository_paths_maps(
+        str(catalog_file), translations
+    )
 
-    mock_run.assert_called_once()
-    assert "'jq' command not found" in caplog.text
+    assert not_quay_map == {}
+    assert all_map["org-c/repo"][0].image == "quay.io/org-c/repo@sha256:def"
 
 
-def test_create_maps_jq_fails(mocker: MockerFixture, caplog: LogCaptureFixture) -> None:
+def test_create_maps_file_not_found(caplog: LogCaptureFixture, tmp_path: Path) -> None:
     """
-    Test that the function returns empty dicts if the jq command fails.
+    Test that the function returns empty dicts if the catalog cannot be read.
     """
-    error = subprocess.CalledProcessError(returncode=1, cmd=["jq", "..."])
-    mocker.patch("subprocess.run", side_effect=error)
-
     all_map, missing_digest_map, not_quay_map = create_repository_paths_maps(
-        "catalog.json", {}
+        str(tmp_path / "missing.json"), {}
     )
 
     assert all_map == {}
     assert missing_digest_map == {}
     assert not_quay_map == {}
-    assert "Error running jq command" in caplog.text
+    assert "Could not read catalog" in caplog.text
 
 
-def test_create_maps_malformed_json_line(
-    mocker: MockerFixture, caplog: LogCaptureFixture, tmp_path: Path
+def test_create_maps_missing_attributes(
+    caplog: LogCaptureFixture, tmp_path: Path
 ) -> None:
     """
-    Test that a malformed line in the jq output is skipped with a warning.
+    Test that a bundle missing some of the attributes is skipped with a warning.
     """
-    malformed_output = '{"name": "op-a.v1"}\nnot-json\n{"name": "op-b.v1"}'
-    mock_process = mocker.Mock()
-    mock_process.stdout = malformed_output
-    mocker.patch("subprocess.run", return_value=mock_process)
     catalog_file = tmp_path / "catalog.json"
+    catalog_file.write_text('{"schema": "olm.bundle", "name": "op-a.v1"}')
 
-    create_repository_paths_maps(str(catalog_file), {})
+    all_map, _, _ = create_repository_paths_maps(str(catalog_file), {})
 
-    assert "Could not decode JSON" in caplog.text
-    assert "Problematic line content: not-json" in caplog.text
+    assert all_map == {}
+    assert "Bundle number 1 is missing some of the attributes" in caplog.text
 
 
 def test_create_maps_generic_exception(
-    mocker: MockerFixture, caplog: LogCaptureFixture
+    mocker: MockerFixture, caplog: LogCaptureFixture, tmp_path: Path
 ) -> None:
     """
     Covers the generic 'except Exception' block in create_repository_paths_maps.
     """
-    mocker.patch("subprocess.run", side_effect=Exception("A generic jq error"))
+    catalog_file = tmp_path / "catalog.json"
+    catalog_file.write_text("{}")
+    mocker.patch(
+        "pullsar.parse_operators_catalog.iter_catalog_bundles",
+        side_effect=Exception("A generic parser error"),
+    )
 
     all_map, missing_digest_map, not_quay_map = create_repository_paths_maps(
-        "catalog.json", {}
+        str(catalog_file), {}
     )
 
     assert all_map == {}
     assert missing_digest_map == {}
     assert not_quay_map == {}
-    assert "An unexpected error occurred during jq processing" in caplog.text
+    assert "An unexpected error occurred during catalog parsing" in caplog.text
@@ -1,8 +1,11 @@
 import requests
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from pytest_mock import MockerFixture
 from pytest import LogCaptureFixture
+from typing import Any
 
+from pullsar.config import BaseConfig
 from pullsar.pyxis_client import PyxisClient
 
 BASE_URL = "https://my-fake-pyxis.com/v1"
@@ -16,16 +19,14 @@ def client() -> PyxisClient:
 
 def test_get_images_single_page(client: PyxisClient, mocker: MockerFixture) -> None:
     """
-    Tests the happy path where the API returns a single page of data.
+    Tests the happy path where the API returns a single page of data,
+    without requesting a terminating empty page.
     """
     mock_response_page1 = mocker.Mock()
-    mock_response_page1.json.return_value = {"data": [{"image_id": "abc"}]}
-
-    mock_response_page2 = mocker.Mock()
-    mock_response_page2.json.return_value = {"data": []}
+    mock_response_page1.json.return_value = {"data": [{"image_id": "abc"}], "total": 1}
 
     mock_get = mocker.patch.object(
-        client.session, "get", side_effect=[mock_response_page1, mock_response_page2]
+        client.session, "get", side_effect=[mock_response_page1]
     )
 
     images = client.get_images_for_repository(
@@ -35,16 +36,103 @@ def test_get_images_single_page(client: PyxisClient, mocker: MockerFixture) -> N
     assert len(images) == 1
     assert images[0]["image_id"] == "abc"
 
-    assert mock_get.call_count == 2
-
+    assert mock_get.call_count == 1
     assert mock_get.call_args_list[0].kwargs["params"]["page"] == 0
-    assert mock_get.call_args_list[1].kwargs["params"]["page"] == 1
 
 
 def test_get_images_with_pagination(client: PyxisClient, mocker: MockerFixture) -> None:
     """
-    Tests the pagination logic over multiple pages.
+    Tests that pages following the first one are fetched concurrently
+    based on the total number of items, and merged in order.
+    """
+    client.page_size = 2
+    pages = [
+        [{"image_id": "p1"}, {"image_id": "p2"}],
+        [{"image_id": "p3"}, {"image_id": "p4"}],
+        [{"image_id": "p5"}],
+    ]
+
+    def get(*args: Any, **kwargs: Any) -> Any:
+        response = mocker.Mock()
+        response.json.return_value = {
+            "data": pages[kwargs["params"]["page"]],
+            "total": 5,
+        }
+        return response
+
+    mock_get = mocker.patch.object(client.session, "get", side_effect=get)
+
+    images = client.get_images_for_repository(
+        "registry.connect.redhat.com", "my-org/my-repo", "data.image_id"
+    )
+
+    assert images == [{"image_id": f"p{i}"} for i in range(1, 6)]
+    assert sorted(c.kwargs["params"]["page"] for c in mock_get.call_args_list) == [
+        0,
+        1,
+        2,
+    ]
+    assert all(c.kwargs["params"]["page_size"] == 2 for c in mock_get.call_args_list)
+    assert all(c.kwargs["timeout"] == client.timeout for c in mock_get.call_args_list)
+    # pages are fetched by other threads, each with its own Kerberos handler
+    first_page_call, *other_page_calls = mock_get.call_args_list
+    assert first_page_call.kwargs["auth"] is client.auth_method
+    assert all(
+        c.kwargs["auth"] is not None and c.kwargs["auth"] is not client.auth_method
+        for c in other_page_calls
+    )
+
+
+def test_get_images_with_included_fields(
+    client: PyxisClient, mocker: MockerFixture
+) -> None:
+    """
+    Tests that the total number of items is included in responses limited
+    to the given fields, so that pages are fetched concurrently.
+    """
+    client.page_size = 1
+    registry = "registry.connect.redhat.com"
+
+    def get(*args: Any, **kwargs: Any) -> Any:
+        params = kwargs["params"]
+        image = {
+            "image_id": f"p{params['page']}",
+            "repositories": [{"registry": registry, "repository": "my-org/my-repo"}],
+        }
+        response = mocker.Mock()
+        # like Pyxis, only the included top-level fields are returned
+        response.json.return_value = {"data": [image] if params["page"] < 3 else []}
+        if "total" in params["include"].split(","):
+            response.json.return_value["total"] = 3
+        return response
+
+    mock_get = mocker.patch.object(client.session, "get", side_effect=get)
+
+    images = client.get_images_for_repositories(
+        registry,
+        ["my-org/my-repo"],
+        "data.image_id,data.repositories.registry,data.repositories.repository",
+    )
+
+    assert images is not None
+    assert [image["image_id"] for image in images["my-org/my-repo"]] == [
+        "p0",
+        "p1",
+        "p2",
+    ]
+    # no terminating empty page is requested
+    assert mock_get.call_count == 3
+    assert mock_get.call_args.kwargs["params"]["include"] == (
+        "data.image_id,data.repositories.registry,data.repositories.repository,total"
+    )
+
+
+def test_get_images_without_total(client: PyxisClient, mocker: MockerFixture) -> None:
+    """
+    Tests that without the total number of items, pages are fetched
+    one by one until a page is not full.
     """
+    client.page_size = 1
     mock_response_page1 = mocker.Mock()
     mock_response_page1.json.return_value = {"data": [{"image_id": "p1"}]}
 
@@ -64,7 +152,6 @@ def test_get_images_with_pagination(client: PyxisClient, mocker: MockerFixture)
         "registry.connect.redhat.com", "my-org/my-repo", "data.image_id"
     )
 
-    assert len(images) == 2
     assert images == [{"image_id": "p1"}, {"image_id": "p2"}]
 
 
@@ -108,3 +195,89 @@ def test_repository_path_encoding(client: PyxisClient, mocker: MockerFixture) ->
     expected_url = f"{BASE_URL}/repositories/registry/registry.connect.redhat.com/repository/my-org%2Fmy-repo/images"
     called_url = mock_get.call_args.args[0]
     assert called_url == expected_url
+
+
+def test_get_images_for_repositories(
+    client: PyxisClient, mocker: MockerFixture
+) -> None:
+    """
+    Tests that images of multiple repositories are fetched in a single
+    filtered query and split back by repository.
+    """
+    registry = "registry.connect.redhat.com"
+    image_a = {
+        "image_id": "a",
+        "repositories": [
+            {"registry": registry, "repository": "org/repo-a"},
+            {"registry": "quay.io", "repository": "quay-org/repo-a"},
+        ],
+    }
+    image_ab = {
+        "image_id": "ab",
+        "repositories": [
+            {"registry": registry, "repository": "org/repo-a"},
+            {"registry": registry, "repository": "org/repo-b"},
+            {"registry": registry, "repository": "org/other"},
+        ],
+    }
+    mock_response_page1 = mocker.Mock()
+    mock_response_page1.json.return_value = {"data": [image_a, image_ab]}
+    mock_response_page2 = mocker.Mock()
+    mock_response_page2.json.return_value = {"data": []}
+    mock_get = mocker.patch.object(
+        client.session, "get", side_effect=[mock_response_page1, mock_response_page2]
+    )
+
+    images = client.get_images_for_repositories(
+        registry, ["org/repo-a", "org/repo-b", "org/repo-c"], "data.image_id"
+    )
+
+    assert images == {
+        "org/repo-a": [image_a, image_ab],
+        "org/repo-b": [image_ab],
+        "org/repo-c": [],
+    }
+    assert mock_get.call_args_list[0].args == (f"{BASE_URL}/images",)
+    assert mock_get.call_args_list[0].kwargs["params"]["filter"] == (
+        'repositories.registry=="registry.connect.redhat.com";'
+        'repositories.repository=in=("org/repo-a","org/repo-b","org/repo-c")'
+    )
+
+
+def test_get_images_for_repositories_request_fails(
+    client: PyxisClient, mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """Tests that None is returned and an error is logged if the request fails."""
+    mocker.patch.object(
+        client.session,
+        "get",
+        side_effect=requests.exceptions.RequestException("Connection error"),
+    )
+
+    images = client.get_images_for_repositories(
+        "registry.connect.redhat.com", ["org/repo-a"], "data.image_id"
+    )
+
+    assert images is None
+    assert "Pyxis API request failed for images of 1 repositories" in caplog.text
+
+
+def test_auth_method_per_thread(client: PyxisClient, mocker: MockerFixture) -> None:
+    """
+    Tests that each thread gets its own Kerberos handler, reused by the thread,
+    and that no handler is used with mTLS.
+    """
+    auth = client.auth_method
+    assert auth is not None
+    assert client.auth_method is auth
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        thread_auth = executor.submit(lambda: client.auth_method).result()
+    assert thread_auth is not None
+    assert thread_auth is not auth
+
+    mocker.patch.object(BaseConfig, "CLIENT_CERT_PATH", "client.crt")
+    mocker.patch.object(BaseConfig, "CLIENT_KEY_PATH", "client.key")
+    mtls_client = PyxisClient(base_url=BASE_URL)
+    assert mtls_client.auth_method is None
+    assert mtls_client.session.cert == ("client.crt", "client.key")
@@ -1,9 +1,15 @@
 import requests
 import pytest
+from datetime import date, datetime, timezone
 from pytest_mock import MockerFixture
 from pytest import LogCaptureFixture
 
-from pullsar.quay_client import QuayClient
+from pullsar.quay_client import (
+    QuayClient,
+    QuayTokenMissingError,
+    log_window,
+    split_log_window,
+)
 
 BASE_URL = "https://quay.io/api/v1"
 API_TOKENS = {"org-a": "token-a", "org-b": "token-b"}
@@ -22,22 +28,39 @@ def test_extract_org() -> None:
 
 def test_token_not_defined(client: QuayClient, caplog: LogCaptureFixture) -> None:
     """
-    Tests that an empty list is returned and an error is logged
+    Tests that no tag is found and an error is logged
     if the API token for an organization is not defined.
     """
     repo_path = "unknown-org/repo"
 
-    results = client.get_repo_tags(repo_path)
+    result = client.get_repo_tag(repo_path, "v1")
 
-    assert results == []
+    assert result is None
     assert "Quay API token not defined for organization 'unknown-org'" in caplog.text
 
 
+def test_token_not_defined_logs_fail(client: QuayClient, mocker: MockerFixture) -> None:
+    """
+    Tests that fetching logs of an organization without an API token fails
+    instead of yielding no logs, so that the logs are not taken as ingested.
+    """
+    mock_get = mocker.patch.object(client.session, "get")
+
+    with pytest.raises(QuayTokenMissingError):
+        list(
+            client.iter_repo_log_pages(
+                "unknown-org/repo", date(2025, 7, 14), date(2025, 7, 20)
+            )
+        )
+
+    mock_get.assert_not_called()
+
+
 def test_request_exception(
     client: QuayClient, mocker: MockerFixture, caplog: LogCaptureFixture
 ) -> None:
     """
-    Tests that an empty list is returned and an error is logged
+    Tests that no tag is found and an error is logged
     when a request fails.
     """
     mocker.patch.object(
@@ -47,9 +70,9 @@ def test_request_exception(
     )
     repo_path = "org-a/repo"
 
-    results = client.get_repo_tags(repo_path)
+    result = client.get_repo_tag(repo_path, "v1")
 
-    assert results == []
+    assert result is None
     assert "Request error for org-a/repo: Timeout" in caplog.text
 
 
@@ -70,10 +93,11 @@ def test_pagination_with_next_page(client: QuayClient, mocker: MockerFixture) ->
         client.session, "get", side_effect=[mock_response_page1, mock_response_page2]
     )
 
-    results = client.get_repo_logs("org-a/repo", log_days=7)
+    pages = list(
+        client.iter_repo_log_pages("org-a/repo", date(2025, 7, 14), date(2025, 7, 20))
+    )
 
-    assert len(results) == 2
-    assert results == [{"id": 1}, {"id": 2}]
+    assert pages == [[{"id": 1}], [{"id": 2}]]
     assert mock_get.call_count == 2
 
     second_call_args = mock_get.call_args_list[1]
@@ -102,11 +126,285 @@ def test_pagination_with_has_additional(
         client.session, "get", side_effect=[mock_response_page1, mock_response_page2]
     )
 
-    results = client.get_repo_tags("org-b/repo")
+    pages = list(client.iter_repo_tag_pages("org-b/repo"))
 
-    assert len(results) == 2
-    assert results == [{"name": "v1"}, {"name": "v2"}]
+    assert pages == [[{"name": "v1"}], [{"name": "v2"}]]
     assert mock_get.call_count == 2
 
     second_call_args = mock_get.call_args_list[1]
     assert second_call_args.kwargs["params"]["page"] == 2
+
+
+def test_retry_after_rate_limit_resumes_pagination(
+    client: QuayClient, mocker: MockerFixture
+) -> None:
+    """
+    Tests that a rate limited page is retried after the time requested
+    by 'Retry-After' header and pagination resumes from the last page token.
+    """
+    mock_sleep = mocker.patch("pullsar.quay_client.time.sleep")
+    mock_response_page1 = mocker.Mock(status_code=200)
+    mock_response_page1.json.return_value = {"logs": [{"id": 1}], "next_page": "t1"}
+
+    mock_response_rate_limited = mocker.Mock(
+        status_code=429, headers={"Retry-After": "30"}
+    )
+
+    mock_response_page2 = mocker.Mock(status_code=200)
+    mock_response_page2.json.return_value = {"logs": [{"id": 2}]}
+
+    mock_get = mocker.patch.object(
+        client.session,
+        "get",
+        side_effect=[
+            mock_response_page1,
+            mock_response_rate_limited,
+            mock_response_page2,
+        ],
+    )
+
+    pages = list(
+        client.iter_repo_log_pages("org-a/repo", date(2025, 7, 14), date(2025, 7, 20))
+    )
+
+    assert pages == [[{"id": 1}], [{"id": 2}]]
+    assert mock_get.call_count == 3
+    assert mock_get.call_args_list[1].kwargs["params"]["next_page"] == "t1"
+    assert mock_get.call_args_list[2].kwargs["params"]["next_page"] == "t1"
+    assert mock_get.call_args_list[2].kwargs["timeout"] == (10.0, 60.0)
+    mock_sleep.assert_called_once()
+    assert mock_sleep.call_args.args[0] >= 30
+
+
+def test_retry_after_is_capped(client: QuayClient, mocker: MockerFixture) -> None:
+    """Tests that a wait requested by 'Retry-After' header is capped."""
+    mock_sleep = mocker.patch("pullsar.quay_client.time.sleep")
+    mock_response_rate_limited = mocker.Mock(
+        status_code=429, headers={"Retry-After": "86400"}
+    )
+    mock_response = mocker.Mock(status_code=200)
+    mock_response.json.return_value = {"tags": [{"name": "v1"}]}
+    mocker.patch.object(
+        client.session,
+        "get",
+        side_effect=[mock_response_rate_limited, mock_response],
+    )
+
+    pages = list(client.iter_repo_tag_pages("org-a/repo"))
+
+    assert pages == [[{"name": "v1"}]]
+    mock_sleep.assert_called_once_with(client.retry_config.max_retry_after)
+
+
+def test_retry_connection_error(client: QuayClient, mocker: MockerFixture) -> None:
+    """Tests that connection errors are retried with backoff."""
+    mock_sleep = mocker.patch("pullsar.quay_client.time.sleep")
+    mock_response = mocker.Mock(status_code=200)
+    mock_response.json.return_value = {"tags": [{"name": "v1"}]}
+    mocker.patch.object(
+        client.session,
+        "get",
+        side_effect=[
+            requests.exceptions.ConnectionError("reset"),
+            requests.exceptions.Timeout("read timeout"),
+            mock_response,
+        ],
+    )
+
+    pages = list(client.iter_repo_tag_pages("org-a/repo"))
+
+    assert pages == [[{"name": "v1"}]]
+    assert mock_sleep.call_count == 2
+    first_delay, second_delay = (call.args[0] for call in mock_sleep.call_args_list)
+    assert 0.5 <= first_delay <= 1.0
+    assert 1.0 <= second_delay <= 2.0
+
+
+def test_retries_exhausted(
+    client: QuayClient, mocker: MockerFixture, caplog: LogCaptureFixture
+) -> None:
+    """
+    Tests that no tag is found and an error is logged
+    when a request keeps failing after all retries.
+    """
+    mocker.patch("pullsar.quay_client.time.sleep")
+    mock_response = mocker.Mock(status_code=502, headers={})
+    mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+        "502 Bad Gateway"
+    )
+    mock_get = mocker.patch.object(client.session, "get", return_value=mock_response)
+
+    result = client.get_repo_tag("org-a/repo", "v1")
+
+    assert result is None
+    assert mock_get.call_count == client.retry_config.max_retries + 1
+    assert "Request error for org-a/repo: 502 Bad Gateway" in caplog.text
+
+
+def test_retry_after_http_date(mocker: MockerFixture) -> None:
+    """Tests parsing of 'Retry-After' header in both of its formats."""
+    response = mocker.Mock(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert QuayClient._retry_after(response) == 0.0
+
+    response = mocker.Mock(headers={"Retry-After": "invalid"})
+    assert QuayClient._retry_after(response) is None
+
+    response = mocker.Mock(headers={})
+    assert QuayClient._retry_after(response) is None
+
+
+def test_iter_repo_log_pages_yields_pages(
+    client: QuayClient, mocker: MockerFixture
+) -> None:
+    """
+    Tests that logs are yielded page by page, requesting the next page
+    only after the previous one was consumed.
+    """
+    mock_response_page1 = mocker.Mock(status_code=200)
+    mock_response_page1.json.return_value = {"logs": [{"id": 1}], "next_page": "t1"}
+
+    mock_response_page2 = mocker.Mock(status_code=200)
+    mock_response_page2.json.return_value = {"logs": [{"id": 2}, {"id": 3}]}
+
+    mock_get = mocker.patch.object(
+        client.session, "get", side_effect=[mock_response_page1, mock_response_page2]
+    )
+
+    pages = client.iter_repo_log_pages(
+        "org-a/repo", date(2025, 7, 14), date(2025, 7, 20)
+    )
+
+    assert next(pages) == [{"id": 1}]
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["params"] == {
+        "starttime": "07/14/2025",
+        "endtime": "07/20/2025",
+    }
+    assert next(pages) == [{"id": 2}, {"id": 3}]
+    assert mock_get.call_count == 2
+    assert list(pages) == []
+
+
+def test_iter_org_log_pages(client: QuayClient, mocker: MockerFixture) -> None:
+    """Tests that organization logs are requested with the organization's token."""
+    mock_response = mocker.Mock(status_code=200)
+    mock_response.json.return_value = {"logs": [{"id": 1}]}
+    mock_get = mocker.patch.object(client.session, "get", return_value=mock_response)
+
+    pages = client.iter_org_log_pages("org-b", date(2025, 7, 14), date(2025, 7, 20))
+
+    assert list(pages) == [[{"id": 1}]]
+    assert mock_get.call_args.args == (f"{BASE_URL}/organization/org-b/logs",)
+    assert mock_get.call_args.kwargs["headers"] == {"Authorization": "Bearer token-b"}
+
+
+def test_get_aggregated_logs(client: QuayClient, mocker: MockerFixture) -> None:
+    """Tests that aggregated logs are fetched, None is returned on failure."""
+    aggregated = [{"kind": "pull_repo", "count": 2, "datetime": "Mon, 14 Jul 2025"}]
+    mock_response = mocker.Mock(status_code=200)
+    mock_response.json.return_value = {"aggregated": aggregated}
+    mock_get = mocker.patch.object(client.session, "get", return_value=mock_response)
+
+    assert (
+        client.get_org_aggregated_logs("org-a", date(2025, 7, 14), date(2025, 7, 20))
+        == aggregated
+    )
+    assert mock_get.call_args.args == (f"{BASE_URL}/organization/org-a/aggregatelogs",)
+
+    mock_get.side_effect = requests.exceptions.HTTPError("403 Forbidden")
+    assert (
+        client.get_org_aggregated_logs("org-a", date(2025, 7, 14), date(2025, 7, 20))
+        is None
+    )
+
+
+def test_get_aggregated_logs_token_not_defined(
+    client: QuayClient, mocker: MockerFixture
+) -> None:
+    """
+    Tests that aggregated logs of an organization without an API token
+    are a failure (None), not an empty list taken for no pulls.
+    """
+    mock_get = mocker.patch.object(client.session, "get")
+
+    assert (
+        client.get_org_aggregated_logs(
+            "unknown-org", date(2025, 7, 14), date(2025, 7, 20)
+        )
+        is None
+    )
+    mock_get.assert_not_called()
+
+
+def test_iter_repo_log_pages_request_fails(
+    client: QuayClient, mocker: MockerFixture
+) -> None:
+    """Tests that a failed page request is raised to the consumer of the pages."""
+    mock_response_page1 = mocker.Mock(status_code=200)
+    mock_response_page1.json.return_value = {"logs": [{"id": 1}], "next_page": "t1"}
+    mocker.patch.object(
+        client.session,
+        "get",
+        side_effect=[
+            mock_response_page1,
+            requests.exceptions.RequestException("Bad request"),
+        ],
+    )
+
+    pages = client.iter_repo_log_pages(
+        "org-a/repo", date(2025, 7, 14), date(2025, 7, 20)
+    )
+
+    assert next(pages) == [{"id": 1}]
+    with pytest.raises(requests.exceptions.RequestException):
+        next(pages)
+
+
+def test_log_window() -> None:
+    """Tests that the log window ends with the last completed day."""
+    start_date, end_date = log_window(7)
+    today = datetime.now(timezone.utc).date()
+
+    assert (today - end_date).days == 1
+    assert (end_date - start_date).days == 6
+
+
+def test_split_log_window() -> None:
+    """Tests splitting a window of days into consecutive windows."""
+    assert split_log_window(date(2025, 7, 1), date(2025, 7, 10), 4) == [
+        (date(2025, 7, 1), date(2025, 7, 4)),
+        (date(2025, 7, 5), date(2025, 7, 8)),
+        (date(2025, 7, 9), date(2025, 7, 10)),
+    ]
+    assert split_log_window(date(2025, 7, 1), date(2025, 7, 1), 30) == [
+        (date(2025, 7, 1), date(2025, 7, 1))
+    ]
+
+
+def test_get_repo_tag(client: QuayClient, mocker: MockerFixture) -> None:
+    """Tests that a single active tag is looked up without listing all tags."""
+    mock_response = mocker.Mock(status_code=200)
+    mock_response.json.return_value = {
+        "tags": [{"name": "v1", "manifest_digest": "sha256:abc"}],
+        "page": 1,
+        "has_additional": False,
+    }
+    mock_get = mocker.patch.object(client.session, "get", return_value=mock_response)
+
+    assert client.get_repo_tag("org-a/repo", "v1") == {
+        "name": "v1",
+        "manifest_digest": "sha256:abc",
+    }
+    assert mock_get.call_args.kwargs["params"] == {
+        "specificTag": "v1",
+        "onlyActiveTags": "true",
+    }
+
+
+def test_get_repo_tag_not_found(client: QuayClient, mocker: MockerFixture) -> None:
+    """Tests that None is returned for a tag missing in the repository."""
+    mock_response = mocker.Mock(status_code=200)
+    mock_response.json.return_value = {"tags": [], "page": 1, "has_additional": False}
+    mocker.patch.object(client.session, "get", return_value=mock_response)
+
+    assert client.get_repo_tag("org-a/repo", "v1") is None
@@ -1,14 +1,23 @@
 import pytest
+import requests
 from pytest_mock import MockerFixture
-from pytest import CaptureFixture
-from datetime import date
-from typing import List
+from pytest import CaptureFixture, LogCaptureFixture
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List
 
-from pullsar.stats_resolver import OperatorUsageStatsResolver
+from pullsar.stats_resolver import OperatorUsageStatsResolver, LogWindowTooLargeError
 from pullsar.operator_bundle_model import OperatorBundle
-from pullsar.quay_client import QuayClient
+from pullsar.quay_client import QuayClient, log_window
 from pullsar.pyxis_client import PyxisClient
 from pullsar.parse_operators_catalog import RepositoryMap
+from pullsar.config import BaseConfig
+from pullsar.cached_context import PullLogCounts
+
+
+@pytest.fixture(autouse=True)
+def no_log_precheck(mocker: MockerFixture) -> None:
+    """Scans logs directly, unless a test enables the pull activity pre-check."""
+    mocker.patch.object(BaseConfig, "QUAY_LOG_PRECHECK", False)
 
 
 @pytest.fixture
@@ -54,32 +63,65 @@ def test_create_local_tag_digest_maps(
     assert digest_map.get("sha256:abc") == sample_bundles[2]
 
 
+def test_create_pull_log_lookups(stats: OperatorUsageStatsResolver) -> None:
+    """
+    Tests that the lookups match log tags the same way as 'tag_in_tag_map',
+    preferring the same tag over an equivalent one.
+    """
+    bundles = [
+        OperatorBundle("op.v1.0", "op", "quay.io/org/repo:v1.0"),
+        OperatorBundle("op.2.0.0", "op", "quay.io/org/repo@sha256:abc"),
+        OperatorBundle("op.vv3", "op", "quay.io/org/repo:vv3"),
+        OperatorBundle("op.v2.0.0", "op", "quay.io/org/repo:v2.0.0"),
+    ]
+    tag_lookup, digest_lookup = stats.create_pull_log_lookups(bundles)
+    tag_map, _ = stats.create_local_tag_digest_maps(bundles)
+
+    for log_tag in ("v1.0", "1.0", "vv1.0", "2.0.0", "v2.0.0", "vv3", "v3", "vvv3"):
+        tag = stats.tag_in_tag_map(log_tag, tag_map)
+        expected = bundles.index(tag_map[tag]) if tag else None
+        assert tag_lookup.get(log_tag) == expected, log_tag
+
+    assert tag_lookup["2.0.0"] == 1
+    assert tag_lookup["v2.0.0"] == 3
+    assert digest_lookup == {"sha256:abc": 1}
+
+
 def test_extract_date(stats: OperatorUsageStatsResolver) -> None:
     """Tests the date extraction from Quay's log format."""
     datetime_str = "Mon, 14 Jul 2025 16:23:18 -0000"
     assert stats.extract_date(datetime_str) == date(2025, 7, 14)
 
 
-def test_filter_pull_repo_logs(stats: OperatorUsageStatsResolver) -> None:
-    """Tests that 'pull_repo' logs are filtered and simplified."""
-    quay_logs = [
-        {"kind": "push_repo", "datetime": "Mon, 14 Jul 2025 10:00:00 -0000"},
-        {
-            "kind": "pull_repo",
-            "datetime": "Tue, 15 Jul 2025 11:00:00 -0000",
-            "metadata": {"tag": "v1"},
-        },
-        {
-            "kind": "pull_repo",
-            "datetime": "Wed, 16 Jul 2025 12:00:00 -0000",
-            "metadata": {"manifest_digest": "sha256:123"},
-        },
+def test_count_pull_repo_logs(stats: OperatorUsageStatsResolver) -> None:
+    """Tests that 'pull_repo' logs are filtered and counted page by page."""
+    quay_log_pages = [
+        [
+            {"kind": "push_repo", "datetime": "Mon, 14 Jul 2025 10:00:00 -0000"},
+            {
+                "kind": "pull_repo",
+                "datetime": "Tue, 15 Jul 2025 11:00:00 -0000",
+                "metadata": {"tag": "v1"},
+            },
+        ],
+        [
+            {
+                "kind": "pull_repo",
+                "datetime": "Tue, 15 Jul 2025 23:00:00 -0000",
+                "metadata": {"tag": "v1"},
+            },
+            {
+                "kind": "pull_repo",
+                "datetime": "Wed, 16 Jul 2025 12:00:00 -0000",
+                "metadata": {"manifest_digest": "sha256:123"},
+            },
+        ],
     ]
-    pull_logs = stats.filter_pull_repo_logs(quay_logs)
+    pull_logs = stats.count_pull_repo_logs(iter(quay_log_pages))
 
-    assert len(pull_logs) == 2
-    assert pull_logs[0] == {"date": date(2025, 7, 15), "tag": "v1"}
-    assert pull_logs[1] == {"date": date(2025, 7, 16), "digest": "sha256:123"}
+    assert pull_logs.total == 3
+    assert pull_logs.tags == {(date(2025, 7, 15), "v1"): 2}
+    assert pull_logs.digests == {(date(2025, 7, 16), "sha256:123"): 1}
 
 
 @pytest.fixture
@@ -126,10 +168,10 @@ def test_resolve_repositories_success_with_multiple_bundles(
         }
     ]
 
-    mock_pyxis_client.get_images_for_repository.side_effect = [
-        fake_response1,
-        fake_response2,
-    ]
+    mock_pyxis_client.get_images_for_repositories.return_value = {
+        "connect-org-a/repo-a": fake_response1,
+        "connect-org-b/repo-b": fake_response2,
+    }
 
     not_quay_map: RepositoryMap = {
         "connect-org-a/repo-a": [bundles_to_translate[0]],
@@ -160,21 +202,127 @@ def test_resolve_repositories_success_with_multiple_bundles(
     assert known_images_map[bundles_to_translate[0].image] == bundle_a.image
     assert known_images_map[bundles_to_translate[1].image] == bundle_b.image
 
+    # images of both repositories were resolved in a single batch
+    mock_pyxis_client.get_images_for_repositories.assert_called_once_with(
+        "registry.connect.redhat.com",
+        ["connect-org-a/repo-a", "connect-org-b/repo-b"],
+        mocker.ANY,
+    )
+    mock_pyxis_client.get_images_for_repository.assert_not_called()
+
+
+def test_resolve_repositories_failed_batch(
+    mocker: MockerFixture,
+    stats: OperatorUsageStatsResolver,
+    bundles_to_translate: List[OperatorBundle],
+) -> None:
+    """Tests that repositories of a failed batch are resolved one by one."""
+    mocker.patch.object(BaseConfig, "PYXIS_BATCH_SIZE", 1)
+    pyxis_image_b = {
+        "image_id": "sha256:digest2",
+        "repositories": [{"registry": "quay.io", "repository": "quay-org-b/repo-b"}],
+    }
+    mock_pyxis_client = mocker.Mock(spec=PyxisClient)
+    mock_pyxis_client.get_images_for_repositories.side_effect = (
+        lambda registry, repo_paths, include: None
+        if repo_paths == ["connect-org-b/repo-b"]
+        else {"connect-org-a/repo-a": []}
+    )
+    mock_pyxis_client.get_images_for_repository.return_value = [pyxis_image_b]
+    quay_map: RepositoryMap = {}
+
+    stats.resolve_not_quay_repositories(
+        mock_pyxis_client,
+        {
+            "connect-org-a/repo-a": [bundles_to_translate[0]],
+            "connect-org-b/repo-b": [bundles_to_translate[1]],
+        },
+        quay_map,
+    )
+
+    assert mock_pyxis_client.get_images_for_repositories.call_count == 2
+    mock_pyxis_client.get_images_for_repository.assert_called_once_with(
+        "registry.connect.redhat.com", "connect-org-b/repo-b", mocker.ANY
+    )
+    assert list(quay_map) == ["quay-org-b/repo-b"]
+    assert stats._cache.repo_path_to_pyxis_images == {
+        "connect-org-a/repo-a": [],
+        "connect-org-b/repo-b": [pyxis_image_b],
+    }
+
+
+def test_resolve_repositories_with_stored_pyxis_images(
+    mocker: MockerFixture,
+    stats: OperatorUsageStatsResolver,
+    bundles_to_translate: List[OperatorBundle],
+) -> None:
+    """
+    Tests that Pyxis images persisted by a previous run are reused, unless they
+    miss images of bundles to translate, which may have been released since.
+    Bundles without a digest do not make the images be fetched again.
+    """
+    pyxis_image_a = {
+        "image_id": "sha256:digest1",
+        "repositories": [{"registry": "quay.io", "repository": "quay-org-a/repo-a"}],
+    }
+    pyxis_image_b = {
+        "image_id": "sha256:digest2",
+        "repositories": [{"registry": "quay.io", "repository": "quay-org-b/repo-b"}],
+    }
+    stats.load_api_cache(
+        {
+            "pyxis_images": {
+                "connect-org-a/repo-a": [pyxis_image_a],
+                "connect-org-b/repo-b": [{"image_id": "sha256:old"}],
+            }
+        }
+    )
+    mock_pyxis_client = mocker.Mock(spec=PyxisClient)
+    mock_pyxis_client.get_images_for_repository.return_value = [pyxis_image_b]
+    quay_map: RepositoryMap = {}
+
+    stats.resolve_not_quay_repositories(
+        mock_pyxis_client,
+        {
+            "connect-org-a/repo-a": [
+                bundles_to_translate[0],
+                OperatorBundle(
+                    "op.v3", "op", "registry.connect.redhat.com/connect-org-a/repo-a:v3"
+                ),
+            ],
+            "connect-org-b/repo-b": [bundles_to_translate[1]],
+        },
+        quay_map,
+    )
+
+    assert list(quay_map) == ["quay-org-a/repo-a", "quay-org-b/repo-b"]
+    mock_pyxis_client.get_images_for_repository.assert_called_once_with(
+        "registry.connect.redhat.com", "connect-org-b/repo-b", mocker.ANY
+    )
+
+    # only the responses of this run are persisted
+    updates = stats.get_api_cache_updates()
+    assert updates["pyxis_images"] == {"connect-org-b/repo-b": [pyxis_image_b]}
+    assert updates["image_translations"] == {
+        bundle.image: quay_map[repo][0].image
+        for bundle, repo in zip(bundles_to_translate, quay_map)
+    }
+
 
 def test_update_image_digests(
     mocker: MockerFixture,
     stats: OperatorUsageStatsResolver,
     sample_bundles: list[OperatorBundle],
 ) -> None:
-    """Tests that image digests are correctly updated from mocked Quay tags."""
-    tags = [
-        {"name": "1", "manifest_digest": "sha256:digest_for_v1"},
-        {"name": "v2", "manifest_digest": "sha256:digest_for_v2"},
-    ]
+    """Tests that image digests of a few tags are updated from looked up Quay tags."""
+    tags = {
+        "1": {"name": "1", "manifest_digest": "sha256:digest_for_v1"},
+        "v2": {"name": "v2", "manifest_digest": "sha256:digest_for_v2"},
+    }
     repo = "org/repo"
 
     mock_quay_client = mocker.Mock(spec=QuayClient)
-    mock_quay_client.get_repo_tags.return_value = tags
+    mock_quay_client.get_repo_tag.side_effect = lambda repo_path, tag: tags.get(tag)
     repo_map = {repo: sample_bundles}
 
     stats.update_image_digests(mock_quay_client, repo_map)
@@ -184,15 +332,122 @@ def test_update_image_digests(
     assert sample_bundles[1].digest == "sha256:digest_for_v2"
     # set digest stayed unchanged
     assert sample_bundles[2].digest == "sha256:abc"
-    mock_quay_client.get_repo_tags.assert_called_once_with("org/repo")
+    # tags 'v1' and 'v3' were not found, their equivalents were looked up next
+    assert mock_quay_client.get_repo_tag.call_count == 5
+    mock_quay_client.iter_repo_tag_pages.assert_not_called()
 
-    cached_repo_path_to_tags = stats._cache.repo_path_to_tags
-    assert len(cached_repo_path_to_tags) == 1
+    assert stats._cache.repo_path_to_tag_digests == {
+        repo: {
+            "v1": "sha256:digest_for_v1",
+            "v2": "sha256:digest_for_v2",
+            "v3": None,
+        }
+    }
 
-    cached_repo_tags = cached_repo_path_to_tags[repo]
-    assert len(cached_repo_tags) == 2
-    assert tags[0] in cached_repo_tags
-    assert tags[1] in cached_repo_tags
+    # resolved tags are reused
+    stats.update_image_digests(mock_quay_client, repo_map)
+    assert mock_quay_client.get_repo_tag.call_count == 5
+
+
+def test_update_image_digests_stored_tags(
+    mocker: MockerFixture,
+    sample_bundles: list[OperatorBundle],
+) -> None:
+    """Tests that tag digests persisted by a previous run are not looked up again."""
+    stats = OperatorUsageStatsResolver()
+    stats.load_api_cache(
+        {"tag_digests": {"org/repo:v1": "sha256:stored", "org/repo:v3": "sha256:abc"}}
+    )
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.get_repo_tag.return_value = {
+        "name": "v2",
+        "manifest_digest": "sha256:fetched",
+    }
+
+    stats.update_image_digests(mock_quay_client, {"org/repo": sample_bundles})
+
+    assert sample_bundles[0].digest == "sha256:stored"
+    assert sample_bundles[1].digest == "sha256:fetched"
+    mock_quay_client.get_repo_tag.assert_called_once_with("org/repo", "v2")
+    assert stats.get_api_cache_updates()["tag_digests"] == {
+        "org/repo:v2": "sha256:fetched"
+    }
+
+
+def test_update_image_digests_lists_tags(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that many tags are resolved by listing tags of the repository,
+    until the remaining tags are few enough to be looked up one by one.
+    """
+    mocker.patch.object(BaseConfig, "QUAY_TAG_LOOKUP_MAX_TAGS", 1)
+    bundles = [
+        OperatorBundle(f"op.v{i}", "op", f"quay.io/org/repo:v{i}") for i in (1, 2, 3)
+    ]
+    pages = iter(
+        [
+            [
+                {"name": "v1", "manifest_digest": "sha256:new_v1"},
+                {"name": "latest", "manifest_digest": "sha256:new_v1"},
+            ],
+            [
+                {"name": "2", "manifest_digest": "sha256:v2"},
+                {"name": "v1", "manifest_digest": "sha256:old_v1"},
+            ],
+            [{"name": "v3", "manifest_digest": "sha256:v3"}],
+        ]
+    )
+
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.iter_repo_tag_pages.return_value = pages
+    mock_quay_client.get_repo_tag.return_value = None
+
+    stats.update_image_digests(mock_quay_client, {"org/repo": bundles})
+
+    # the newest occurrence of a tag in its history wins
+    assert bundles[0].digest == "sha256:new_v1"
+    assert bundles[1].digest == "sha256:v2"
+    assert bundles[2].digest is None
+    # the last page was not listed, the last tag was looked up instead
+    assert next(pages) == [{"name": "v3", "manifest_digest": "sha256:v3"}]
+    assert [c.args for c in mock_quay_client.get_repo_tag.call_args_list] == [
+        ("org/repo", "v3"),
+        ("org/repo", "3"),
+    ]
+    assert stats._cache.repo_path_to_tag_digests["org/repo"]["v3"] is None
+
+
+def test_update_image_digests_listing_fails(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that tags not resolved by a failed listing of tags are looked up
+    one by one instead of being taken as not found.
+    """
+    mocker.patch.object(BaseConfig, "QUAY_TAG_LOOKUP_MAX_TAGS", 1)
+    bundles = [
+        OperatorBundle(f"op.v{i}", "op", f"quay.io/org/repo:v{i}") for i in (1, 2, 3)
+    ]
+
+    def failing_pages() -> Iterator[List[Dict[str, Any]]]:
+        yield [{"name": "v1", "manifest_digest": "sha256:v1"}]
+        raise requests.exceptions.RequestException("Timeout")
+
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.iter_repo_tag_pages.return_value = failing_pages()
+    mock_quay_client.get_repo_tag.side_effect = lambda repo_path, tag: (
+        {"name": tag, "manifest_digest": f"sha256:{tag}"} if tag == "v2" else None
+    )
+
+    stats.update_image_digests(mock_quay_client, {"org/repo": bundles})
+
+    assert [bundle.digest for bundle in bundles] == ["sha256:v1", "sha256:v2", None]
+    assert sorted(c.args for c in mock_quay_client.get_repo_tag.call_args_list) == [
+        ("org/repo", "3"),
+        ("org/repo", "v2"),
+        ("org/repo", "v3"),
+    ]
 
 
 def test_update_image_pull_counts(
@@ -201,6 +456,10 @@ def test_update_image_pull_counts(
     sample_bundles: list[OperatorBundle],
 ) -> None:
     """Tests that pull counts are correctly retrieved from Quay logs."""
+    mocker.patch(
+        "pullsar.stats_resolver.log_window",
+        return_value=(date(2025, 7, 14), date(2025, 7, 20)),
+    )
     mock_quay_client = mocker.Mock(spec=QuayClient)
     quay_logs = [
         {
@@ -226,7 +485,7 @@ def test_update_image_pull_counts(
     ]
     repo = "org/repo"
 
-    mock_quay_client.get_repo_logs.return_value = quay_logs
+    mock_quay_client.iter_repo_log_pages.return_value = iter([quay_logs])
     repo_map = {repo: sample_bundles}
 
     stats.update_image_pull_counts(mock_quay_client, repo_map, log_days=7)
@@ -234,13 +493,15 @@ def test_update_image_pull_counts(
     assert sample_bundles[0].pull_count == {date(2025, 7, 14): 2}
     assert sample_bundles[1].pull_count == {}
     assert sample_bundles[2].pull_count == {date(2025, 7, 15): 1}
-    mock_quay_client.get_repo_logs.assert_called_once_with(repo, 7)
+    mock_quay_client.iter_repo_log_pages.assert_called_once_with(
+        repo, date(2025, 7, 14), date(2025, 7, 20)
+    )
 
     cached_repo_path_to_logs = stats._cache.repo_path_to_logs
     assert len(cached_repo_path_to_logs) == 1
 
     cached_repo_logs = cached_repo_path_to_logs[repo]
-    assert len(cached_repo_logs) == 3
+    assert cached_repo_logs.total == 3
 
 
 def test_update_image_pull_counts_no_logs(
@@ -253,7 +514,7 @@ def test_update_image_pull_counts_no_logs(
     from the Quay API.
     """
     mock_quay_client = mocker.Mock(spec=QuayClient)
-    mock_quay_client.get_repo_logs.return_value = []
+    mock_quay_client.iter_repo_log_pages.return_value = iter([])
     repo = "org/repo"
     repo_map = {repo: sample_bundles}
 
@@ -264,7 +525,37 @@ def test_update_image_pull_counts_no_logs(
 
     cached_repo_path_to_logs = stats._cache.repo_path_to_logs
     assert len(cached_repo_path_to_logs) == 1
-    assert len(cached_repo_path_to_logs[repo]) == 0
+    assert cached_repo_path_to_logs[repo].total == 0
+
+
+def test_update_image_pull_counts_request_fails(
+    mocker: MockerFixture,
+    stats: OperatorUsageStatsResolver,
+    sample_bundles: list[OperatorBundle],
+) -> None:
+    """
+    Tests that logs counted before a failed page request are dropped,
+    so that incomplete logs are never counted.
+    """
+
+    def failing_pages() -> Iterator[List[Dict[str, Any]]]:
+        yield [
+            {
+                "kind": "pull_repo",
+                "datetime": "Mon, 14 Jul 2025 10:00:00 -0000",
+                "metadata": {"tag": "v1"},
+            }
+        ]
+        raise requests.exceptions.RequestException("Timeout")
+
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.iter_repo_log_pages.return_value = failing_pages()
+    repo_map = {"org/repo": sample_bundles}
+
+    stats.update_image_pull_counts(mock_quay_client, repo_map, log_days=7)
+
+    for bundle in sample_bundles:
+        assert bundle.pull_count == {}
 
 
 def test_print_operator_usage_stats(
@@ -283,16 +574,16 @@ def test_print_operator_usage_stats(
     assert "op.v2" not in captured.out
 
 
-def test_update_operator_usage_stats_flow(
+def test_resolve_and_count_operator_usage_stats_flow(
     mocker: MockerFixture, stats: OperatorUsageStatsResolver
 ) -> None:
     """
-    Tests the main orchestration function, mocking its dependencies.
+    Tests resolving bundles of a catalog and counting their pulls,
+    mocking their dependencies.
     """
-    mock_render = mocker.patch("pullsar.stats_resolver.render_operator_catalog")
-    mock_create_maps = mocker.patch(
-        "pullsar.stats_resolver.create_repository_paths_maps",
-        return_value=({"repo": []}, {"repo": []}, {}),
+    mock_load = mocker.patch(
+        "pullsar.stats_resolver.load_catalog",
+        return_value=[("op.v1", "op", "quay.io/org/repo:v1")],
     )
 
     mock_resolve_repos = mocker.patch(
@@ -311,16 +602,496 @@ def test_update_operator_usage_stats_flow(
     mock_pyxis_client = mocker.Mock(spec=PyxisClient)
     mock_pyxis_client.get_images_for_repository.return_value = {"data": []}
 
-    stats.update_operator_usage_stats(
+    result = stats.resolve_operator_bundles(
         quay_client=mock_quay_client,
         pyxis_client=mock_pyxis_client,
-        log_days=7,
         catalog_image="my-image:latest",
     )
 
-    mock_render.assert_called_once()
-    mock_create_maps.assert_called_once()
+    mock_load.assert_called_once_with("my-image:latest", None)
     mock_resolve_repos.assert_called_once()
     mock_update_digests.assert_called_once()
-    mock_update_pulls.assert_called_once()
-    mock_print_stats.assert_called_once()
+    mock_update_pulls.assert_not_called()
+
+    stats.count_operator_usage_stats(mock_quay_client, result, 7)
+
+    mock_update_pulls.assert_called_once_with(mock_quay_client, result, 7)
+    mock_print_stats.assert_called_once_with(result)
+    assert [bundle.name for bundle in result["org/repo"]] == ["op.v1"]
+
+
+def test_count_operator_usage_stats_with_watermarks(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    stats: OperatorUsageStatsResolver,
+) -> None:
+    """
+    Tests that the printed stats are not claimed to cover the last 'log_days'
+    days when watermarks shortened the windows of some repositories.
+    """
+    mocker.patch.object(OperatorUsageStatsResolver, "update_image_pull_counts")
+    mocker.patch.object(OperatorUsageStatsResolver, "print_operator_usage_stats")
+    stats.log_watermarks = {"org/repo": date(2025, 7, 17)}
+
+    stats.count_operator_usage_stats(mocker.Mock(spec=QuayClient), {}, 7)
+
+    assert "since the last ingested day" in caplog.text
+
+
+def test_resolve_operator_bundles_loaded_catalog(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that bundle index of an already loaded catalog is used as it is,
+    with the image translations known at the time.
+    """
+    mock_load = mocker.patch("pullsar.stats_resolver.load_catalog")
+    mocker.patch.object(OperatorUsageStatsResolver, "resolve_not_quay_repositories")
+    mocker.patch.object(OperatorUsageStatsResolver, "update_image_digests")
+    stats.load_api_cache(
+        {
+            "image_translations": {
+                "registry.connect.redhat.com/org/repo:v2": "quay.io/org/repo:v2"
+            }
+        }
+    )
+
+    result = stats.resolve_operator_bundles(
+        quay_client=mocker.Mock(spec=QuayClient),
+        pyxis_client=mocker.Mock(spec=PyxisClient),
+        catalog_image="my-image:v4.18",
+        bundle_index=[
+            ("op.v1", "op", "quay.io/org/repo:v1"),
+            ("op.v2", "op", "registry.connect.redhat.com/org/repo:v2"),
+        ],
+    )
+
+    mock_load.assert_not_called()
+    assert [bundle.image for bundle in result["org/repo"]] == [
+        "quay.io/org/repo:v1",
+        "quay.io/org/repo:v2",
+    ]
+
+
+def test_resolve_operator_bundles_render_failed(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that a catalog which failed to render is skipped.
+    """
+    mocker.patch("pullsar.stats_resolver.load_catalog", return_value=None)
+    mock_resolve_repos = mocker.patch.object(
+        OperatorUsageStatsResolver, "resolve_not_quay_repositories"
+    )
+
+    result = stats.resolve_operator_bundles(
+        quay_client=mocker.Mock(spec=QuayClient),
+        pyxis_client=mocker.Mock(spec=PyxisClient),
+        catalog_image="my-image:v4.18",
+    )
+
+    assert result == {}
+    mock_resolve_repos.assert_not_called()
+
+
+def test_update_image_pull_counts_multiple_repositories(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that logs of multiple repositories are fetched once per repository
+    and counted towards the bundles of the right repository.
+    """
+    mocker.patch(
+        "pullsar.stats_resolver.log_window",
+        return_value=(date(2025, 7, 14), date(2025, 7, 20)),
+    )
+    bundle_a = OperatorBundle("op-a.v1", "op-a", "quay.io/org-a/repo:v1")
+    bundle_b = OperatorBundle("op-b.v1", "op-b", "quay.io/org-b/repo:v1")
+    logs_by_repo = {
+        "org-a/repo": [
+            {
+                "kind": "pull_repo",
+                "datetime": "Mon, 14 Jul 2025 10:00:00 -0000",
+                "metadata": {"tag": "v1"},
+            }
+        ],
+        "org-b/repo": [
+            {
+                "kind": "pull_repo",
+                "datetime": "Tue, 15 Jul 2025 10:00:00 -0000",
+                "metadata": {"tag": "1"},
+            }
+        ]
+        * 3,
+    }
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.iter_repo_log_pages.side_effect = (
+        lambda repo_path, start_date, end_date: iter([logs_by_repo[repo_path]])
+    )
+    repo_map = {"org-a/repo": [bundle_a], "org-b/repo": [bundle_b]}
+
+    stats.update_image_pull_counts(mock_quay_client, repo_map, log_days=7)
+
+    assert mock_quay_client.iter_repo_log_pages.call_count == 2
+    assert bundle_a.pull_count == {date(2025, 7, 14): 1}
+    assert bundle_b.pull_count == {date(2025, 7, 15): 3}
+
+
+def test_update_image_pull_counts_org_logs(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that logs of organizations with enough referenced repositories are
+    fetched once through organization logs and demultiplexed by repository.
+    """
+    mocker.patch(
+        "pullsar.stats_resolver.log_window",
+        return_value=(date(2025, 7, 14), date(2025, 7, 20)),
+    )
+    mocker.patch.object(BaseConfig, "QUAY_ORG_LOGS_MIN_REPOS", 2)
+    stats.log_watermarks = {"org-a/repo-2": date(2025, 7, 17)}
+    bundle_1 = OperatorBundle("op-1.v1", "op-1", "quay.io/org-a/repo-1:v1")
+    bundle_2 = OperatorBundle("op-2.v1", "op-2", "quay.io/org-a/repo-2:v1")
+    bundle_3 = OperatorBundle("op-3.v1", "op-3", "quay.io/org-b/repo-3:v1")
+
+    def pull_log(day: int, repo: str) -> Dict[str, Any]:
+        return {
+            "kind": "pull_repo",
+            "datetime": date(2025, 7, day).strftime("%a, %d %b %Y 10:00:00 -0000"),
+            "metadata": {"repo": repo, "tag": "v1"},
+        }
+
+    org_logs = [
+        pull_log(19, "repo-2"),
+        pull_log(18, "repo-1"),
+        pull_log(18, "unreferenced"),
+        # before the watermark of repo-2, already ingested
+        pull_log(16, "repo-2"),
+        pull_log(15, "repo-1"),
+    ]
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.iter_org_log_pages.return_value = iter([org_logs])
+    mock_quay_client.iter_repo_log_pages.return_value = iter([[pull_log(15, "")]])
+    repo_map = {
+        "org-a/repo-1": [bundle_1],
+        "org-a/repo-2": [bundle_2],
+        "org-b/repo-3": [bundle_3],
+    }
+
+    stats.update_image_pull_counts(mock_quay_client, repo_map, log_days=7)
+
+    mock_quay_client.iter_org_log_pages.assert_called_once_with(
+        "org-a", date(2025, 7, 14), date(2025, 7, 20)
+    )
+    mock_quay_client.iter_repo_log_pages.assert_called_once_with(
+        "org-b/repo-3", date(2025, 7, 14), date(2025, 7, 20)
+    )
+    assert bundle_1.pull_count == {date(2025, 7, 18): 1, date(2025, 7, 15): 1}
+    assert bundle_2.pull_count == {date(2025, 7, 19): 1}
+    assert bundle_3.pull_count == {date(2025, 7, 15): 1}
+    assert stats.get_updated_log_watermarks() == {
+        "org-a/repo-1": date(2025, 7, 20),
+        "org-a/repo-2": date(2025, 7, 20),
+        "org-b/repo-3": date(2025, 7, 20),
+    }
+
+
+def test_update_image_pull_counts_precheck(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that logs are scanned only for the days with pulls of active
+    organizations, while repositories of inactive ones are recorded with no logs.
+    """
+    mocker.patch(
+        "pullsar.stats_resolver.log_window",
+        return_value=(date(2025, 7, 14), date(2025, 7, 20)),
+    )
+    mocker.patch.object(BaseConfig, "QUAY_LOG_PRECHECK", True)
+    bundle_1 = OperatorBundle("op-1.v1", "op-1", "quay.io/org-a/repo-1:v1")
+    bundle_2 = OperatorBundle("op-2.v1", "op-2", "quay.io/org-a/repo-2:v1")
+    bundle_3 = OperatorBundle("op-3.v1", "op-3", "quay.io/org-b/repo-3:v1")
+
+    def aggregated_log(kind: str, count: int, day: int) -> Dict[str, Any]:
+        return {
+            "kind": kind,
+            "count": count,
+            "datetime": date(2025, 7, day).strftime("%a, %d %b %Y 00:00:00 -0000"),
+        }
+
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.get_org_aggregated_logs.side_effect = lambda org, *_: {
+        "org-a": [
+            aggregated_log("pull_repo", 5, 15),
+            aggregated_log("push_repo", 1, 18),
+        ],
+        "org-b": [aggregated_log("push_repo", 2, 16)],
+    }[org]
+    mock_quay_client.iter_repo_log_pages.side_effect = lambda repo, *_: iter(
+        [
+            [
+                {
+                    "kind": "pull_repo",
+                    "datetime": "Tue, 15 Jul 2025 10:00:00 -0000",
+                    "metadata": {"tag": "v1"},
+                }
+            ]
+            * {"org-a/repo-1": 3, "org-a/repo-2": 0}[repo]
+        ]
+    )
+    repo_map = {
+        "org-a/repo-1": [bundle_1],
+        "org-a/repo-2": [bundle_2],
+        "org-b/repo-3": [bundle_3],
+    }
+
+    stats.update_image_pull_counts(mock_quay_client, repo_map, log_days=7)
+
+    # org-b had no pulls at all, the logs of its repositories were not scanned
+    assert sorted(
+        call.args for call in mock_quay_client.iter_repo_log_pages.call_args_list
+    ) == [
+        ("org-a/repo-1", date(2025, 7, 15), date(2025, 7, 15)),
+        ("org-a/repo-2", date(2025, 7, 15), date(2025, 7, 15)),
+    ]
+    assert bundle_1.pull_count == {date(2025, 7, 15): 3}
+    assert bundle_2.pull_count == {}
+    assert bundle_3.pull_count == {}
+    # inactive repositories are ingested as well
+    assert stats.get_updated_log_watermarks() == {
+        repo: date(2025, 7, 20) for repo in repo_map
+    }
+
+
+def test_update_image_pull_counts_precheck_fails(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """Tests that logs are scanned for the whole window if the pre-check fails."""
+    mocker.patch(
+        "pullsar.stats_resolver.log_window",
+        return_value=(date(2025, 7, 14), date(2025, 7, 20)),
+    )
+    mocker.patch.object(BaseConfig, "QUAY_LOG_PRECHECK", True)
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.get_org_aggregated_logs.return_value = None
+    mock_quay_client.iter_repo_log_pages.return_value = iter([[]])
+    repo_map = {"org-a/repo": [OperatorBundle("op.v1", "op", "quay.io/org-a/repo:v1")]}
+
+    stats.update_image_pull_counts(mock_quay_client, repo_map, log_days=7)
+
+    mock_quay_client.iter_repo_log_pages.assert_called_once_with(
+        "org-a/repo", date(2025, 7, 14), date(2025, 7, 20)
+    )
+
+
+def test_update_image_pull_counts_precheck_token_not_defined(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that an organization without a Quay API token is not taken
+    for an organization without pulls, its repositories keep their watermarks.
+    """
+    mocker.patch.object(BaseConfig, "QUAY_LOG_PRECHECK", True)
+    _, end_date = log_window(7)
+    stats.log_watermarks = {"unknown-org/repo": end_date - timedelta(days=3)}
+    bundle = OperatorBundle("op.v1", "op", "quay.io/unknown-org/repo:v1")
+    quay_client = QuayClient("https://quay.io/api/v1", {})
+
+    stats.update_image_pull_counts(quay_client, {"unknown-org/repo": [bundle]}, 7)
+
+    assert stats.get_updated_log_watermarks() == {}
+
+
+def test_count_pull_repo_logs_since(stats: OperatorUsageStatsResolver) -> None:
+    """
+    Tests that logs older than 'since' are dropped and no more pages
+    are consumed once they are reached.
+    """
+    quay_log_pages = iter(
+        [
+            [
+                {
+                    "kind": "pull_repo",
+                    "datetime": "Wed, 16 Jul 2025 12:00:00 -0000",
+                    "metadata": {"tag": "v1"},
+                },
+                {
+                    "kind": "pull_repo",
+                    "datetime": "Mon, 14 Jul 2025 12:00:00 -0000",
+                    "metadata": {"tag": "v1"},
+                },
+            ],
+            [
+                {
+                    "kind": "pull_repo",
+                    "datetime": "Sun, 13 Jul 2025 12:00:00 -0000",
+                    "metadata": {"tag": "v1"},
+                }
+            ],
+        ]
+    )
+
+    pull_logs = stats.count_pull_repo_logs(quay_log_pages, since=date(2025, 7, 15))
+
+    assert pull_logs.tags == {(date(2025, 7, 16), "v1"): 1}
+    assert len(list(quay_log_pages)) == 1
+
+
+def test_update_image_pull_counts_with_watermarks(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that logs are fetched only for the days after repository watermarks,
+    at most for the last LOG_DAYS_MAX days, and that watermarks are updated
+    only for successfully fetched repositories.
+    """
+    start_date, end_date = log_window(7)
+    earliest_date, _ = log_window(30)
+    stats.log_watermarks = {
+        "org/up-to-date": end_date,
+        "org/behind": end_date - timedelta(days=10),
+        "org/outdated": end_date - timedelta(days=100),
+    }
+    repo_map: RepositoryMap = {
+        repo: [OperatorBundle("op.v1", "op", f"quay.io/{repo}:v1")]
+        for repo in [
+            "org/up-to-date",
+            "org/behind",
+            "org/outdated",
+            "org/new",
+            "org/fail",
+        ]
+    }
+
+    def log_pages(
+        repo_path: str, start_date: date, end_date: date
+    ) -> Iterator[List[Dict[str, Any]]]:
+        if repo_path == "org/fail":
+            raise requests.exceptions.RequestException("Timeout")
+        yield []
+
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.iter_repo_log_pages.side_effect = log_pages
+
+    stats.update_image_pull_counts(mock_quay_client, repo_map, log_days=7)
+
+    fetched_windows = {
+        call.args[0]: call.args[1:]
+        for call in mock_quay_client.iter_repo_log_pages.call_args_list
+    }
+    assert fetched_windows == {
+        "org/behind": (end_date - timedelta(days=9), end_date),
+        "org/outdated": (earliest_date, end_date),
+        "org/new": (start_date, end_date),
+        "org/fail": (start_date, end_date),
+    }
+    assert stats.get_updated_log_watermarks() == {
+        "org/behind": end_date,
+        "org/outdated": end_date,
+        "org/new": end_date,
+    }
+
+
+def test_update_image_pull_counts_token_not_defined(
+    stats: OperatorUsageStatsResolver,
+) -> None:
+    """
+    Tests that a repository of an organization without a Quay API token keeps
+    its watermark, so that its logs are fetched once the token is defined.
+    """
+    _, end_date = log_window(7)
+    stats.log_watermarks = {"unknown-org/repo": end_date - timedelta(days=3)}
+    bundle = OperatorBundle("op.v1", "op", "quay.io/unknown-org/repo:v1")
+    quay_client = QuayClient("https://quay.io/api/v1", {})
+
+    stats.update_image_pull_counts(quay_client, {"unknown-org/repo": [bundle]}, 7)
+
+    assert stats.get_updated_log_watermarks() == {}
+    assert bundle.pull_count == {}
+
+
+def test_count_pull_repo_logs_max_pages(stats: OperatorUsageStatsResolver) -> None:
+    """
+    Tests that consuming more pages than allowed is aborted, keeping the logs
+    of the consumed pages counted along with the date reached.
+    """
+    log_pages = [
+        [
+            {
+                "kind": "pull_repo",
+                "datetime": f"Mon, {day} Jul 2025 10:00:00 -0000",
+                "metadata": {"tag": "v1"},
+            }
+        ]
+        for day in (17, 16, 15)
+    ]
+    pull_logs = PullLogCounts()
+
+    with pytest.raises(LogWindowTooLargeError) as e:
+        stats.count_pull_repo_logs(iter(log_pages), max_pages=2, pull_logs=pull_logs)
+
+    assert e.value.oldest_date == date(2025, 7, 16)
+    pull_logs.drop_until(date(2025, 7, 16))
+    assert pull_logs.tags == {(date(2025, 7, 17), "v1"): 1}
+
+    with pytest.raises(LogWindowTooLargeError) as e:
+        stats.count_pull_repo_logs(iter([[], [], []]), max_pages=2)
+
+    assert e.value.oldest_date is None
+
+
+def test_update_image_pull_counts_splits_large_windows(
+    mocker: MockerFixture, stats: OperatorUsageStatsResolver
+) -> None:
+    """
+    Tests that logs are fetched in windows of at most QUAY_LOG_WINDOW_DAYS days,
+    that only days of windows spanning too many pages not consumed in full are
+    fetched again in smaller windows and that the logs of all the windows are merged.
+    """
+    mocker.patch(
+        "pullsar.stats_resolver.log_window",
+        return_value=(date(2025, 7, 12), date(2025, 7, 17)),
+    )
+    mocker.patch.object(BaseConfig, "QUAY_LOG_WINDOW_DAYS", 4)
+    mocker.patch.object(BaseConfig, "QUAY_LOG_WINDOW_MAX_PAGES", 2)
+
+    def log_pages(
+        repo_path: str, start_date: date, end_date: date
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # newest logs first, busy 14th with 3 pages of logs
+        for day in range(end_date.day, start_date.day - 1, -1):
+            for _ in range(3 if day == 14 else 1):
+                yield [
+                    {
+                        "kind": "pull_repo",
+                        "datetime": f"Mon, {day} Jul 2025 10:00:00 -0000",
+                        "metadata": {"tag": "v1"},
+                    }
+                ]
+
+    bundle = OperatorBundle("op.v1", "op", "quay.io/org/repo:v1")
+    mock_quay_client = mocker.Mock(spec=QuayClient)
+    mock_quay_client.iter_repo_log_pages.side_effect = log_pages
+
+    stats.update_image_pull_counts(mock_quay_client, {"org/repo": [bundle]}, 6)
+
+    fetched_windows = [
+        call.args[1:] for call in mock_quay_client.iter_repo_log_pages.call_args_list
+    ]
+    # logs of the 15th were consumed in full before the abort, logs of the 14th
+    # may have continued on the next pages
+    assert sorted(fetched_windows) == [
+        (date(2025, 7, 12), date(2025, 7, 13)),
+        (date(2025, 7, 12), date(2025, 7, 15)),
+        (date(2025, 7, 14), date(2025, 7, 14)),
+        (date(2025, 7, 16), date(2025, 7, 17)),
+    ]
+    assert bundle.pull_count == {
+        date(2025, 7, 12): 1,
+        date(2025, 7, 13): 1,
+        date(2025, 7, 14): 3,
+        date(2025, 7, 15): 1,
+        date(2025, 7, 16): 1,
+        date(2025, 7, 17): 1,
+    }
+    assert stats.get_updated_log_watermarks() == {"org/repo": date(2025, 7, 17)}